@@ -2,8 +2,12 @@
 API Clients для работы с FACEIT API
 """
 
-from .fast_api_client_httpx import FastFaceitClientHttpx
+from .fast_api_client_httpx import FastFaceitClientHttpx, RateLimitedError
+from .http_pool import create_http_client, http_client_settings_from_env
 
 __all__ = [
-    'FastFaceitClientHttpx'
+    'FastFaceitClientHttpx',
+    'RateLimitedError',
+    'create_http_client',
+    'http_client_settings_from_env'
 ] 
\ No newline at end of file
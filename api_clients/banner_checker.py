@@ -0,0 +1,84 @@
+"""
+Проверка доступности баннеров игроков вне основного пути поиска.
+
+Поиск берет последний известный статус URL из кэша, а проверка (HEAD)
+выполняется в фоне и обновляет кэш для следующих поисков.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Awaitable, Callable, Dict, Optional
+
+from cache.backends import CacheBackend, MemoryBackend
+
+logger = logging.getLogger(__name__)
+
+# Доступный баннер перепроверяем раз в сутки
+DEFAULT_BANNER_TTL = 24 * 3600
+# Недоступный - чаще: ошибка могла быть временной
+DEFAULT_BANNER_NEGATIVE_TTL = 900
+
+_AVAILABLE = b"1"
+_UNAVAILABLE = b"0"
+
+
+def banner_settings_from_env() -> Dict:
+    """Читает время хранения статусов баннеров из переменных окружения"""
+    return {
+        "banner_ttl": int(os.getenv("BANNER_TTL", DEFAULT_BANNER_TTL)),
+        "banner_negative_ttl": int(os.getenv("BANNER_NEGATIVE_TTL", DEFAULT_BANNER_NEGATIVE_TTL)),
+    }
+
+
+class BannerChecker:
+    """Кэш URL -> доступность баннера с фоновой проверкой неизвестных URL"""
+
+    def __init__(self, check: Callable[[str], Awaitable[bool]],
+                 cache_backend: Optional[CacheBackend] = None,
+                 ttl: int = DEFAULT_BANNER_TTL,
+                 negative_ttl: int = DEFAULT_BANNER_NEGATIVE_TTL):
+        self.check = check
+        self.cache = cache_backend if cache_backend is not None else MemoryBackend(max_entries=20000, max_bytes=4 * 1024 * 1024)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        # Идущие фоновые проверки по URL (держим ссылки, чтобы задачи не собрал GC)
+        self._pending: Dict[str, asyncio.Task] = {}
+
+    async def known_status(self, url: str) -> Optional[bool]:
+        """Последний известный статус баннера без ожидания сети.
+
+        Если статус неизвестен или кэш недоступен, запускает фоновую проверку и возвращает None.
+        """
+        try:
+            cached = await self.cache.get(url)
+        except Exception as e:
+            logger.warning(f"Error reading banner status for {url}: {e}")
+            cached = None
+        if cached is None:
+            self.schedule(url)
+            return None
+        return cached == _AVAILABLE
+
+    def schedule(self, url: str):
+        """Запускает фоновую проверку URL, если она еще не идет"""
+        if url in self._pending:
+            return
+        task = asyncio.create_task(self._refresh(url))
+        self._pending[url] = task
+        task.add_done_callback(lambda _: self._pending.pop(url, None))
+
+    async def _refresh(self, url: str):
+        try:
+            available = await self.check(url)
+            await self.cache.set(url, _AVAILABLE if available else _UNAVAILABLE,
+                                 ttl=self.ttl if available else self.negative_ttl)
+        except Exception as e:
+            # Проверка не состоялась (429, разомкнутый circuit breaker) - статус не кэшируем,
+            # следующий поиск запустит ее снова
+            logger.warning(f"Background banner check failed for {url}: {e}")
+
+    async def close(self):
+        for task in list(self._pending.values()):
+            task.cancel()
+        await self.cache.close()
@@ -0,0 +1,170 @@
+"""
+Circuit breaker для групп эндпоинтов FACEIT API.
+
+Пока группа эндпоинтов (например, статистика матчей) отвечает ошибками или
+слишком медленно, запросы к ней сразу завершаются CircuitOpenError вместо
+ожидания таймаутов. После паузы несколько пробных запросов проверяют,
+восстановился ли эндпоинт.
+"""
+
+import logging
+import os
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# Доля ошибок среди последних WINDOW запросов, при которой цепь размыкается
+DEFAULT_WINDOW = 20
+DEFAULT_MIN_CALLS = 10
+DEFAULT_ERROR_RATE = 0.5
+# Сколько секунд запросы не отправляются после размыкания
+DEFAULT_OPEN_SECONDS = 30.0
+# Сколько пробных запросов подряд должно пройти успешно, чтобы замкнуть цепь
+DEFAULT_HALF_OPEN_PROBES = 2
+# Запрос дольше этого времени считается ошибкой
+DEFAULT_SLOW_CALL = 5.0
+
+
+def circuit_breaker_settings_from_env() -> Dict:
+    """Читает настройки circuit breaker из переменных окружения"""
+    return {
+        "window": int(os.getenv("FACEIT_BREAKER_WINDOW", DEFAULT_WINDOW)),
+        "min_calls": int(os.getenv("FACEIT_BREAKER_MIN_CALLS", DEFAULT_MIN_CALLS)),
+        "error_rate": float(os.getenv("FACEIT_BREAKER_ERROR_RATE", DEFAULT_ERROR_RATE)),
+        "open_seconds": float(os.getenv("FACEIT_BREAKER_OPEN_SECONDS", DEFAULT_OPEN_SECONDS)),
+        "half_open_probes": int(os.getenv("FACEIT_BREAKER_HALF_OPEN_PROBES", DEFAULT_HALF_OPEN_PROBES)),
+        "slow_call": float(os.getenv("FACEIT_BREAKER_SLOW_CALL", DEFAULT_SLOW_CALL)),
+    }
+
+
+class CircuitOpenError(Exception):
+    """Группа эндпоинтов FACEIT временно отключена circuit breaker"""
+
+    def __init__(self, family: str, retry_after: Optional[float] = None):
+        super().__init__(f"Circuit open for FACEIT endpoint family '{family}'")
+        self.family = family
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Состояние одной группы эндпоинтов: closed -> open -> half_open -> closed"""
+
+    def __init__(self, family: str, window: int = DEFAULT_WINDOW, min_calls: int = DEFAULT_MIN_CALLS,
+                 error_rate: float = DEFAULT_ERROR_RATE, open_seconds: float = DEFAULT_OPEN_SECONDS,
+                 half_open_probes: int = DEFAULT_HALF_OPEN_PROBES, slow_call: float = DEFAULT_SLOW_CALL):
+        self.family = family
+        self.min_calls = max(1, min_calls)
+        self.error_rate = error_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = max(1, half_open_probes)
+        self.slow_call = slow_call
+        self.state = STATE_CLOSED
+        # Исходы последних запросов: True - ошибка
+        self._outcomes: Deque[bool] = deque(maxlen=max(window, self.min_calls))
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.times_opened = 0
+        self.rejected = 0
+
+    def _failure_rate(self) -> float:
+        return sum(self._outcomes) / len(self._outcomes) if self._outcomes else 0.0
+
+    def _open(self):
+        self.state = STATE_OPEN
+        self._opened_at = time.monotonic()
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.times_opened += 1
+        logger.warning(f"Circuit opened for FACEIT '{self.family}' endpoints "
+                       f"(error rate {self._failure_rate():.0%}), pausing requests for {self.open_seconds:.0f}s")
+
+    def _close(self):
+        self.state = STATE_CLOSED
+        self._outcomes.clear()
+        logger.info(f"Circuit closed for FACEIT '{self.family}' endpoints")
+
+    def before_call(self):
+        """Разрешает запрос или выбрасывает CircuitOpenError"""
+        if self.state == STATE_OPEN:
+            retry_after = self._opened_at + self.open_seconds - time.monotonic()
+            if retry_after > 0:
+                self.rejected += 1
+                raise CircuitOpenError(self.family, retry_after)
+            self.state = STATE_HALF_OPEN
+            logger.info(f"Circuit half-open for FACEIT '{self.family}' endpoints, sending probes")
+
+        if self.state == STATE_HALF_OPEN:
+            # Пока идут пробные запросы, остальные не отправляем
+            if self._probes_in_flight >= self.half_open_probes - self._probe_successes:
+                self.rejected += 1
+                raise CircuitOpenError(self.family, self.open_seconds)
+            self._probes_in_flight += 1
+
+    def record(self, failed: bool, duration: float = 0.0):
+        """Учитывает завершенный запрос (медленный запрос считается ошибкой)"""
+        failed = failed or duration >= self.slow_call
+        if self.state == STATE_HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            if failed:
+                self._open()
+            else:
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_probes:
+                    self._close()
+            return
+        if self.state == STATE_OPEN:
+            # Ответ на запрос, отправленный до размыкания
+            return
+
+        self._outcomes.append(failed)
+        if failed and len(self._outcomes) >= self.min_calls and self._failure_rate() >= self.error_rate:
+            self._open()
+
+    def abandon(self, duration: float = 0.0):
+        """Запрос отменен до ответа: медленный считается ошибкой, иначе не учитывается"""
+        if duration >= self.slow_call:
+            self.record(True, duration)
+        elif self.state == STATE_HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def stats(self) -> Dict:
+        retry_after = (max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+                       if self.state == STATE_OPEN else 0.0)
+        return {
+            "state": self.state,
+            "error_rate": round(self._failure_rate(), 3),
+            "recent_calls": len(self._outcomes),
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "retry_after": round(retry_after, 1),
+        }
+
+
+class CircuitBreakers:
+    """Набор circuit breaker по группам эндпоинтов с общими настройками"""
+
+    def __init__(self, families: Iterable[str] = (), **settings):
+        self.settings = settings
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        for family in families:
+            self.get(family)
+
+    def get(self, family: str) -> CircuitBreaker:
+        breaker = self._breakers.get(family)
+        if breaker is None:
+            breaker = self._breakers[family] = CircuitBreaker(family, **self.settings)
+        return breaker
+
+    @property
+    def healthy(self) -> bool:
+        return all(breaker.state == STATE_CLOSED for breaker in self._breakers.values())
+
+    def stats(self) -> Dict:
+        return {family: breaker.stats() for family, breaker in sorted(self._breakers.items())}
@@ -1,10 +1,24 @@
 import httpx
 import asyncio
 import json
+import random
 import time
-from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Set, Tuple
 import logging
+import os
 from datetime import datetime
+from urllib.parse import urlsplit
+from cache.backends import CacheBackend
+from monitoring import Gauge, Histogram
+from cache.match_cache import MatchCache
+from .scheduler import RequestScheduler, PRIORITY_HIGH, PRIORITY_LOW
+from .match_aggregates import MatchAggregate
+from .match_index import MatchIndex
+from .lookup_budget import LookupBudget
+from .circuit_breaker import CircuitBreakers, CircuitOpenError
+from .banner_checker import BannerChecker, DEFAULT_BANNER_TTL, DEFAULT_BANNER_NEGATIVE_TTL
+from .singleflight import SingleFlight
  
 
 # Отключаем DEBUG логирование для HTTP клиентов
@@ -13,34 +27,246 @@ logging.getLogger("httpcore").setLevel(logging.WARNING)
 
 logger = logging.getLogger(__name__)
 
+# Сколько последних матчей используется для расчета статистики
+MATCH_WINDOW_SIZE = 30
+# Сколько матчей показывается в истории ответа (остальные догружаются постранично)
+MATCH_DISPLAY_SIZE = 5
+# Максимальный размер страницы истории матчей в FACEIT API
+MAX_HISTORY_PAGE_SIZE = 100
+# Размер первой страницы истории при инкрементальном обновлении
+HISTORY_HEAD_PAGE_SIZE = 5
+# Для скольких игроков храним окно обработанных матчей
+MAX_TRACKED_PLAYERS = 5000
+# Для скольких завершенных матчей храним индекс игроков (общий для всех игроков матча)
+MAX_INDEXED_MATCHES = 2000
+# Срок загрузки матчей одного поиска в секундах: не успевшие матчи отбрасываются
+MATCH_PROCESSING_DEADLINE = 8.0
+# Общий бюджет времени одного поиска игрока в секундах
+LOOKUP_BUDGET = 15.0
+# Доли оставшегося бюджета: поиск игрока; загрузка отдельных матчей внутри этапа
+# статистики, банов и матчей (остаток - на страницу истории и сборку окна)
+PLAYER_STAGE_SHARE = 0.4
+MATCH_FANOUT_SHARE = 0.9
+# Группы эндпоинтов FACEIT, у каждой свой circuit breaker
+ENDPOINT_FAMILIES = ("players", "stats", "games", "history", "bans", "matches", "match-stats")
+# Повторы запросов при ответе 429
+MAX_RETRIES = 3
+RETRY_BACKOFF_BASE = 0.5
+RETRY_MAX_DELAY = 10.0
+
+
+def lookup_settings_from_env() -> Dict:
+    """Читает окна матчей, срок их загрузки и бюджет поиска из переменных окружения"""
+    return {
+        "match_window": int(os.getenv("MATCH_WINDOW_SIZE", MATCH_WINDOW_SIZE)),
+        "display_window": int(os.getenv("MATCH_DISPLAY_SIZE", MATCH_DISPLAY_SIZE)),
+        "match_deadline": float(os.getenv("MATCH_PROCESSING_DEADLINE", MATCH_PROCESSING_DEADLINE)),
+        "lookup_budget": float(os.getenv("LOOKUP_BUDGET", LOOKUP_BUDGET)),
+    }
+
+
+# Профили ответа: full - все данные для сайта, lite - только профиль,
+# статистика и баны (без загрузки матчей и проверки баннера) для расширения
+PROFILE_FULL = "full"
+PROFILE_LITE = "lite"
+PLAYER_PROFILES = (PROFILE_FULL, PROFILE_LITE)
+
+# Колбэк для прогрессивной выдачи: (имя секции, данные секции)
+SectionCallback = Callable[[str, Dict], None]
+
+
+class RateLimitedError(Exception):
+    """FACEIT API продолжает отвечать 429 после всех повторов"""
+    
+    def __init__(self, url: str, retry_after: Optional[float] = None):
+        super().__init__(f"Rate limited by FACEIT API: {url}")
+        self.url = url
+        self.retry_after = retry_after
+
+
+class LookupTimeoutError(Exception):
+    """Игрок не найден за отведенную часть бюджета поиска - отдавать нечего"""
+    
+    def __init__(self, steam_id: str, budget: Optional[float]):
+        super().__init__(f"Player lookup for {steam_id} exceeded its time budget of {budget}s")
+        self.steam_id = steam_id
+        self.budget = budget
+
+# Метрики запросов к FACEIT (сторонние URL, например баннеры, - в группе external)
+UPSTREAM_DURATION = Histogram("faceit_upstream_request_duration_seconds",
+                              "Duration of FACEIT API calls by endpoint family and response status",
+                              ["family", "status"])
+UPSTREAM_IN_FLIGHT = Gauge("faceit_upstream_requests_in_flight",
+                           "FACEIT API calls currently waiting for a response", ["family"])
+MATCH_FANOUT_SIZE = Histogram("faceit_match_fanout_size", "Matches loaded in parallel by one lookup or history page",
+                              buckets=(0, 1, 2, 5, 10, 20, 30, 50, 100))
+LOOKUP_DURATION = Histogram("faceit_player_lookup_duration_seconds",
+                            "Duration of complete player lookups against the FACEIT API", ["profile", "partial"])
+
+# Ошибки, после которых данные неполные, но могут быть догружены позже
+UPSTREAM_UNAVAILABLE = (RateLimitedError, CircuitOpenError)
+
 class FastFaceitClientHttpx:
     """Быстрый клиент для прямых запросов к FACEIT API с использованием httpx"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, http_client: Optional[httpx.AsyncClient] = None,
+                 match_cache: Optional[MatchCache] = None,
+                 scheduler: Optional[RequestScheduler] = None,
+                 match_window: int = MATCH_WINDOW_SIZE,
+                 display_window: int = MATCH_DISPLAY_SIZE,
+                 match_store=None,
+                 match_deadline: Optional[float] = MATCH_PROCESSING_DEADLINE,
+                 lookup_budget: Optional[float] = LOOKUP_BUDGET,
+                 banner_cache: Optional[CacheBackend] = None,
+                 banner_ttl: int = DEFAULT_BANNER_TTL,
+                 banner_negative_ttl: int = DEFAULT_BANNER_NEGATIVE_TTL,
+                 breakers: Optional[CircuitBreakers] = None):
         self.api_key = api_key
         self.base_url = "https://open.faceit.com/data/v4"
         self.headers = {"Authorization": f"Bearer {api_key}"}
-        self.client = None
+        # Общий пул соединений передается снаружи и живет всё время работы приложения;
+        # если его нет, клиент создает собственный на время блока async with
+        self.client = http_client
+        self._owns_client = http_client is None
+        # Кэш неизменяемых данных завершенных матчей (общий для всех игроков)
+        self.match_cache = match_cache
+        # Последнее окно обработанных матчей по player_id для инкрементального обновления
+        self._match_windows: "OrderedDict[str, List[Dict]]" = OrderedDict()
+        # Агрегаты по этим окнам, сдвигаются вместе с окном без полного пересчета
+        self._match_aggregates: Dict[str, MatchAggregate] = {}
+        # Постоянное хранилище обработанных матчей (объект с async load/save, например db.MatchStore);
+        # из него окно восстанавливается после перезапуска или вытеснения из памяти
+        self.match_store = match_store
+        # Фоновые записи в хранилище (держим ссылки, чтобы задачи не собрал GC)
+        self._store_writes: Set[asyncio.Task] = set()
+        # Все запросы проходят через общий планировщик с лимитом одновременных запросов
+        self.scheduler = scheduler or RequestScheduler()
+        # Circuit breaker по группам эндпоинтов: при деградации группы запросы к ней сразу завершаются ошибкой
+        self.breakers = breakers or CircuitBreakers(ENDPOINT_FAMILIES)
+        # Одновременные запросы одного и того же матча выполняются один раз
+        self._match_flights = SingleFlight()
+        # Индексы игроков завершенных матчей: участники одного лобби не разбирают матч заново
+        self._match_indexes: "OrderedDict[str, MatchIndex]" = OrderedDict()
+        # Окно матчей для расчета средних и число матчей в истории ответа;
+        # окно расчета не меньше отображаемого, чтобы история была полной
+        self.display_window = max(1, display_window)
+        self.match_window = max(match_window, self.display_window)
+        # Срок загрузки матчей одного поиска (None - без ограничения)
+        self.match_deadline = match_deadline
+        # Бюджет времени поиска по умолчанию (None - без ограничения)
+        self.lookup_budget = lookup_budget
+        # Статусы баннеров: поиск берет последний известный, HEAD-проверка идет в фоне
+        self.banners = BannerChecker(self.check_image_availability, banner_cache,
+                                     ttl=banner_ttl, negative_ttl=banner_negative_ttl)
     
     async def __aenter__(self):
-        self.client = httpx.AsyncClient(
-            headers=self.headers,
-            timeout=httpx.Timeout(10.0)
-        )
+        if self.client is None:
+            self.client = httpx.AsyncClient(timeout=httpx.Timeout(10.0))
+            self._owns_client = True
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.client:
+        if self.client and self._owns_client:
             await self.client.aclose()
+            self.client = None
+    
+    def _endpoint_family(self, url: str) -> Optional[str]:
+        """Группа эндпоинтов FACEIT API для URL (None для сторонних URL, например баннеров)"""
+        if not url.startswith(self.base_url):
+            return None
+        parts = url[len(self.base_url):].split("?", 1)[0].strip("/").split("/")
+        resource, sub = parts[0], parts[2] if len(parts) > 2 else None
+        if resource == "players":
+            return sub or "players"
+        if resource == "matches":
+            return "match-stats" if sub == "stats" else "matches"
+        return resource
+    
+    async def _send(self, method: str, url: str, host: str, priority: int, family: Optional[str],
+                    **kwargs) -> httpx.Response:
+        """Отправляет запрос через планировщик, сообщая его исход circuit breaker и метрикам"""
+        breaker = self.breakers.get(family) if family else None
+        label = family or "external"
+        if breaker is not None:
+            # Разомкнутая цепь отклоняет запрос сразу, не занимая очередь планировщика
+            breaker.before_call()
+        started = None
+        try:
+            async with self.scheduler.slot(host, priority):
+                started = time.monotonic()
+                with UPSTREAM_IN_FLIGHT.track_in_progress(family=label):
+                    response = await self.client.request(method, url, **kwargs)
+        except asyncio.CancelledError:
+            duration = time.monotonic() - started if started is not None else 0.0
+            if started is not None:
+                UPSTREAM_DURATION.observe(duration, family=label, status="cancelled")
+            if breaker is not None:
+                breaker.abandon(duration)
+            raise
+        except Exception:
+            duration = time.monotonic() - started if started is not None else 0.0
+            UPSTREAM_DURATION.observe(duration, family=label, status="error")
+            if breaker is not None:
+                breaker.record(True, duration)
+            raise
+        duration = time.monotonic() - started
+        UPSTREAM_DURATION.observe(duration, family=label, status=response.status_code)
+        if breaker is not None:
+            # Ошибки сервера и медленные ответы говорят о деградации эндпоинта, 4xx и 429 - нет
+            breaker.record(response.status_code >= 500, duration)
+        return response
+    
+    async def _request(self, method: str, url: str, priority: int = PRIORITY_LOW, **kwargs) -> httpx.Response:
+        """Выполняет запрос через планировщик, повторяя его при ответе 429.
+        
+        Если circuit breaker группы эндпоинтов разомкнут, сразу выбрасывает CircuitOpenError.
+        """
+        host = urlsplit(url).netloc
+        family = self._endpoint_family(url)
+        for attempt in range(MAX_RETRIES + 1):
+            response = await self._send(method, url, host, priority, family, **kwargs)
+            retry_after = self.scheduler.observe_response(host, response.status_code, response.headers)
+            if response.status_code != 429:
+                return response
+            
+            if attempt == MAX_RETRIES:
+                logger.error(f"Giving up after {MAX_RETRIES} retries on 429: {url}")
+                raise RateLimitedError(url, retry_after)
+            
+            # Экспоненциальная задержка с jitter, если сервер не указал Retry-After
+            delay = retry_after if retry_after is not None else RETRY_BACKOFF_BASE * (2 ** attempt)
+            delay = min(RETRY_MAX_DELAY, delay) + random.uniform(0, RETRY_BACKOFF_BASE)
+            logger.warning(f"Rate limited on {url}, retry {attempt + 1}/{MAX_RETRIES} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+    
+    def update_rate_limit(self, new_limit: int):
+        """Меняет лимит одновременных запросов к FACEIT"""
+        self.scheduler.update_rate_limit(new_limit)
+    
+    def configure_adaptive_limits(self, throttle_threshold: Optional[int] = None,
+                                  min_connections: Optional[int] = None,
+                                  recovery_interval: Optional[float] = None,
+                                  enabled: Optional[bool] = None):
+        """Настраивает адаптивное уменьшение лимита при ответах 429"""
+        self.scheduler.configure_adaptive_limits(
+            throttle_threshold=throttle_threshold,
+            min_connections=min_connections,
+            recovery_interval=recovery_interval,
+            enabled=enabled
+        )
     
     async def check_image_availability(self, image_url: str) -> bool:
-        """Проверяет доступность изображения по URL"""
+        """Проверяет доступность изображения по URL.
+
+        При ответе 429 и разомкнутом circuit breaker выбрасывает исключение:
+        такой результат ничего не говорит о баннере и не должен кэшироваться.
+        """
         if not image_url:
             return False
         
         try:
             # Делаем HEAD запрос для проверки доступности изображения
-            response = await self.client.head(image_url, timeout=5.0)
+            response = await self._request("HEAD", image_url, PRIORITY_LOW, timeout=5.0)
             
             # Проверяем статус код и content-type
             if response.status_code == 200:
@@ -55,6 +281,8 @@ class FastFaceitClientHttpx:
                 logger.warning(f"Image not available (status: {response.status_code}): {image_url}")
                 return False
                 
+        except (RateLimitedError, CircuitOpenError):
+            raise
         except Exception as e:
             logger.warning(f"Error checking image availability: {e} for URL: {image_url}")
             return False
@@ -66,7 +294,7 @@ class FastFaceitClientHttpx:
             url = f"{self.base_url}/players?game=cs2&game_player_id={steam_id}"
             logger.debug(f"Requesting player data from: {url}")
             
-            response = await self.client.get(url, headers=self.headers)
+            response = await self._request("GET", url, PRIORITY_HIGH, headers=self.headers)
             
             if response is None:
                 logger.error("Response is None")
@@ -91,6 +319,8 @@ class FastFaceitClientHttpx:
                 logger.error(f"Error getting player: {response.status_code} - {response.text}")
                 return None
                 
+        except (RateLimitedError, CircuitOpenError):
+            raise
         except Exception as e:
             logger.error(f"Exception getting player: {e}")
             import traceback
@@ -102,58 +332,122 @@ class FastFaceitClientHttpx:
         url = f"{self.base_url}/players/{player_id}/stats/cs2"
         
         try:
-            response = await self.client.get(url)
+            response = await self._request("GET", url, PRIORITY_HIGH, headers=self.headers)
             if response.status_code == 200:
                 return response.json()
             else:
                 logger.error(f"Error getting stats: {response.status_code}")
                 return None
+        except (RateLimitedError, CircuitOpenError):
+            raise
         except Exception as e:
             logger.error(f"Exception getting stats: {e}")
             return None
     
-    async def get_player_matches(self, player_id: str, limit: int = 30) -> List[Dict]:
+    async def get_player_recent_match_stats(self, player_id: str, limit: int = 30) -> List[Dict]:
+        """Статистика игрока в последних матчах одним запросом.
+        
+        Возвращает строки в формате обработанных матчей (kills, deaths, assists,
+        result, map) без загрузки деталей и статистики каждого матча.
+        """
+        url = f"{self.base_url}/players/{player_id}/games/cs2/stats?offset=0&limit={limit}"
+        
+        try:
+            response = await self._request("GET", url, PRIORITY_HIGH, headers=self.headers)
+            if response.status_code == 200:
+                items = response.json().get("items", [])
+                return [self._recent_match_row(item.get("stats") or {}) for item in items]
+            else:
+                logger.error(f"Error getting recent match stats: {response.status_code}")
+                return []
+        except (RateLimitedError, CircuitOpenError):
+            raise
+        except Exception as e:
+            logger.error(f"Exception getting recent match stats: {e}")
+            return []
+    
+    def _recent_match_row(self, stats: Dict) -> Dict:
+        return {
+            "match_id": stats.get("Match Id"),
+            "result": "Win" if str(stats.get("Result")) == "1" else "Lose",
+            "map": stats.get("Map"),
+            "kills": self._safe_int(stats.get("Kills")),
+            "deaths": self._safe_int(stats.get("Deaths")),
+            "assists": self._safe_int(stats.get("Assists")),
+        }
+    
+    async def get_player_matches(self, player_id: str, limit: int = 30, offset: int = 0) -> List[Dict]:
         """Получает последние матчи игрока"""
-        url = f"{self.base_url}/players/{player_id}/history?game=cs2&offset=0&limit={limit}"
+        url = f"{self.base_url}/players/{player_id}/history?game=cs2&offset={offset}&limit={limit}"
         
         try:
-            response = await self.client.get(url)
+            response = await self._request("GET", url, PRIORITY_HIGH, headers=self.headers)
             if response.status_code == 200:
                 data = response.json()
                 return data.get("items", [])
             else:
                 logger.error(f"Error getting matches: {response.status_code}")
                 return []
+        except (RateLimitedError, CircuitOpenError):
+            raise
         except Exception as e:
             logger.error(f"Exception getting matches: {e}")
             return []
     
     async def get_match_details(self, match_id: str) -> Optional[Dict]:
         """Получает детали матча"""
+        if self.match_cache is not None:
+            cached = await self.match_cache.get("details", match_id)
+            if cached is not None:
+                return cached
+        
+        return await self._match_flights.do(("details", match_id), lambda: self._fetch_match_details(match_id))
+    
+    async def _fetch_match_details(self, match_id: str) -> Optional[Dict]:
         url = f"{self.base_url}/matches/{match_id}"
         
         try:
-            response = await self.client.get(url)
+            response = await self._request("GET", url, PRIORITY_LOW, headers=self.headers)
             if response.status_code == 200:
-                return response.json()
+                details = response.json()
+                # Кэшируем только завершенные матчи - они больше не изменятся
+                if self.match_cache is not None and details.get("status") == "FINISHED":
+                    await self.match_cache.set("details", match_id, details)
+                return details
             else:
                 logger.error(f"Error getting match details: {response.status_code}")
                 return None
+        except (RateLimitedError, CircuitOpenError):
+            raise
         except Exception as e:
             logger.error(f"Exception getting match details: {e}")
             return None
     
     async def get_match_stats(self, match_id: str) -> Optional[Dict]:
         """Получает статистику матча"""
+        if self.match_cache is not None:
+            cached = await self.match_cache.get("stats", match_id)
+            if cached is not None:
+                return cached
+        
+        return await self._match_flights.do(("stats", match_id), lambda: self._fetch_match_stats(match_id))
+    
+    async def _fetch_match_stats(self, match_id: str) -> Optional[Dict]:
         url = f"{self.base_url}/matches/{match_id}/stats"
         
         try:
-            response = await self.client.get(url)
+            response = await self._request("GET", url, PRIORITY_LOW, headers=self.headers)
             if response.status_code == 200:
-                return response.json()
+                stats_data = response.json()
+                # Статистика публикуется только после окончания матча
+                if self.match_cache is not None and stats_data.get("rounds"):
+                    await self.match_cache.set("stats", match_id, stats_data)
+                return stats_data
             else:
                 logger.error(f"Error getting match stats: {response.status_code}")
                 return None
+        except (RateLimitedError, CircuitOpenError):
+            raise
         except Exception as e:
             logger.error(f"Exception getting match stats: {e}")
             return None
@@ -162,7 +456,7 @@ class FastFaceitClientHttpx:
         """Получает баны игрока"""
         try:
             url = f"{self.base_url}/players/{player_id}/bans"
-            response = await self.client.get(url, headers=self.headers)
+            response = await self._request("GET", url, PRIORITY_HIGH, headers=self.headers)
             response.raise_for_status()
             
             bans_data = response.json()
@@ -179,16 +473,289 @@ class FastFaceitClientHttpx:
             logger.info(f"Found {len(bans)} bans for player {player_id}")
             return bans
             
+        except (RateLimitedError, CircuitOpenError):
+            raise
         except Exception as e:
             logger.error(f"Error fetching bans for player {player_id}: {e}")
             return []
     
-    async def get_complete_player_data(self, steam_id: str) -> Optional[Dict]:
-        """Получает полную информацию об игроке за один раз"""
+    async def _fetch_new_history_items(self, player_id: str, known_ids: set, window: int) -> List[Dict]:
+        """Читает начало истории матчей, пока не встретит уже обработанный матч"""
+        if not known_ids:
+            return (await self.get_player_matches(player_id, window))[:window]
+        
+        new_items = []
+        offset = 0
+        page_size = HISTORY_HEAD_PAGE_SIZE
+        while offset < window:
+            limit = min(page_size, window - offset)
+            page = await self.get_player_matches(player_id, limit, offset)
+            for item in page:
+                if item.get("match_id") in known_ids:
+                    return new_items
+                new_items.append(item)
+            if len(page) < limit:
+                break
+            offset += limit
+            # Игрок сыграл много матчей с прошлого запроса - дальше читаем крупными страницами
+            page_size = window
+        return new_items[:window]
+    
+    @staticmethod
+    def _has_match_summary(item: Dict) -> bool:
+        """Есть ли в элементе истории всё, что нужно из деталей матча: дата, победитель и составы"""
+        results = item.get("results")
+        teams = item.get("teams")
+        return bool(
+            item.get("started_at")
+            and isinstance(results, dict) and results.get("winner")
+            and isinstance(teams, dict)
+            and any(isinstance(team, dict) and team.get("players") for team in teams.values())
+        )
+    
+    async def _get_match_summary(self, item: Dict) -> Optional[Dict]:
+        """Дата, результат и составы матча: из элемента истории, а если их там нет - из деталей матча"""
+        if self._has_match_summary(item):
+            return item
+        return await self.get_match_details(item["match_id"])
+    
+    def _match_index(self, match_id: str, details: Dict, stats_data: Dict) -> MatchIndex:
+        """Индекс игроков матча; для завершенного матча строится один раз"""
+        index = self._match_indexes.get(match_id)
+        if index is not None:
+            self._match_indexes.move_to_end(match_id)
+            return index
+        index = MatchIndex(details, stats_data)
+        # Статистика с раундами есть только у завершенного матча - он уже не изменится
+        if stats_data.get("rounds"):
+            self._match_indexes[match_id] = index
+            while len(self._match_indexes) > MAX_INDEXED_MATCHES:
+                self._match_indexes.popitem(last=False)
+        return index
+    
+    async def _load_match_pair(self, position: int, match: Dict) -> Tuple[int, object, object]:
+        """Загружает детали и статистику одного матча параллельно (ошибки возвращаются как значения)"""
+        details, stats_data = await asyncio.gather(
+            self._get_match_summary(match),
+            self.get_match_stats(match["match_id"]),
+            return_exceptions=True
+        )
+        return position, details, stats_data
+    
+    def _build_processed_match(self, match: Dict, details: Dict, stats_data: Dict, player_id: str) -> Dict:
+        """Приводит матч к формату ответа"""
+        # Один проход по составам и статистике матча для всех полей ниже
+        index = self._match_index(match.get("match_id"), details, stats_data)
+        player_stats = index.player_stats(player_id)
+        return {
+            "match_id": match.get("match_id"),
+            "date": details.get("started_at"),
+            
+            "result": self._determine_match_result(details, player_id, stats_data, index),
+            "score": self._get_match_score(stats_data),
+            "map": self._get_match_map(stats_data),
+            "mode": self._get_match_mode(stats_data),
+            "kills": self._safe_int(player_stats.get("Kills", 0)),
+            "deaths": self._safe_int(player_stats.get("Deaths", 0)),
+            "assists": self._safe_int(player_stats.get("Assists", 0)),
+            "match_url": f"https://www.faceit.com/en/cs2/room/{match.get('match_id')}"
+        }
+    
+    def _match_timeout(self, deadline: Optional[float]) -> Optional[float]:
+        """Таймаут загрузки матчей: match_deadline, но не позже срока этапа поиска"""
+        if deadline is None:
+            return self.match_deadline
+        remaining = max(0.0, deadline - time.monotonic())
+        return remaining if self.match_deadline is None else min(self.match_deadline, remaining)
+    
+    async def _process_match_items(self, items: List[Dict], player_id: str,
+                                   deadline: Optional[float] = None) -> Tuple[List[Dict], bool]:
+        """Загружает детали и статистику матчей и приводит их к формату ответа.
+        
+        Каждый матч обрабатывается сразу, как только готовы его детали и статистика;
+        матчи, не успевшие к сроку match_deadline (или к сроку этапа поиска deadline
+        по time.monotonic), отбрасываются. Второй элемент результата - признак
+        неполных данных (ответ 429, разомкнутый circuit breaker, ошибка загрузки
+        деталей или статистики матча, истекший срок).
+        """
+        items = [match for match in items if match.get("match_id")]
+        MATCH_FANOUT_SIZE.observe(len(items))
+        pairs = [asyncio.ensure_future(self._load_match_pair(position, match))
+                 for position, match in enumerate(items)]
+        processed = {}
+        partial = False
+        timeout = self._match_timeout(deadline)
+        
+        try:
+            for pair in asyncio.as_completed(pairs, timeout=timeout):
+                try:
+                    position, details, stats_data = await pair
+                except asyncio.TimeoutError:
+                    logger.warning(f"Match processing deadline of {timeout:.2f}s exceeded for player {player_id}, "
+                                   f"dropping {len(items) - len(processed)} unfinished matches")
+                    partial = True
+                    break
+                
+                partial = partial or isinstance(details, UPSTREAM_UNAVAILABLE) or isinstance(stats_data, UPSTREAM_UNAVAILABLE)
+                details = None if isinstance(details, Exception) else details
+                stats_data = None if isinstance(stats_data, Exception) else stats_data
+                if details and stats_data:
+                    processed[position] = self._build_processed_match(items[position], details, stats_data, player_id)
+                else:
+                    # Матч пропущен из-за ошибки FACEIT - окно с ним неполное
+                    partial = True
+                    logger.warning(f"Failed to process match {position + 1}: details={details is not None}, stats={stats_data is not None}")
+        finally:
+            # Отстающие запросы после срока не нужны
+            for pair in pairs:
+                pair.cancel()
+        
+        # Матчи обрабатываются в порядке готовности, а в ответе идут в порядке истории
+        processed_matches = [processed[position] for position in sorted(processed)]
+        logger.info(f"Successfully processed {len(processed_matches)} matches out of {len(items)}")
+        return processed_matches, partial
+    
+    async def get_match_history_page(self, player_id: str, offset: int = 0,
+                                     limit: Optional[int] = None) -> Tuple[List[Dict], Optional[int], bool]:
+        """Загружает одну страницу истории матчей игрока.
+        
+        Возвращает обработанные матчи, смещение следующей страницы (None, если
+        история закончилась) и признак того, что часть матчей пропущена
+        (ответ 429 или истекший срок загрузки).
+        """
+        limit = max(1, min(limit or self.display_window, MAX_HISTORY_PAGE_SIZE))
+        offset = max(0, offset)
+        items = await self.get_player_matches(player_id, limit, offset)
+        processed, partial = (
+            await self._process_match_items(items, player_id) if items else ([], False)
+        )
+        next_offset = offset + len(items) if len(items) >= limit else None
+        return processed, next_offset, partial
+    
+    def _shift_aggregate(self, player_id: str, stored: List[Dict], kept: List[Dict],
+                         new_processed: List[Dict], window: int) -> MatchAggregate:
+        """Сдвигает агрегат окна: учитывает новые матчи и убирает выпавшие из окна"""
+        previous = self._match_aggregates.get(player_id)
+        added = new_processed[:window]
+        if previous is None or previous.matches != len(stored) or len(kept) != len(stored):
+            # Окно загружено из хранилища или матчи окна изменились - считаем заново
+            return MatchAggregate.from_matches((added + kept)[:window])
+        aggregate = previous.copy()
+        # Выпадают самые старые матчи (от старых к новым в порядке удаления)
+        dropped = kept[max(0, window - len(added)):]
+        aggregate.update(added, reversed(dropped))
+        return aggregate
+    
+    def _window_aggregate(self, player_id: str, matches: List[Dict]) -> MatchAggregate:
+        """Агрегат для окна матчей: сохраненный, если окно то же самое, иначе вычисленный"""
+        aggregate = self._match_aggregates.get(player_id)
+        if aggregate is not None and self._match_windows.get(player_id) is matches:
+            return aggregate
+        return MatchAggregate.from_matches(matches)
+    
+    async def get_recent_processed_matches(self, player_id: str, window: int = MATCH_WINDOW_SIZE) -> List[Dict]:
+        """Возвращает последние обработанные матчи игрока, догружая только новые"""
+        matches, _ = await self._load_recent_matches(player_id, window)
+        return matches
+    
+    async def _load_recent_matches(self, player_id: str, window: int,
+                                   deadline: Optional[float] = None) -> Tuple[List[Dict], bool]:
+        """Инкрементально обновляет окно матчей; возвращает его и признак неполных данных"""
+        stored = self._match_windows.get(player_id)
+        if stored is None:
+            stored = await self.match_store.load(player_id, window) if self.match_store else []
+        known_ids = {match["match_id"] for match in stored}
+        
+        new_items = await self._fetch_new_history_items(player_id, known_ids, window)
+        if known_ids:
+            logger.info(f"Incremental refresh for player {player_id}: {len(new_items)} new matches")
+        else:
+            logger.info(f"Processing {len(new_items)} matches for player {player_id}")
+        
+        new_processed, partial = (
+            await self._process_match_items(new_items, player_id, deadline) if new_items else ([], False)
+        )
+        
+        # Новые матчи идут первыми, старое окно сдвигается
+        new_ids = {match["match_id"] for match in new_processed}
+        kept = [match for match in stored if match["match_id"] not in new_ids]
+        merged = (new_processed + kept)[:window]
+        
+        # Окно с пропусками (429, ошибка FACEIT или истекший срок) не сохраняем, иначе пропущенные
+        # матчи окажутся старше "известного" и никогда не будут догружены
+        if merged and not partial:
+            self._match_aggregates[player_id] = self._shift_aggregate(
+                player_id, stored, kept, new_processed, window
+            )
+            self._match_windows[player_id] = merged
+            self._match_windows.move_to_end(player_id)
+            while len(self._match_windows) > MAX_TRACKED_PLAYERS:
+                evicted, _ = self._match_windows.popitem(last=False)
+                self._match_aggregates.pop(evicted, None)
+            if new_processed and self.match_store:
+                # Запись в базу не задерживает поиск и не отменяется вместе с ним по бюджету
+                self._schedule_store_write(player_id, new_processed)
+        return merged, partial
+    
+    def _schedule_store_write(self, player_id: str, matches: List[Dict]):
+        task = asyncio.create_task(self.match_store.save(player_id, matches))
+        self._store_writes.add(task)
+        task.add_done_callback(self._store_writes.discard)
+    
+    async def flush_store_writes(self):
+        """Дожидается фоновых записей обработанных матчей (например, при остановке приложения)"""
+        if self._store_writes:
+            await asyncio.gather(*self._store_writes, return_exceptions=True)
+    
+    @staticmethod
+    def _emit_section(on_section: Optional[SectionCallback], name: str, data: Dict):
+        """Передает готовую секцию ответа подписчику, не прерывая загрузку при его ошибке"""
+        if on_section is None:
+            return
+        try:
+            on_section(name, data)
+        except Exception as e:
+            logger.warning(f"Section callback failed for '{name}': {e}")
+
+    async def _load_section(self, coro, on_section: Optional[SectionCallback], name: str, build):
+        """Выполняет этап загрузки и сразу отдает его секцию, не дожидаясь остальных"""
+        result = await coro
+        if on_section is not None:
+            self._emit_section(on_section, name, build(result))
+        return result
+
+    async def get_complete_player_data(self, steam_id: str,
+                                       on_section: Optional[SectionCallback] = None,
+                                       profile: str = PROFILE_FULL,
+                                       budget: Optional[float] = None) -> Optional[Dict]:
+        """Получает полную информацию об игроке за один раз.
+
+        Если передан on_section, секции profile, stats, bans и match_history
+        отдаются в него по мере готовности соответствующих этапов.
+
+        profile=lite пропускает историю матчей и проверку баннера: ответ
+        собирается из 4 запросов (игрок, статистика, баны и статистика последних
+        матчей одним списком) вместо 60+.
+
+        budget - бюджет времени поиска в секундах (по умолчанию lookup_budget).
+        Секции, не уложившиеся в свою долю бюджета, отменяются и перечисляются
+        в missing_sections, а ответ помечается partial. Если в бюджет не уложился
+        сам поиск игрока, выбрасывается LookupTimeoutError.
+        """
+        if profile not in PLAYER_PROFILES:
+            raise ValueError(f"Unknown player profile '{profile}', expected one of {', '.join(PLAYER_PROFILES)}")
         start_time = time.time()
+        budget = self.lookup_budget if budget is None else budget
+        lookup = LookupBudget(budget)
         
         # Получаем основную информацию об игроке
-        player_data = await self.get_player_by_steam_id(steam_id)
+        try:
+            player_data = await asyncio.wait_for(
+                self.get_player_by_steam_id(steam_id),
+                lookup.timeout_until(lookup.stage(PLAYER_STAGE_SHARE))
+            )
+        except asyncio.TimeoutError:
+            raise LookupTimeoutError(steam_id, budget)
         if not player_data:
             return None
         
@@ -196,80 +763,93 @@ class FastFaceitClientHttpx:
         if not player_id:
             return None
         
-        # Параллельно получаем все данные
-        tasks = [
-            self.get_player_stats(player_id),
-            self.get_player_matches(player_id, 30),  # Получаем 30 матчей для расчета статистики
-            self.get_player_bans(player_id)
-        ]
+        self._emit_section(on_section, "profile", {
+            "player_id": player_id,
+            "nickname": player_data.get("nickname"),
+            "avatar": player_data.get("avatar"),
+            "country": player_data.get("country"),
+            "steam": {
+                "nickname": player_data.get("steam_nickname"),
+                "id_64": steam_id,
+                "profile_url": f"https://steamcommunity.com/profiles/{steam_id}"
+            },
+            "faceit": {
+                "url": f"https://www.faceit.com/ru/players/{player_data.get('nickname')}",
+                "elo": self._safe_int(self._get_elo_from_player_data(player_data)),
+                "level": self._safe_int(self._get_level_from_player_data(player_data)),
+                "csgo_elo": self._safe_int(self._get_csgo_elo_from_player_data(player_data))
+            },
+            "games": player_data.get("games", {})
+        })
+        
+        # Баннер: последний известный статус без ожидания сети, неизвестный URL проверяется в фоне
+        banner_url = player_data.get("cover_image")
+        valid_banner = None
+        if banner_url and profile == PROFILE_FULL:
+            if await self.banners.known_status(banner_url):
+                valid_banner = banner_url
+            else:
+                logger.info(f"Banner is not known to be available for player {player_data.get('nickname')}: {banner_url}")
+        
+        # Параллельно получаем все данные в пределах оставшегося бюджета
+        sections = {
+            "stats": self._load_section(self.get_player_stats(player_id), on_section, "stats", lambda stats: {
+                "elo": self._safe_int(self._get_elo_from_stats(stats) or self._get_elo_from_player_data(player_data)),
+                "level": self._safe_int(self._get_level_from_stats(stats) or self._get_level_from_player_data(player_data)),
+                "stats": self._process_stats(stats)
+            }),
+            "bans": self._load_section(self.get_player_bans(player_id), on_section,
+                                       "bans", lambda bans: {"bans": self._process_bans(bans)}),
+        }
+        if profile == PROFILE_FULL:
+            # Окно матчей для расчета статистики (по умолчанию 30); отдельные матчи
+            # загружаются до более раннего срока, чтобы успеть собрать из них окно
+            matches_deadline = lookup.stage(MATCH_FANOUT_SHARE)
+            sections["match_history"] = self._load_section(
+                self._load_recent_matches(player_id, self.match_window, matches_deadline), on_section,
+                "match_history", lambda loaded: {"match_history": loaded[0][:self.display_window]}
+            )
+        else:
+            # Средние за последние матчи одним запросом вместо загрузки каждого матча
+            sections["recent_match_stats"] = self.get_player_recent_match_stats(player_id, self.match_window)
+        
+        tasks = {name: asyncio.ensure_future(coro) for name, coro in sections.items()}
+        try:
+            done, pending = await asyncio.wait(tasks.values(), timeout=lookup.remaining())
+        finally:
+            # Секции, не уложившиеся в бюджет (или весь поиск при его отмене), отменяем
+            for task in tasks.values():
+                task.cancel()
+        missing_sections = [name for name, task in tasks.items() if task in pending]
+        if missing_sections:
+            logger.warning(f"Lookup budget of {budget}s exhausted for {steam_id}, missing sections: {', '.join(missing_sections)}")
+        outcomes = {name: task.exception() or task.result() for name, task in tasks.items() if task in done}
+        stats = outcomes.get("stats")
+        bans = outcomes.get("bans", [])
+        matches_result = outcomes.get("match_history", ([], False))
+        recent_match_stats = outcomes.get("recent_match_stats", [])
         
-        stats, matches, bans = await asyncio.gather(*tasks, return_exceptions=True)
+        # Любой ответ 429, разомкнутый circuit breaker, отброшенные по сроку матчи или пропущенные секции делают
+        # результат неполным - такой результат нельзя кэшировать
+        partial = bool(missing_sections) or any(isinstance(r, UPSTREAM_UNAVAILABLE)
+                                                for r in (stats, matches_result, bans, recent_match_stats))
         
         # Обрабатываем исключения
+        if isinstance(matches_result, Exception):
+            logger.error(f"Error getting matches: {matches_result}")
+            processed_matches = []
+        else:
+            processed_matches, matches_partial = matches_result
+            partial = partial or matches_partial
         if isinstance(stats, Exception):
             logger.error(f"Error getting stats: {stats}")
             stats = None
-        if isinstance(matches, Exception):
-            logger.error(f"Error getting matches: {matches}")
-            matches = []
         if isinstance(bans, Exception):
             logger.error(f"Error getting bans: {bans}")
             bans = []
-        
-        # Получаем детали матчей параллельно (все 30 для расчета статистики)
-        match_details_tasks = []
-        match_stats_tasks = []
-        
-        for match in matches[:30]:  # Берем первые 30 матчей для расчета статистики
-            match_id = match.get("match_id")
-            if match_id:
-                match_details_tasks.append(self.get_match_details(match_id))
-                match_stats_tasks.append(self.get_match_stats(match_id))
-        
-        # Выполняем запросы параллельно
-        match_details_results = await asyncio.gather(*match_details_tasks, return_exceptions=True)
-        match_stats_results = await asyncio.gather(*match_stats_tasks, return_exceptions=True)
-        
-        # Обрабатываем результаты матчей (все 30 для расчета статистики)
-        processed_matches = []
-        logger.info(f"Processing {len(matches)} matches for player {player_data.get('nickname')}")
-        
-        for i, match in enumerate(matches[:30]):
-            if i < len(match_details_results) and i < len(match_stats_results):
-                details = match_details_results[i] if not isinstance(match_details_results[i], Exception) else None
-                stats_data = match_stats_results[i] if not isinstance(match_stats_results[i], Exception) else None
-                
-                if details and stats_data:
-                    processed_matches.append({
-                        "match_id": match.get("match_id"),
-                        "date": details.get("started_at"),
-                        
-                        "result": self._determine_match_result(details, stats_data, player_id),
-                        "score": self._get_match_score(stats_data),
-                        "map": self._get_match_map(stats_data),
-                        "mode": self._get_match_mode(stats_data),
-                        "kills": self._safe_int(self._get_player_kills(stats_data, player_id)),
-                        "deaths": self._safe_int(self._get_player_deaths(stats_data, player_id)),
-                        "assists": self._safe_int(self._get_player_assists(stats_data, player_id)),
-                        "match_url": f"https://www.faceit.com/en/cs2/room/{match.get('match_id')}"
-                    })
-                else:
-                    logger.debug(f"Failed to process match {i+1}: details={details is not None}, stats={stats_data is not None}")
-            else:
-                logger.debug(f"Index out of range for match {i+1}")
-        
-        logger.info(f"Successfully processed {len(processed_matches)} matches out of {len(matches[:30])}")
-        
-        # Проверяем доступность баннера
-        banner_url = player_data.get("cover_image")
-        valid_banner = None
-        if banner_url:
-            is_banner_available = await self.check_image_availability(banner_url)
-            if is_banner_available:
-                valid_banner = banner_url
-                logger.info(f"Banner is available for player {player_data.get('nickname')}: {banner_url}")
-            else:
-                logger.warning(f"Banner is not available for player {player_data.get('nickname')}: {banner_url}")
+        if isinstance(recent_match_stats, Exception):
+            logger.error(f"Error getting recent match stats: {recent_match_stats}")
+            recent_match_stats = []
         
         # Формируем финальный ответ в старом формате для совместимости
         result = {
@@ -290,38 +870,34 @@ class FastFaceitClientHttpx:
                 "csgo_elo": self._safe_int(self._get_csgo_elo_from_player_data(player_data))  # Добавляем CSGO ELO
             },
             "stats": self._process_stats(stats),
-            "match_history": processed_matches[:5],  # Показываем только первые 5 матчей в истории
+            "match_history": processed_matches[:self.display_window],  # Остальные матчи - через постраничную загрузку
             "bans": self._process_bans(bans),
             "games": player_data.get("games", {}),  # Добавляем games для совместимости
-            "processing_time": time.time() - start_time
+            "processing_time": time.time() - start_time,
+            "partial": partial,  # Данные неполные из-за ограничения запросов FACEIT или бюджета времени
+            "missing_sections": missing_sections,  # Секции, не загруженные за бюджет времени
+            "profile": profile
         }
+        if partial:
+            logger.warning(f"Player data for {steam_id} is partial due to FACEIT rate limiting or lookup budget")
+        
+        # Если некоторые статистики не найдены, берем их из агрегата окна последних матчей (по умолчанию 30)
+        if profile == PROFILE_FULL:
+            aggregate = self._window_aggregate(player_id, processed_matches)
+        else:
+            aggregate = MatchAggregate.from_matches(recent_match_stats)
+        for field, total in (("average_kills", "kills"), ("average_deaths", "deaths"), ("average_assists", "assists")):
+            if result["stats"].get(field) is None and aggregate.matches:
+                result["stats"][field] = aggregate.average(total)
+                logger.info(f"Computed {field} from last {aggregate.matches} matches: {result['stats'][field]}")
+            elif result["stats"].get(field) is not None:
+                # Округляем значение из API
+                result["stats"][field] = int(round(float(result["stats"][field])))
         
-        # Если некоторые статистики не найдены, попробуем вычислить их из истории матчей (по 30 последним матчам)
-        if result["stats"].get("average_kills") is None and processed_matches:
-            total_kills = sum(match.get("kills", 0) for match in processed_matches)
-            result["stats"]["average_kills"] = int(round(total_kills / len(processed_matches)))
-            logger.info(f"Computed average_kills from last {len(processed_matches)} matches: {result['stats']['average_kills']}")
-        elif result["stats"].get("average_kills") is not None:
-            # Округляем значение из API
-            result["stats"]["average_kills"] = int(round(float(result["stats"]["average_kills"])))
-        
-        if result["stats"].get("average_deaths") is None and processed_matches:
-            total_deaths = sum(match.get("deaths", 0) for match in processed_matches)
-            result["stats"]["average_deaths"] = int(round(total_deaths / len(processed_matches)))
-            logger.info(f"Computed average_deaths from last {len(processed_matches)} matches: {result['stats']['average_deaths']}")
-        elif result["stats"].get("average_deaths") is not None:
-            # Округляем значение из API
-            result["stats"]["average_deaths"] = int(round(float(result["stats"]["average_deaths"])))
-        
-        if result["stats"].get("average_assists") is None and processed_matches:
-            total_assists = sum(match.get("assists", 0) for match in processed_matches)
-            result["stats"]["average_assists"] = int(round(total_assists / len(processed_matches)))
-            logger.info(f"Computed average_assists from last {len(processed_matches)} matches: {result['stats']['average_assists']}")
-        elif result["stats"].get("average_assists") is not None:
-            # Округляем значение из API
-            result["stats"]["average_assists"] = int(round(float(result["stats"]["average_assists"])))
-        
-        # Добавляем last_30_matches_avg_kills для совместимости (рассчитывается по 30 матчам, но отображается только 5)
+        # Форма игрока по окну последних матчей: винрейт, текущая серия, разбивка по картам
+        result["stats"]["recent_form"] = aggregate.to_dict()
+        
+        # Добавляем last_30_matches_avg_kills для совместимости (рассчитывается по окну расчета, отображается только display_window матчей)
         if result["stats"].get("average_kills") is not None:
             result["stats"]["last_30_matches_avg_kills"] = result["stats"]["average_kills"]
         else:
@@ -359,161 +935,23 @@ class FastFaceitClientHttpx:
         stats["average_mvps"] = safe_int(stats.get("average_mvps"))
         stats["last_30_matches_avg_kills"] = safe_int(stats.get("last_30_matches_avg_kills"))
         
+        LOOKUP_DURATION.observe(result["processing_time"], profile=profile, partial=str(partial).lower())
         logger.info(f"Complete player data retrieved in {result['processing_time']:.2f} seconds")
         return result
     
 
-    def _determine_match_result(self, match_details: Dict, stats_data: Optional[Dict], player_id: str) -> str:
-        """Определяет результат матча для игрока"""
+    def _determine_match_result(self, match_details: Dict, player_id: str,
+                                stats_data: Optional[Dict] = None,
+                                index: Optional[MatchIndex] = None) -> str:
+        """Определяет результат матча для игрока.
+        
+        Сначала по явному победителю, затем по счету и стороне игрока.
+        index - уже построенный MatchIndex матча; без него строится из деталей и статистики.
+        """
         try:
             if not match_details:
                 return "Unknown"
-
-            # Попробуем использовать явного победителя матча
-            results_block = match_details.get("results", {}) if isinstance(match_details.get("results"), dict) else {}
-            winner_team_id = results_block.get("winner") or results_block.get("winner_id") or results_block.get("winner_faction")
-
-            # Найдем к какой команде относится игрок
-            player_team_id = None
-            player_faction_key = None
-            teams_block = match_details.get("teams")
-            iterable_teams = teams_block.values() if isinstance(teams_block, dict) else (teams_block or [])
-            for team in iterable_teams:
-                # team может быть dict со структурой {team_id, players: [{player_id: ...}]}
-                team_id = team.get("team_id") or team.get("faction_id") or team.get("id")
-                team_players = (team.get("players") or []) + (team.get("roster") or [])
-                for p in team_players:
-                    if str(p.get("player_id")) == str(player_id):
-                        player_team_id = team_id
-                        # Если teams представлен как dict, попробуем запомнить ключ фракции
-                        if isinstance(teams_block, dict):
-                            for key, t in teams_block.items():
-                                if t is team:
-                                    player_faction_key = key  # faction1/faction2
-                                    break
-                        break
-                if player_team_id:
-                    break
-
-            # Сопоставляем победителя
-            if winner_team_id:
-                # Если победитель указан как faction1/faction2, сравним по ключу фракции
-                if str(winner_team_id) in ("faction1", "faction2", "team1", "team2"):
-                    if player_faction_key and str(player_faction_key) == str(winner_team_id):
-                        return "Win"
-                    elif player_faction_key:
-                        return "Lose"
-                # Иначе сравним по team_id
-                if player_team_id and str(winner_team_id) == str(player_team_id):
-                    return "Win"
-                if player_team_id:
-                    return "Lose"
-
-            # Фоллбек: сравниваем раунды по score и принадлежность игрока к команде A/B
-            try:
-                # Получаем строку счета, стараясь учесть разные форматы
-                results = match_details.get("results", {}) if isinstance(match_details.get("results"), dict) else {}
-                score_str = results.get("score") or results.get("score_str")
-                if not score_str and stats_data:
-                    score_str = self._get_match_score(stats_data)
-
-                # Нормализуем разделитель
-                if isinstance(score_str, str):
-                    score_norm = (
-                        score_str.replace(" ", "")
-                        .replace("-", "/")
-                        .replace(":", "/")
-                    )
-                else:
-                    score_norm = None
-
-                # Часто score приходит как "16/14" или "13/11"
-                if isinstance(score_norm, str) and "/" in score_norm:
-                    left, right = score_norm.split("/", 1)
-                    left_val = int(str(left).strip())
-                    right_val = int(str(right).strip())
-
-                    player_faction = None
-                    team_index = None
-
-                    # 1) Через factions/teams в match_details (dict)
-                    factions = match_details.get("factions") or (match_details.get("teams") if isinstance(match_details.get("teams"), dict) else None)
-                    if isinstance(factions, dict) and player_faction is None and team_index is None:
-                        for key, team in factions.items():
-                            team_players = (team.get("players") or []) + (team.get("roster") or [])
-                            for p in team_players:
-                                if str(p.get("player_id")) == str(player_id):
-                                    player_faction = key
-                                    if key in ("faction1", "team1", "1", 1, "left"):
-                                        team_index = 0
-                                    elif key in ("faction2", "team2", "2", 2, "right"):
-                                        team_index = 1
-                                    break
-                            if player_faction is not None:
-                                break
-
-                    # 2) Через teams в match_details (list)
-                    if team_index is None and isinstance(match_details.get("teams"), list):
-                        for idx, t in enumerate(match_details.get("teams") or []):
-                            team_players = (t.get("players") or []) + (t.get("roster") or [])
-                            for p in team_players:
-                                if str(p.get("player_id")) == str(player_id):
-                                    team_index = idx
-                                    break
-                            if team_index is not None:
-                                break
-
-                    # 3) Через все rounds[*].teams в stats_data (list или dict)
-                    if team_index is None and stats_data and isinstance(stats_data.get("rounds"), list):
-                        for r in stats_data.get("rounds") or []:
-                            rnd_teams = r.get("teams")
-                            if isinstance(rnd_teams, list):
-                                for idx, t in enumerate(rnd_teams):
-                                    for p in t.get("players", []):
-                                        if str(p.get("player_id")) == str(player_id):
-                                            team_index = idx
-                                            break
-                                    if team_index is not None:
-                                        break
-                            elif isinstance(rnd_teams, dict):
-                                for key, t in rnd_teams.items():
-                                    for p in t.get("players", []):
-                                        if str(p.get("player_id")) == str(player_id):
-                                            player_faction = key
-                                            if key in ("faction1", "team1", "1", 1, "left"):
-                                                team_index = 0
-                                            elif key in ("faction2", "team2", "2", 2, "right"):
-                                                team_index = 1
-                                            break
-                                    if team_index is not None:
-                                        break
-                            if team_index is not None:
-                                break
-
-                    # Если игрок в левой команде — оцениваем левый счет, иначе правый
-                    if player_faction in ("faction1", "team1", "1", 1, "left") or team_index == 0:
-                        if left_val > right_val:
-                            return "Win"
-                        elif left_val < right_val:
-                            return "Lose"
-                        else:
-                            return "Draw"
-                    elif player_faction in ("faction2", "team2", "2", 2, "right") or team_index == 1:
-                        if right_val > left_val:
-                            return "Win"
-                        elif right_val < left_val:
-                            return "Lose"
-                        else:
-                            return "Draw"
-                    # Если не удалось определить фракцию игрока — просто сравним стороны как Unknown
-                    if left_val == right_val:
-                        return "Draw"
-                    # Без знания стороны определить нельзя корректно
-                    return "Unknown"
-            except Exception:
-                pass
-
-            return "Unknown"
+            return (index or MatchIndex(match_details, stats_data)).result_for(player_id)
         except Exception:
             return "Unknown"
     
@@ -546,36 +984,6 @@ class FastFaceitClientHttpx:
                 return game_mode
         return "Unknown"
     
-    def _get_player_kills(self, stats_data: Dict, player_id: str) -> int:
-        """Получает количество убийств игрока"""
-        if stats_data and "rounds" in stats_data:
-            for round_data in stats_data["rounds"]:
-                for team in round_data.get("teams", []):
-                    for player in team.get("players", []):
-                        if str(player.get("player_id")) == str(player_id):
-                            return int(player.get("player_stats", {}).get("Kills", 0))
-        return 0
-    
-    def _get_player_deaths(self, stats_data: Dict, player_id: str) -> int:
-        """Получает количество смертей игрока"""
-        if stats_data and "rounds" in stats_data:
-            for round_data in stats_data["rounds"]:
-                for team in round_data.get("teams", []):
-                    for player in team.get("players", []):
-                        if str(player.get("player_id")) == str(player_id):
-                            return int(player.get("player_stats", {}).get("Deaths", 0))
-        return 0
-    
-    def _get_player_assists(self, stats_data: Dict, player_id: str) -> int:
-        """Получает количество ассистов игрока"""
-        if stats_data and "rounds" in stats_data:
-            for round_data in stats_data["rounds"]:
-                for team in round_data.get("teams", []):
-                    for player in team.get("players", []):
-                        if str(player.get("player_id")) == str(player_id):
-                            return int(player.get("player_stats", {}).get("Assists", 0))
-        return 0
-    
     def _get_elo_from_player_data(self, player_data: Dict) -> Optional[int]:
         """Получает CS2 ELO из основной информации об игроке"""
         # Пробуем получить из games/cs2
@@ -0,0 +1,70 @@
+"""
+Общий пул HTTP-соединений для исходящих запросов приложения
+"""
+
+import logging
+import os
+from typing import Dict
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_TIMEOUT = 10.0
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def http_client_settings_from_env() -> Dict:
+    """Читает настройки пула соединений из переменных окружения"""
+    return {
+        "max_connections": int(os.getenv("HTTP_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)),
+        "max_keepalive_connections": int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", DEFAULT_MAX_KEEPALIVE_CONNECTIONS)),
+        "keepalive_expiry": float(os.getenv("HTTP_KEEPALIVE_EXPIRY", DEFAULT_KEEPALIVE_EXPIRY)),
+        "http2": _env_bool("HTTP2_ENABLED"),
+        "timeout": float(os.getenv("HTTP_TIMEOUT", DEFAULT_TIMEOUT)),
+    }
+
+
+def create_http_client(
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+    http2: bool = False,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> httpx.AsyncClient:
+    """Создает долгоживущий httpx.AsyncClient с настроенным пулом соединений.
+
+    Клиент не содержит заголовков авторизации: каждый API-клиент передает
+    свои заголовки в запросе, поэтому один пул можно разделять между
+    FACEIT, Steam и проверками изображений.
+    """
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("HTTP/2 requested but 'h2' package is not installed, falling back to HTTP/1.1")
+            http2 = False
+
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+    logger.info(
+        f"Creating shared HTTP client: max_connections={max_connections}, "
+        f"max_keepalive={max_keepalive_connections}, keepalive_expiry={keepalive_expiry}s, http2={http2}"
+    )
+    return httpx.AsyncClient(
+        limits=limits,
+        timeout=httpx.Timeout(timeout),
+        http2=http2,
+    )
@@ -0,0 +1,38 @@
+"""
+Бюджет времени одного поиска игрока: этапы получают доли оставшегося
+времени, а работа, не уложившаяся в свой срок, отменяется
+"""
+
+import time
+from typing import Optional
+
+
+class LookupBudget:
+    """Общий срок поиска и сроки его этапов (время по time.monotonic).
+
+    Бюджет None означает поиск без ограничения времени: все сроки тоже None.
+    """
+
+    __slots__ = ("deadline",)
+
+    def __init__(self, seconds: Optional[float]):
+        self.deadline = time.monotonic() + seconds if seconds is not None else None
+
+    def remaining(self) -> Optional[float]:
+        """Сколько секунд осталось до конца поиска"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def stage(self, share: float) -> Optional[float]:
+        """Срок этапа, которому отдается доля share оставшегося времени"""
+        remaining = self.remaining()
+        if remaining is None:
+            return None
+        return time.monotonic() + remaining * share
+
+    def timeout_until(self, stage_deadline: Optional[float]) -> Optional[float]:
+        """Таймаут в секундах до срока этапа (для asyncio.wait_for / asyncio.wait)"""
+        if stage_deadline is None:
+            return None
+        return max(0.0, stage_deadline - time.monotonic())
@@ -0,0 +1,120 @@
+"""
+Агрегаты по окну последних матчей игрока, обновляемые инкрементально
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+WIN_RESULTS = ("Win",)
+LOSS_RESULTS = ("Lose", "Loss")
+
+
+class MatchAggregate:
+    """Суммы, счетчики, текущая серия и разбивка по картам для окна матчей.
+
+    Окно меняется только с краев: новые матчи добавляются через add (от
+    старых к новым), выпавшие из окна старые матчи убираются через remove.
+    Поэтому чтение средних значений не требует прохода по матчам.
+    """
+
+    __slots__ = ("matches", "kills", "deaths", "assists", "wins", "losses",
+                 "streak_result", "streak_length", "maps")
+
+    def __init__(self):
+        self.matches = 0
+        self.kills = 0
+        self.deaths = 0
+        self.assists = 0
+        self.wins = 0
+        self.losses = 0
+        # Текущая серия: результат и число матчей подряд с ним, начиная с последнего
+        self.streak_result: Optional[str] = None
+        self.streak_length = 0
+        # Карта -> счетчики матчей, побед и убийств
+        self.maps: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def from_matches(cls, matches: List[Dict]) -> "MatchAggregate":
+        """Строит агрегат по окну матчей (новые матчи первыми)"""
+        aggregate = cls()
+        for match in reversed(matches):
+            aggregate.add(match)
+        return aggregate
+
+    def copy(self) -> "MatchAggregate":
+        clone = MatchAggregate()
+        for name in self.__slots__:
+            setattr(clone, name, getattr(self, name))
+        clone.maps = {name: dict(split) for name, split in self.maps.items()}
+        return clone
+
+    def _apply(self, match: Dict, sign: int):
+        self.matches += sign
+        self.kills += sign * (match.get("kills") or 0)
+        self.deaths += sign * (match.get("deaths") or 0)
+        self.assists += sign * (match.get("assists") or 0)
+        result = match.get("result")
+        won = result in WIN_RESULTS
+        if won:
+            self.wins += sign
+        elif result in LOSS_RESULTS:
+            self.losses += sign
+
+        map_name = match.get("map") or "Unknown"
+        split = self.maps.setdefault(map_name, {"matches": 0, "wins": 0, "kills": 0})
+        split["matches"] += sign
+        split["wins"] += sign * int(won)
+        split["kills"] += sign * (match.get("kills") or 0)
+        if split["matches"] <= 0:
+            del self.maps[map_name]
+
+    def add(self, match: Dict):
+        """Добавляет матч, сыгранный позже всех уже учтенных"""
+        self._apply(match, 1)
+        result = match.get("result")
+        if result == self.streak_result:
+            self.streak_length += 1
+        else:
+            self.streak_result = result
+            self.streak_length = 1
+
+    def remove(self, match: Dict):
+        """Убирает самый старый матч окна"""
+        self._apply(match, -1)
+        # Серия начинается с последнего матча, поэтому меняется, только если покрывала всё окно
+        self.streak_length = min(self.streak_length, self.matches)
+        if self.streak_length == 0:
+            self.streak_result = None
+
+    def update(self, added: Iterable[Dict], removed: Iterable[Dict]):
+        """Сдвигает окно: removed - выпавшие старые матчи, added - новые (новые первыми)"""
+        for match in removed:
+            self.remove(match)
+        for match in reversed(list(added)):
+            self.add(match)
+
+    def average(self, field: str) -> Optional[int]:
+        """Среднее значение kills, deaths или assists, округленное до целого"""
+        if not self.matches:
+            return None
+        return int(round(getattr(self, field) / self.matches))
+
+    def to_dict(self) -> Dict:
+        return {
+            "matches": self.matches,
+            "wins": self.wins,
+            "losses": self.losses,
+            "win_rate_percent": round(self.wins * 100 / self.matches, 1) if self.matches else 0.0,
+            "average_kills": self.average("kills") or 0,
+            "average_deaths": self.average("deaths") or 0,
+            "average_assists": self.average("assists") or 0,
+            "current_streak": {"result": self.streak_result, "length": self.streak_length},
+            "maps": {
+                name: {
+                    "matches": split["matches"],
+                    "wins": split["wins"],
+                    "win_rate_percent": round(split["wins"] * 100 / split["matches"], 1),
+                    "average_kills": int(round(split["kills"] / split["matches"])),
+                }
+                for name, split in sorted(self.maps.items(), key=lambda item: -item[1]["matches"])
+            },
+        }
@@ -0,0 +1,246 @@
+"""
+Индекс игроков матча: составы и статистика разбираются не более одного
+раза вместо отдельного обхода rounds -> teams -> players для каждого поля
+"""
+
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+# Ключи фракций, соответствующие левой и правой части счета "16 / 14"
+LEFT_SIDES = ("faction1", "team1", "1", "left")
+RIGHT_SIDES = ("faction2", "team2", "2", "right")
+FACTION_KEYS = ("faction1", "faction2", "team1", "team2")
+
+
+class TeamSlot(NamedTuple):
+    """Положение игрока в матче"""
+
+    team_index: Optional[int]  # 0 - левая часть счета, 1 - правая, None - неизвестно
+    faction_key: Optional[str]
+    team_id: Optional[str]
+
+
+def _side_of(key) -> Optional[int]:
+    key = str(key)
+    if key in LEFT_SIDES:
+        return 0
+    if key in RIGHT_SIDES:
+        return 1
+    return None
+
+
+def _team_entries(teams) -> Iterable[Tuple[Optional[int], Optional[str], Dict]]:
+    """(сторона, ключ фракции, команда) для teams в виде словаря фракций или списка"""
+    if isinstance(teams, dict):
+        return [(_side_of(key), str(key), team) for key, team in teams.items() if isinstance(team, dict)]
+    if isinstance(teams, list):
+        return [(position, None, team) for position, team in enumerate(teams) if isinstance(team, dict)]
+    return ()
+
+
+def _teams(teams) -> Iterable[Dict]:
+    """Команды из teams в виде словаря фракций или списка"""
+    if isinstance(teams, dict):
+        teams = teams.values()
+    elif not isinstance(teams, list):
+        return ()
+    return [team for team in teams if isinstance(team, dict)]
+
+
+def _find_stats_player(rounds, player_id: str) -> Optional[Dict]:
+    """Запись игрока из rounds[*].teams (первая карта, в которой он есть)"""
+    for round_data in rounds:
+        for team in _teams(round_data.get("teams")):
+            for player in team.get("players") or ():
+                if str(player.get("player_id")) == player_id:
+                    return player
+    return None
+
+
+def _team_id(team: Dict):
+    return team.get("team_id") or team.get("faction_id") or team.get("id")
+
+
+def _parse_score(score) -> Optional[Tuple[int, int]]:
+    """Разбирает счет вида "16 / 14", "13-11" или "13:11" в пару чисел"""
+    if not isinstance(score, str):
+        return None
+    normalized = score.replace(" ", "").replace("-", "/").replace(":", "/")
+    if "/" not in normalized:
+        return None
+    left, right = normalized.split("/", 1)
+    try:
+        return int(left), int(right)
+    except ValueError:
+        return None
+
+
+class MatchIndex:
+    """Составы, статистика игроков, победитель и счет одного матча.
+
+    Строится по деталям матча (или элементу истории) и его статистике.
+    Первый запрошенный игрок ищется прямым обходом; словари player_id -> запись
+    собираются, только когда матч запрашивают для другого игрока (пакетный
+    поиск, участники одного лобби), и дальше читаются без повторного обхода.
+    """
+
+    __slots__ = ("teams", "rounds", "winner", "_results", "_has_stats", "_lineups", "_stats_players",
+                 "_first_lineup", "_first_stats", "_score")
+
+    def __init__(self, match_details: Optional[Dict] = None, stats_data: Optional[Dict] = None):
+        results = None
+        self.teams = None
+        if isinstance(match_details, dict):
+            # Составы: teams, а для старого формата - factions
+            self.teams = match_details.get("teams") or match_details.get("factions")
+            results = match_details.get("results")
+        self._results: Dict = results if isinstance(results, dict) else {}
+        self._has_stats = bool(stats_data)
+        rounds = stats_data.get("rounds") if isinstance(stats_data, dict) else None
+        self.rounds = rounds or []
+
+        winner = self._results.get("winner") or self._results.get("winner_id") or self._results.get("winner_faction")
+        self.winner = str(winner) if winner else None
+        self._lineups: Optional[Dict[str, Tuple]] = None
+        self._stats_players: Optional[Dict[str, Dict]] = None
+        # (player_id, запись) первого запроса до построения словарей
+        self._first_lineup: Optional[Tuple] = None
+        self._first_stats: Optional[Tuple] = None
+        self._score = None
+
+    @property
+    def round_stats(self) -> Dict:
+        """Статистика первой карты (при нескольких картах берется первая)"""
+        return (self.rounds[0].get("round_stats") or {}) if self.rounds else {}
+
+    @property
+    def game_mode(self) -> Optional[str]:
+        return self.rounds[0].get("game_mode") if self.rounds else None
+
+    @property
+    def score(self) -> Optional[Tuple[int, int]]:
+        """Счет из результатов матча, а если его там нет - из статистики первой карты"""
+        if self._score is None:
+            score = self._results.get("score") or self._results.get("score_str")
+            if not score and self._has_stats:
+                score = self.round_stats.get("Score", "0-0")
+            self._score = _parse_score(score) or ()
+        return self._score or None
+
+    @property
+    def lineups(self) -> Dict[str, Tuple]:
+        """player_id -> (сторона, ключ фракции, команда) по составам матча"""
+        if self._lineups is None:
+            self._lineups = {
+                str(player.get("player_id")): entry
+                for entry in _team_entries(self.teams)
+                for members in (entry[2].get("roster"), entry[2].get("players"))
+                for player in members or ()
+            }
+        return self._lineups
+
+    @property
+    def stats_players(self) -> Dict[str, Dict]:
+        """player_id -> запись игрока из rounds[*].teams; при нескольких картах берется первая"""
+        if self._stats_players is None:
+            players = {}
+            for position, round_data in enumerate(self.rounds):
+                teams = _teams(round_data.get("teams"))
+                if position == 0:
+                    players = {str(player.get("player_id")): player
+                               for team in teams for player in team.get("players") or ()}
+                    continue
+                # Следующие карты дополняют индекс игроками, которых нет в первой
+                for team in teams:
+                    for player in team.get("players") or ():
+                        players.setdefault(str(player.get("player_id")), player)
+            self._stats_players = players
+        return self._stats_players
+
+    def _lineup_entry(self, player_id: str) -> Optional[Tuple]:
+        if self._lineups is None:
+            first = self._first_lineup
+            if first is None:
+                # Последнее вхождение, как при построении словаря
+                entry = None
+                for candidate in _team_entries(self.teams):
+                    for members in (candidate[2].get("roster"), candidate[2].get("players")):
+                        for player in members or ():
+                            if str(player.get("player_id")) == player_id:
+                                entry = candidate
+                self._first_lineup = (player_id, entry)
+                return entry
+            if first[0] == player_id:
+                return first[1]
+        return self.lineups.get(player_id)
+
+    def _stats_player(self, player_id: str) -> Optional[Dict]:
+        if self._stats_players is None:
+            first = self._first_stats
+            if first is None:
+                found = _find_stats_player(self.rounds, player_id)
+                self._first_stats = (player_id, found)
+                return found
+            if first[0] == player_id:
+                return first[1]
+        return self.stats_players.get(player_id)
+
+    def lineup(self, player_id) -> Optional[TeamSlot]:
+        entry = self._lineup_entry(str(player_id))
+        if entry is None:
+            return None
+        side, faction_key, team = entry
+        return TeamSlot(side, faction_key, _team_id(team))
+
+    def side(self, player_id) -> Optional[int]:
+        """Сторона игрока в счете: по составам матча, а если их нет - по статистике"""
+        player_id = str(player_id)
+        entry = self._lineup_entry(player_id)
+        if entry is not None and entry[0] is not None:
+            return entry[0]
+        # Редкий случай: составов нет в деталях, ищем игрока в командах статистики
+        for round_data in self.rounds:
+            for side, _, team in _team_entries(round_data.get("teams")):
+                if side is None:
+                    continue
+                for player in team.get("players") or ():
+                    if str(player.get("player_id")) == player_id:
+                        return side
+        return None
+
+    def player_stats(self, player_id) -> Dict:
+        player = self._stats_player(str(player_id))
+        if player is None:
+            return {}
+        return player.get("player_stats") or {}
+
+    def player_stat(self, player_id, field: str, default=0):
+        return self.player_stats(player_id).get(field, default)
+
+    def result_for(self, player_id) -> str:
+        """Win, Lose, Draw или Unknown для игрока"""
+        player_id = str(player_id)
+
+        # Явный победитель: по ключу фракции (faction1/faction2) или по team_id
+        if self.winner:
+            entry = self._lineup_entry(player_id)
+            if entry is not None:
+                _, faction_key, team = entry
+                if self.winner in FACTION_KEYS and faction_key:
+                    return "Win" if faction_key == self.winner else "Lose"
+                team_id = _team_id(team)
+                if team_id:
+                    return "Win" if self.winner == str(team_id) else "Lose"
+
+        # Фоллбек: счет и сторона игрока
+        score = self.score
+        if score is None:
+            return "Unknown"
+        left, right = score
+        if left == right:
+            return "Draw"
+        side = self.side(player_id)
+        if side is None:
+            # Без знания стороны определить нельзя корректно
+            return "Unknown"
+        player_score, opponent_score = (left, right) if side == 0 else (right, left)
+        return "Win" if player_score > opponent_score else "Lose"
@@ -0,0 +1,314 @@
+"""
+Планировщик исходящих запросов: общий лимит одновременных запросов,
+token bucket на каждый хост и приоритеты для запросов первого экрана
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import time
+import warnings
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Запросы, без которых нельзя показать профиль (игрок, статистика, баны, история)
+PRIORITY_HIGH = 0
+# Фоновые запросы (детали и статистика отдельных матчей, проверка баннера)
+PRIORITY_LOW = 1
+
+DEFAULT_MAX_IN_FLIGHT = 20
+DEFAULT_HOST_RATE = 20.0
+DEFAULT_HOST_BURST = 40
+DEFAULT_THROTTLE_THRESHOLD = 3
+DEFAULT_MIN_CONNECTIONS = 2
+DEFAULT_RECOVERY_INTERVAL = 60.0
+
+
+def scheduler_settings_from_env() -> Dict:
+    """Читает настройки планировщика из переменных окружения"""
+    return {
+        "max_in_flight": int(os.getenv("FACEIT_MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT)),
+        "host_rate": float(os.getenv("FACEIT_HOST_RATE", DEFAULT_HOST_RATE)),
+        "host_burst": int(os.getenv("FACEIT_HOST_BURST", DEFAULT_HOST_BURST)),
+        "throttle_threshold": int(os.getenv("FACEIT_THROTTLE_THRESHOLD", DEFAULT_THROTTLE_THRESHOLD)),
+        "min_connections": int(os.getenv("FACEIT_MIN_IN_FLIGHT", DEFAULT_MIN_CONNECTIONS)),
+        "recovery_interval": float(os.getenv("FACEIT_RECOVERY_INTERVAL", DEFAULT_RECOVERY_INTERVAL)),
+    }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Разбирает заголовок Retry-After (секунды или HTTP-дата)"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_reset(value: Optional[str]) -> Optional[float]:
+    """Разбирает X-RateLimit-Reset: секунды до сброса или unix-время"""
+    if not value:
+        return None
+    try:
+        reset = float(value.strip())
+    except ValueError:
+        return None
+    # Большие значения - это абсолютное unix-время
+    if reset > 1_000_000_000:
+        reset -= time.time()
+    return max(0.0, reset)
+
+
+class TokenBucket:
+    """Token bucket: не более rate запросов в секунду с запасом burst"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+class RequestScheduler:
+    """Общий планировщик запросов к внешним API.
+
+    Ограничивает число одновременных запросов для всего процесса; когда
+    лимит исчерпан, ожидающие запросы выпускаются по приоритету, а внутри
+    одного приоритета - в порядке поступления.
+
+    Лимит адаптивный: при повторяющихся 429 он уменьшается вдвое (не ниже
+    min_connections), а после recovery_interval без ограничений постепенно
+    возвращается к исходному значению.
+    """
+
+    MAX_CONCURRENT_REQUESTS_ABSOLUTE = 100
+
+    def __init__(self, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 host_rate: float = DEFAULT_HOST_RATE, host_burst: int = DEFAULT_HOST_BURST,
+                 throttle_threshold: int = DEFAULT_THROTTLE_THRESHOLD,
+                 min_connections: int = DEFAULT_MIN_CONNECTIONS,
+                 recovery_interval: float = DEFAULT_RECOVERY_INTERVAL,
+                 adaptive: bool = True):
+        self.max_in_flight = min(max_in_flight, self.MAX_CONCURRENT_REQUESTS_ABSOLUTE)
+        self._initial_max_requests = self.max_in_flight
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        self.in_flight = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._host_paused_until: Dict[str, float] = {}
+
+        # Адаптивное ограничение
+        self._adaptive_limit_enabled = adaptive
+        self._throttle_threshold = throttle_threshold
+        self._min_connections = min_connections
+        self._recovery_interval = recovery_interval
+        self._throttle_count = 0
+        self._last_throttle_time = 0.0
+        self._recovery_check_time = 0.0
+
+        # Метрики
+        self.throttled_responses = 0
+        self.total_requests = 0
+        self.queued_requests = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.max_queue_depth = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(self.host_rate, self.host_burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    async def _acquire(self, priority: int):
+        if self.in_flight < self.max_in_flight and self.queue_depth == 0:
+            self.in_flight += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self.queued_requests += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Слот мог быть выдан прямо перед отменой - возвращаем его
+            if future.done() and not future.cancelled():
+                self._release()
+            else:
+                future.cancel()
+            raise
+
+    def _release(self):
+        self.in_flight -= 1
+        self._wake_waiters()
+
+    def _wake_waiters(self):
+        while self._waiters and self.in_flight < self.max_in_flight:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self.in_flight += 1
+            future.set_result(None)
+
+    def update_rate_limit(self, new_limit: int):
+        """Меняет лимит одновременных запросов"""
+        if new_limit > self.MAX_CONCURRENT_REQUESTS_ABSOLUTE:
+            warnings.warn(
+                f"Requested limit {new_limit} exceeds maximum {self.MAX_CONCURRENT_REQUESTS_ABSOLUTE}, "
+                f"using maximum",
+                UserWarning,
+                stacklevel=2,
+            )
+            new_limit = self.MAX_CONCURRENT_REQUESTS_ABSOLUTE
+        new_limit = max(1, int(new_limit))
+        if new_limit != self.max_in_flight:
+            logger.info(f"Scheduler in-flight limit changed: {self.max_in_flight} -> {new_limit}")
+        self.max_in_flight = new_limit
+        # При увеличении лимита сразу выпускаем ожидающих
+        self._wake_waiters()
+
+    def configure_adaptive_limits(self, throttle_threshold: Optional[int] = None,
+                                  min_connections: Optional[int] = None,
+                                  recovery_interval: Optional[float] = None,
+                                  enabled: Optional[bool] = None):
+        """Настраивает параметры адаптивного ограничения"""
+        if throttle_threshold is not None:
+            self._throttle_threshold = throttle_threshold
+        if min_connections is not None:
+            self._min_connections = min_connections
+        if recovery_interval is not None:
+            self._recovery_interval = recovery_interval
+        if enabled is not None:
+            self._adaptive_limit_enabled = enabled
+
+    def _pause_host(self, host: str, delay: float):
+        until = time.monotonic() + delay
+        if until > self._host_paused_until.get(host, 0.0):
+            self._host_paused_until[host] = until
+
+    async def _wait_for_host(self, host: str):
+        delay = self._host_paused_until.get(host, 0.0) - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _register_throttle(self, host: str, retry_after: Optional[float]):
+        """Учитывает ответ 429 и при необходимости уменьшает лимит.
+
+        Считаются только 429 без перерыва дольше recovery_interval между ними:
+        редкие одиночные ответы 429 лимит не уменьшают.
+        """
+        self.throttled_responses += 1
+        now = time.monotonic()
+        if now - self._last_throttle_time > self._recovery_interval:
+            self._throttle_count = 0
+        self._throttle_count += 1
+        self._last_throttle_time = now
+        if retry_after:
+            self._pause_host(host, retry_after)
+
+        if self._adaptive_limit_enabled and self._throttle_count >= self._throttle_threshold:
+            new_limit = max(self._min_connections, self.max_in_flight // 2)
+            if new_limit < self.max_in_flight:
+                logger.warning(f"Sustained throttling from {host}, reducing in-flight limit to {new_limit}")
+                self.update_rate_limit(new_limit)
+            self._throttle_count = 0
+
+    def _check_connection_recovery(self):
+        """Постепенно возвращает лимит, если ограничений давно не было"""
+        if not self._adaptive_limit_enabled or self.max_in_flight >= self._initial_max_requests:
+            return
+        now = time.monotonic()
+        if now - self._last_throttle_time < self._recovery_interval:
+            return
+        if now - self._recovery_check_time < self._recovery_interval:
+            return
+        self._recovery_check_time = now
+        new_limit = min(self._initial_max_requests, self.max_in_flight + max(1, self.max_in_flight // 2))
+        logger.info(f"No throttling for {self._recovery_interval:.0f}s, restoring in-flight limit to {new_limit}")
+        self.update_rate_limit(new_limit)
+
+    def observe_response(self, host: str, status_code: int, headers) -> Optional[float]:
+        """Обрабатывает ответ сервера: 429, Retry-After и заголовки rate limit.
+
+        Возвращает рекомендуемую задержку перед повтором для ответа 429.
+        """
+        retry_after = parse_retry_after(headers.get("retry-after"))
+        if status_code == 429:
+            self._register_throttle(host, retry_after)
+            return retry_after
+
+        remaining = headers.get("x-ratelimit-remaining") or headers.get("ratelimit-remaining")
+        if remaining is not None and remaining.strip() == "0":
+            reset = _parse_reset(headers.get("x-ratelimit-reset") or headers.get("ratelimit-reset"))
+            if reset:
+                logger.info(f"Rate limit quota for {host} exhausted, pausing for {reset:.1f}s")
+                self._pause_host(host, reset)
+
+        self._check_connection_recovery()
+        return None
+
+    @asynccontextmanager
+    async def slot(self, host: str, priority: int = PRIORITY_LOW):
+        """Ждет свободный слот и токен для хоста на время выполнения запроса"""
+        queued_at = time.monotonic()
+        await self._acquire(priority)
+        try:
+            await self._wait_for_host(host)
+            await self._bucket(host).acquire()
+            wait_time = time.monotonic() - queued_at
+            self.total_requests += 1
+            self.total_wait_time += wait_time
+            self.max_wait_time = max(self.max_wait_time, wait_time)
+            if wait_time > 1.0:
+                logger.info(f"Request to {host} waited {wait_time:.2f}s in scheduler queue (priority={priority})")
+            yield
+        finally:
+            self._release()
+
+    def stats(self) -> Dict:
+        """Текущее состояние очереди и накопленные метрики ожидания"""
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "total_requests": self.total_requests,
+            "queued_requests": self.queued_requests,
+            "avg_wait_time": self.total_wait_time / self.total_requests if self.total_requests else 0.0,
+            "max_wait_time": self.max_wait_time,
+            "throttled_responses": self.throttled_responses,
+            "adaptive_limit_enabled": self._adaptive_limit_enabled,
+        }
@@ -0,0 +1,75 @@
+"""
+Объединение одинаковых одновременных запросов (single-flight)
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Выполняет не более одной операции на ключ одновременно.
+
+    Пока операция для ключа выполняется, остальные вызовы с тем же ключом
+    ждут ее результат (или исключение) вместо повторного запуска. Операция
+    выполняется в отдельной задаче, поэтому отмена одного из ожидающих не
+    прерывает ее для остальных. Когда отменяются все ожидающие, операция
+    тоже отменяется, чтобы не занимать соединения и слоты планировщика.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        # Число ожидающих результата каждой задачи
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self.started = 0
+        self.shared = 0
+        self.abandoned = 0
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.shared += 1
+            logger.debug(f"Joining in-flight operation for key {key}")
+        else:
+            self.started += 1
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._leave(key, task)
+
+    def _leave(self, key: Hashable, task: asyncio.Task):
+        self._waiters[task] -= 1
+        if self._waiters[task] > 0:
+            return
+        del self._waiters[task]
+        if not task.done():
+            # Результат больше никому не нужен
+            self.abandoned += 1
+            logger.debug(f"Cancelling abandoned operation for key {key}")
+            if self._in_flight.get(key) is task:
+                del self._in_flight[key]
+            task.cancel()
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Забираем исключение, даже если все ожидающие уже отменены
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict:
+        return {
+            "in_flight": len(self._in_flight),
+            "started": self.started,
+            "shared": self.shared,
+            "abandoned": self.abandoned,
+        }
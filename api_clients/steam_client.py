@@ -0,0 +1,90 @@
+"""
+Асинхронный клиент Steam Web API для преобразования vanity URL в SteamID64
+"""
+
+import logging
+import os
+from typing import Dict, Optional
+
+import httpx
+
+from cache.backends import CacheBackend, MemoryBackend
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+RESOLVE_VANITY_URL = "https://api.steampowered.com/ISteamUser/ResolveVanityURL/v0001/"
+
+DEFAULT_TIMEOUT = 5.0
+# Vanity URL меняются редко - храним результат неделю
+DEFAULT_VANITY_TTL = 7 * 24 * 3600
+# Несуществующие имена перепроверяем чаще - их могут занять
+DEFAULT_NEGATIVE_TTL = 3600
+
+# Значение в кэше для имени, которое Steam не смог разрешить
+_NOT_FOUND = b""
+
+
+def steam_client_settings_from_env() -> Dict:
+    """Читает настройки клиента Steam из переменных окружения"""
+    return {
+        "timeout": float(os.getenv("STEAM_API_TIMEOUT", DEFAULT_TIMEOUT)),
+        "vanity_ttl": int(os.getenv("STEAM_VANITY_TTL", DEFAULT_VANITY_TTL)),
+        "negative_ttl": int(os.getenv("STEAM_VANITY_NEGATIVE_TTL", DEFAULT_NEGATIVE_TTL)),
+    }
+
+
+class SteamApiError(Exception):
+    """Steam API недоступен или вернул некорректный ответ"""
+
+
+class SteamClient:
+    """Клиент Steam Web API поверх общего пула HTTP-соединений"""
+
+    def __init__(self, api_key: str, http_client: httpx.AsyncClient,
+                 cache_backend: Optional[CacheBackend] = None,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 vanity_ttl: int = DEFAULT_VANITY_TTL,
+                 negative_ttl: int = DEFAULT_NEGATIVE_TTL):
+        self.api_key = api_key
+        self.client = http_client
+        self.cache = cache_backend if cache_backend is not None else MemoryBackend(max_entries=20000, max_bytes=8 * 1024 * 1024)
+        self.timeout = timeout
+        self.vanity_ttl = vanity_ttl
+        self.negative_ttl = negative_ttl
+        self._flights = SingleFlight()
+
+    async def resolve_vanity_url(self, vanity: str) -> Optional[str]:
+        """Возвращает SteamID64 для кастомного ID профиля или None, если его нет"""
+        key = f"vanity:{vanity.lower()}"
+        cached = await self.cache.get(key)
+        if cached is not None:
+            logger.info(f"Using cached vanity resolution for {vanity}")
+            return cached.decode() or None
+
+        return await self._flights.do(key, lambda: self._resolve(vanity, key))
+
+    async def _resolve(self, vanity: str, key: str) -> Optional[str]:
+        logger.info(f"Resolving custom ID via Steam API: {vanity}")
+        try:
+            response = await self.client.get(
+                RESOLVE_VANITY_URL,
+                params={"key": self.api_key, "vanityurl": vanity},
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            data = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error(f"Error querying Steam API for {vanity}: {e}")
+            raise SteamApiError(str(e)) from e
+
+        result = data.get("response", {}) if isinstance(data, dict) else {}
+        if result.get("success") == 1 and result.get("steamid"):
+            steam_id = str(result["steamid"])
+            await self.cache.set(key, steam_id.encode(), ttl=self.vanity_ttl)
+            logger.info(f"Successfully resolved custom ID {vanity} to Steam ID: {steam_id}")
+            return steam_id
+
+        logger.warning(f"Failed to resolve custom ID {vanity}: {result.get('message', 'Unknown error')}")
+        await self.cache.set(key, _NOT_FOUND, ttl=self.negative_ttl)
+        return None
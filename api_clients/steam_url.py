@@ -0,0 +1,94 @@
+"""
+Разбор пользовательского ввода Steam без обращения к сети.
+
+Поддерживаемые форматы:
+    https://steamcommunity.com/profiles/76561198000000000
+    https://steamcommunity.com/id/<vanity>
+    https://s.team/p/<code>
+    76561198000000000          (SteamID64)
+    STEAM_0:1:19999999         (SteamID2)
+    [U:1:39999999]             (SteamID3)
+
+В Steam API нужно идти только для кастомных ссылок /id/<vanity>.
+"""
+
+import re
+from typing import NamedTuple, Optional
+
+# SteamID64 индивидуального аккаунта публичной вселенной = база + account ID
+STEAM_ID64_BASE = 76561197960265728
+_MAX_ACCOUNT_ID = 0xFFFFFFFF
+
+_PROFILE_RE = re.compile(r"steamcommunity\.com/profiles/(\d{17})(?:[/?#]|$)", re.IGNORECASE)
+_VANITY_RE = re.compile(r"steamcommunity\.com/id/([A-Za-z0-9_-]{1,64})(?:[/?#]|$)", re.IGNORECASE)
+_SHORT_LINK_RE = re.compile(r"s\.team/p/([a-z-]+)(?:[/?#]|$)", re.IGNORECASE)
+_STEAM_ID64_RE = re.compile(r"^\d{17}$")
+_STEAM_ID2_RE = re.compile(r"^STEAM_[01]:([01]):(\d{1,10})$", re.IGNORECASE)
+_STEAM_ID3_RE = re.compile(r"^\[?U:1:(\d{1,10})\]?$", re.IGNORECASE)
+
+# Код в ссылке s.team/p/ - это account ID в шестнадцатеричном виде,
+# где цифры 0-f заменены согласными
+_SHORT_CODE_TABLE = str.maketrans("bcdfghjkmnpqrtvw", "0123456789abcdef")
+_SHORT_CODE_ALPHABET = frozenset("bcdfghjkmnpqrtvw")
+
+
+class SteamInput(NamedTuple):
+    """Результат разбора: готовый SteamID64 или кастомный ID для Steam API"""
+
+    steam_id: Optional[str] = None
+    vanity: Optional[str] = None
+
+
+def account_id_to_steam_id64(account_id: int) -> Optional[str]:
+    """Переводит 32-битный account ID в SteamID64"""
+    if not 0 < account_id <= _MAX_ACCOUNT_ID:
+        return None
+    return str(STEAM_ID64_BASE + account_id)
+
+
+def _is_individual_id64(value: str) -> bool:
+    return account_id_to_steam_id64(int(value) - STEAM_ID64_BASE) == value
+
+
+def _decode_short_code(code: str) -> Optional[str]:
+    code = code.replace("-", "").lower()
+    if not code or len(code) > 8 or not set(code) <= _SHORT_CODE_ALPHABET:
+        return None
+    return account_id_to_steam_id64(int(code.translate(_SHORT_CODE_TABLE), 16))
+
+
+def parse_steam_input(value: str) -> SteamInput:
+    """Извлекает SteamID64 или кастомный ID из ссылки либо идентификатора.
+
+    Если формат не распознан, оба поля результата равны None.
+    """
+    value = (value or "").strip()
+    if not value:
+        return SteamInput()
+
+    if _STEAM_ID64_RE.match(value):
+        return SteamInput(steam_id=value) if _is_individual_id64(value) else SteamInput()
+
+    match = _PROFILE_RE.search(value)
+    if match:
+        steam_id = match.group(1)
+        return SteamInput(steam_id=steam_id) if _is_individual_id64(steam_id) else SteamInput()
+
+    match = _VANITY_RE.search(value)
+    if match:
+        return SteamInput(vanity=match.group(1))
+
+    match = _SHORT_LINK_RE.search(value)
+    if match:
+        return SteamInput(steam_id=_decode_short_code(match.group(1)))
+
+    match = _STEAM_ID2_RE.match(value)
+    if match:
+        y, z = int(match.group(1)), int(match.group(2))
+        return SteamInput(steam_id=account_id_to_steam_id64(z * 2 + y))
+
+    match = _STEAM_ID3_RE.match(value)
+    if match:
+        return SteamInput(steam_id=account_id_to_steam_id64(int(match.group(1))))
+
+    return SteamInput()
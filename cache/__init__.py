@@ -0,0 +1,40 @@
+"""
+Кэши приложения для снижения числа запросов к FACEIT API.
+"""
+
+from .backends import (
+    CacheBackend,
+    MemoryBackend,
+    DiskBackend,
+    RedisBackend,
+    create_backend_from_env,
+    dumps,
+    loads,
+    pack,
+    unpack
+)
+from .match_cache import MatchCache, match_cache_settings_from_env
+from .player_cache import (
+    PlayerCache,
+    player_cache_settings_from_env,
+    serialize_payload,
+    merge_envelope
+)
+
+__all__ = [
+    "CacheBackend",
+    "MemoryBackend",
+    "DiskBackend",
+    "RedisBackend",
+    "create_backend_from_env",
+    "dumps",
+    "loads",
+    "pack",
+    "unpack",
+    "MatchCache",
+    "match_cache_settings_from_env",
+    "PlayerCache",
+    "player_cache_settings_from_env",
+    "serialize_payload",
+    "merge_envelope"
+]
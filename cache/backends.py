@@ -0,0 +1,277 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 2000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Полезная нагрузка больше этого размера сжимается zlib
+COMPRESSION_THRESHOLD = 1024
+_PLAIN_MARKER = b"j"
+_COMPRESSED_MARKER = b"z"
+
+# Разрешенные символы в имени файла для дискового хранилища
+_SAFE_KEY_RE = re.compile(r"^[A-Za-z0-9_\-:]+$")
+
+
+def pack(raw: bytes) -> bytes:
+    """Добавляет маркер формата и сжимает крупные данные"""
+    if len(raw) > COMPRESSION_THRESHOLD:
+        return _COMPRESSED_MARKER + zlib.compress(raw, 6)
+    return _PLAIN_MARKER + raw
+
+
+def unpack(data: bytes) -> bytes:
+    """Обратная операция к pack"""
+    marker, payload = data[:1], data[1:]
+    if marker == _COMPRESSED_MARKER:
+        try:
+            return zlib.decompress(payload)
+        except zlib.error as e:
+            raise ValueError(f"Corrupted cache payload: {e}") from e
+    if marker != _PLAIN_MARKER:
+        raise ValueError("Unknown cache payload format")
+    return payload
+
+
+def dumps(value: Any) -> bytes:
+    """Компактно сериализует значение: JSON без пробелов, крупные значения сжимаются"""
+    return pack(json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8"))
+
+
+def loads(data: bytes) -> Any:
+    """Обратная операция к dumps"""
+    return json.loads(unpack(data))
+
+
+class CacheBackend:
+    """Интерфейс хранилища кэша: ключ -> байты с необязательным TTL"""
+
+    name = "base"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        raise NotImplementedError
+
+    async def delete(self, key: str):
+        raise NotImplementedError
+
+    async def sweep(self) -> int:
+        """Удаляет просроченные записи, если хранилище не делает этого само"""
+        return 0
+
+    async def close(self):
+        pass
+
+    def stats(self) -> Dict:
+        return {"backend": self.name}
+
+
+class MemoryBackend(CacheBackend):
+    """Хранилище в памяти процесса: LRU с лимитом по числу записей и объему"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> (время истечения или None, данные)
+        self._entries: "OrderedDict[str, Tuple[Optional[float], bytes]]" = OrderedDict()
+        self.total_bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str):
+        _, value = self._entries.pop(key)
+        self.total_bytes -= len(value)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and time.time() >= expires_at:
+            self._remove(key)
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        if len(value) > self.max_bytes:
+            logger.warning(f"Cache entry {key} is larger than the cache limit ({len(value)} bytes), skipping")
+            return
+        if key in self._entries:
+            self._remove(key)
+        expires_at = time.time() + ttl if ttl else None
+        self._entries[key] = (expires_at, value)
+        self.total_bytes += len(value)
+
+        while self._entries and (len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    async def delete(self, key: str):
+        if key in self._entries:
+            self._remove(key)
+
+    async def sweep(self) -> int:
+        now = time.time()
+        expired = [key for key, (expires_at, _) in self._entries.items()
+                   if expires_at is not None and now >= expires_at]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+        return len(expired)
+
+    def stats(self) -> Dict:
+        return {
+            "backend": self.name,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class DiskBackend(CacheBackend):
+    """Файловое хранилище для бессрочных записей (например, завершенных матчей)"""
+
+    name = "disk"
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(self.path, exist_ok=True)
+
+    def _file_path(self, key: str) -> Optional[str]:
+        if not _SAFE_KEY_RE.match(key):
+            return None
+        return os.path.join(self.path, key.replace(":", "_") + ".bin")
+
+    async def get(self, key: str) -> Optional[bytes]:
+        path = self._file_path(key)
+        if not path:
+            return None
+        return await asyncio.to_thread(self._read_file, path)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        path = self._file_path(key)
+        if path:
+            await asyncio.to_thread(self._write_file, path, value)
+
+    async def delete(self, key: str):
+        path = self._file_path(key)
+        if path:
+            try:
+                await asyncio.to_thread(os.remove, path)
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _read_file(path: str) -> Optional[bytes]:
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Failed to read cache file {path}: {e}")
+            return None
+
+    @staticmethod
+    def _write_file(path: str, value: bytes):
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(value)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write cache file {path}: {e}")
+
+    def stats(self) -> Dict:
+        return {"backend": self.name, "path": self.path}
+
+
+class RedisBackend(CacheBackend):
+    """Хранилище в Redis (или совместимом сервере), общее для всех воркеров.
+
+    Требует пакет redis (pip install redis). Для тестов можно передать
+    готовый клиент, например fakeredis.aioredis.FakeRedis().
+    """
+
+    name = "redis"
+
+    def __init__(self, url: Optional[str] = None, prefix: str = "faceit:", client=None):
+        if client is None:
+            try:
+                import redis.asyncio as redis_asyncio
+            except ImportError as e:
+                raise RuntimeError("Redis cache backend requires the 'redis' package (pip install redis)") from e
+            client = redis_asyncio.from_url(url or "redis://localhost:6379/0")
+        self.client = client
+        self.prefix = prefix
+        self.errors = 0
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            return await self.client.get(self._key(key))
+        except Exception as e:
+            # Недоступный Redis не должен ломать поиск - работаем как при промахе
+            self.errors += 1
+            logger.warning(f"Redis get failed for {key}: {e}")
+            return None
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        try:
+            if ttl:
+                await self.client.set(self._key(key), value, px=int(ttl * 1000))
+            else:
+                await self.client.set(self._key(key), value)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Redis set failed for {key}: {e}")
+
+    async def delete(self, key: str):
+        try:
+            await self.client.delete(self._key(key))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Redis delete failed for {key}: {e}")
+
+    async def close(self):
+        close = getattr(self.client, "aclose", None) or getattr(self.client, "close", None)
+        if close:
+            await close()
+
+    def stats(self) -> Dict:
+        return {"backend": self.name, "prefix": self.prefix, "errors": self.errors}
+
+
+def create_backend_from_env(prefix: str, max_entries: int = DEFAULT_MAX_ENTRIES,
+                            max_bytes: int = DEFAULT_MAX_BYTES) -> CacheBackend:
+    """Создает хранилище по CACHE_BACKEND (memory или redis)"""
+    backend = os.getenv("CACHE_BACKEND", "memory").strip().lower()
+    if backend == "redis":
+        logger.info(f"Using Redis cache backend for '{prefix}' entries")
+        return RedisBackend(os.getenv("REDIS_URL"), prefix=f"faceit:{prefix}:")
+    if backend != "memory":
+        logger.warning(f"Unknown CACHE_BACKEND '{backend}', using in-memory cache")
+    return MemoryBackend(max_entries=max_entries, max_bytes=max_bytes)
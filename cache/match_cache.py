@@ -0,0 +1,109 @@
+import logging
+import os
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from .backends import CacheBackend, DiskBackend, RedisBackend, dumps, loads
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 5000
+
+
+def match_cache_settings_from_env() -> Dict:
+    """Читает настройки кэша матчей из переменных окружения"""
+    backend = None
+    if os.getenv("CACHE_BACKEND", "memory").strip().lower() == "redis":
+        backend = RedisBackend(os.getenv("REDIS_URL"), prefix="faceit:match:")
+    return {
+        "max_entries": int(os.getenv("MATCH_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+        "disk_path": os.getenv("MATCH_CACHE_DIR") or None,
+        "backend": backend,
+    }
+
+
+class MatchCache:
+    """Кэш ответов /matches/{id} и /matches/{id}/stats.
+
+    Завершенные матчи не меняются, поэтому записи не имеют TTL: из памяти
+    они вытесняются только по LRU, а во втором уровне (диск или Redis)
+    хранятся бессрочно.
+    """
+
+    KINDS = ("details", "stats")
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, disk_path: Optional[str] = None,
+                 backend: Optional[CacheBackend] = None):
+        self.max_entries = max_entries
+        if backend is None and disk_path:
+            backend = DiskBackend(disk_path)
+        self.backend = backend
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self.hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.backend is not None:
+            logger.info(f"Match cache second tier enabled: {self.backend.name}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(kind: str, match_id: str) -> str:
+        return f"{kind}:{match_id}"
+
+    def _remember(self, key: str, data: Dict):
+        self._entries[key] = data
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get(self, kind: str, match_id: str) -> Optional[Dict]:
+        """Возвращает закэшированный ответ или None"""
+        key = self._key(kind, match_id)
+        data = self._entries.get(key)
+        if data is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+        if self.backend is not None:
+            raw = await self.backend.get(key)
+            if raw is not None:
+                try:
+                    data = loads(raw)
+                except ValueError as e:
+                    logger.warning(f"Dropping unreadable match cache entry {key}: {e}")
+                    data = None
+                if data is not None:
+                    self._remember(key, data)
+                    self.backend_hits += 1
+                    return data
+
+        self.misses += 1
+        return None
+
+    async def set(self, kind: str, match_id: str, data: Dict):
+        """Сохраняет ответ в память и во второй уровень, если он есть"""
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown match cache kind: {kind}")
+        key = self._key(kind, match_id)
+        self._remember(key, data)
+
+        if self.backend is not None:
+            await self.backend.set(key, dumps(data))
+
+    def stats(self) -> Dict:
+        """Счетчики попаданий и промахов"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "backend_hits": self.backend_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "backend": self.backend.stats() if self.backend is not None else None,
+        }
@@ -0,0 +1,119 @@
+import json
+import logging
+import os
+import struct
+import time
+from typing import Dict, Optional, Tuple
+
+from .backends import CacheBackend, MemoryBackend, create_backend_from_env, pack, unpack
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOFT_TTL = 300
+DEFAULT_HARD_TTL = 3600
+DEFAULT_MAX_ENTRIES = 2000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Поля, которые зависят от конкретного запроса и не хранятся в кэше
+ENVELOPE_FIELDS = ("source", "processing_time")
+
+# Время записи хранится перед JSON в 8 байтах
+_TIMESTAMP = struct.Struct("!d")
+
+
+def player_cache_settings_from_env() -> Dict:
+    """Читает настройки кэша игроков из переменных окружения"""
+    return {
+        "soft_ttl": int(os.getenv("CACHE_SOFT_TTL", DEFAULT_SOFT_TTL)),
+        "hard_ttl": int(os.getenv("CACHE_HARD_TTL", DEFAULT_HARD_TTL)),
+        "backend": create_backend_from_env(
+            "player",
+            max_entries=int(os.getenv("PLAYER_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+            max_bytes=int(os.getenv("PLAYER_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+        ),
+    }
+
+
+def serialize_payload(data: Dict) -> bytes:
+    """Сериализует ответ с данными игрока в JSON без полей конкретного запроса"""
+    payload = {key: value for key, value in data.items() if key not in ENVELOPE_FIELDS}
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+
+def merge_envelope(payload: bytes, **fields) -> bytes:
+    """Дописывает поля запроса в готовый JSON-объект без его повторной сериализации"""
+    envelope = json.dumps(fields, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    if payload.rstrip() == b"{}":
+        return envelope
+    return payload.rstrip()[:-1] + b"," + envelope[1:]
+
+
+class PlayerCache:
+    """Кэш результатов поиска игроков поверх подключаемого хранилища.
+
+    Записи хранятся как готовый JSON (bytes) и никогда не изменяются:
+    поля конкретного ответа добавляются через merge_envelope.
+
+    Запись свежая до soft_ttl, затем до hard_ttl отдается как устаревшая
+    (stale-while-revalidate), после hard_ttl удаляется хранилищем. Лимиты
+    по числу записей и объему обеспечивает само хранилище.
+    """
+
+    def __init__(self, soft_ttl: int = DEFAULT_SOFT_TTL, hard_ttl: int = DEFAULT_HARD_TTL,
+                 backend: Optional[CacheBackend] = None):
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = max(hard_ttl, soft_ttl)
+        self.backend = backend if backend is not None else MemoryBackend(DEFAULT_MAX_ENTRIES, DEFAULT_MAX_BYTES)
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[Tuple[bytes, bool]]:
+        """Возвращает (JSON ответа, устарел ли он) или None"""
+        raw = await self.backend.get(key)
+        if raw is None:
+            self.misses += 1
+            return None
+
+        try:
+            (stored_at,) = _TIMESTAMP.unpack_from(raw)
+            payload = unpack(raw[_TIMESTAMP.size:])
+        except (struct.error, ValueError) as e:
+            logger.warning(f"Dropping unreadable player cache entry {key}: {e}")
+            await self.backend.delete(key)
+            self.misses += 1
+            return None
+
+        age = time.time() - stored_at
+        if age >= self.hard_ttl:
+            await self.backend.delete(key)
+            self.misses += 1
+            return None
+        if age >= self.soft_ttl:
+            self.stale_hits += 1
+            return payload, True
+        self.hits += 1
+        return payload, False
+
+    async def set(self, key: str, payload: bytes):
+        """Сохраняет готовый JSON со сроком жизни hard_ttl"""
+        await self.backend.set(key, _TIMESTAMP.pack(time.time()) + pack(payload), ttl=self.hard_ttl)
+
+    async def delete(self, key: str):
+        await self.backend.delete(key)
+
+    async def sweep(self) -> int:
+        """Удаляет записи с истекшим жестким TTL"""
+        removed = await self.backend.sweep()
+        if removed:
+            logger.info(f"Player cache sweep removed {removed} expired entries")
+        return removed
+
+    def stats(self) -> Dict:
+        return {
+            **self.backend.stats(),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+        }
@@ -2,7 +2,7 @@
 Database module for FACEIT Stats application.
 
 This module contains database models and operations for storing
-and retrieving recent search data.
+and retrieving recent search data and processed match history.
 """
 
 from .database import (
@@ -12,11 +12,23 @@ from .database import (
     init_test_data_db,
     RecentSearchDB
 )
+from .match_store import (
+    save_player_matches_to_db,
+    get_player_matches_from_db,
+    MatchStore,
+    MatchDB,
+    PlayerMatchDB
+)
 
 __all__ = [
     "init_database",
     "add_recent_search_to_db", 
     "get_recent_searches_from_db",
     "init_test_data_db",
-    "RecentSearchDB"
+    "RecentSearchDB",
+    "save_player_matches_to_db",
+    "get_player_matches_from_db",
+    "MatchStore",
+    "MatchDB",
+    "PlayerMatchDB"
 ] 
\ No newline at end of file
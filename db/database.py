@@ -5,8 +5,13 @@ from datetime import datetime
 import asyncio
 import logging
 
+from monitoring import Histogram
+
 logger = logging.getLogger(__name__)
 
+# Длительность записей в базу данных по операциям
+DB_WRITE_DURATION = Histogram("db_write_duration_seconds", "Duration of database writes", ["operation"])
+
 # Настройка базы данных
 DATABASE_URL = "sqlite+aiosqlite:///./recent_searches.db"
 
@@ -52,45 +57,46 @@ async def add_recent_search_to_db(steam_id: str, nickname: str = None, avatar: s
                                   success: bool = True):
     """Добавляет новый поиск в базу данных"""
     try:
-        async with async_session_maker() as session:
-            # Проверяем, есть ли уже запись с таким steam_id
-            # Если есть, обновляем её, иначе создаем новую
-            from sqlalchemy import select
-            
-            result = await session.execute(
-                select(RecentSearchDB).where(RecentSearchDB.steam_id == steam_id)
-            )
-            existing_search = result.scalar_one_or_none()
+        with DB_WRITE_DURATION.time(operation="recent_search"):
+            async with async_session_maker() as session:
+                # Проверяем, есть ли уже запись с таким steam_id
+                # Если есть, обновляем её, иначе создаем новую
+                from sqlalchemy import select
             
-            if existing_search:
-                # Обновляем существующую запись
-                existing_search.nickname = nickname or existing_search.nickname
-                existing_search.avatar = avatar or existing_search.avatar
-                existing_search.level = level if level is not None else existing_search.level
-                existing_search.country = country or existing_search.country
-                existing_search.has_bans = has_bans
-                existing_search.timestamp = datetime.now()
-                existing_search.success = success
-                logger.info(f"Updated existing search for steam_id: {steam_id}")
-            else:
-                # Создаем новую запись
-                new_search = RecentSearchDB(
-                    steam_id=steam_id,
-                    nickname=nickname or f"Player_{steam_id[-4:]}",
-                    avatar=avatar,
-                    level=level,
-                    country=country,
-                    has_bans=has_bans,
-                    timestamp=datetime.now(),
-                    success=success
+                result = await session.execute(
+                    select(RecentSearchDB).where(RecentSearchDB.steam_id == steam_id)
                 )
-                session.add(new_search)
-                logger.info(f"Added new search for steam_id: {steam_id}")
+                existing_search = result.scalar_one_or_none()
             
-            await session.commit()
+                if existing_search:
+                    # Обновляем существующую запись
+                    existing_search.nickname = nickname or existing_search.nickname
+                    existing_search.avatar = avatar or existing_search.avatar
+                    existing_search.level = level if level is not None else existing_search.level
+                    existing_search.country = country or existing_search.country
+                    existing_search.has_bans = has_bans
+                    existing_search.timestamp = datetime.now()
+                    existing_search.success = success
+                    logger.info(f"Updated existing search for steam_id: {steam_id}")
+                else:
+                    # Создаем новую запись
+                    new_search = RecentSearchDB(
+                        steam_id=steam_id,
+                        nickname=nickname or f"Player_{steam_id[-4:]}",
+                        avatar=avatar,
+                        level=level,
+                        country=country,
+                        has_bans=has_bans,
+                        timestamp=datetime.now(),
+                        success=success
+                    )
+                    session.add(new_search)
+                    logger.info(f"Added new search for steam_id: {steam_id}")
+            
+                await session.commit()
             
-            # Ограничиваем количество записей (оставляем только последние 50)
-            await cleanup_old_searches(session)
+                # Ограничиваем количество записей (оставляем только последние 50)
+                await cleanup_old_searches(session)
             
     except Exception as e:
         logger.error(f"Error adding search to database: {e}")
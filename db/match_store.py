@@ -0,0 +1,145 @@
+from sqlalchemy import Column, Integer, String, Index, select
+from sqlalchemy.dialects.sqlite import insert
+from typing import Dict, List
+import logging
+
+from .database import Base, DB_WRITE_DURATION, async_session_maker
+
+logger = logging.getLogger(__name__)
+
+
+class MatchDB(Base):
+    """Модель для таблицы matches: общие данные завершенного матча"""
+    __tablename__ = "matches"
+
+    match_id = Column(String(64), primary_key=True)
+    started_at = Column(Integer, nullable=True)
+    map = Column(String(64), nullable=True)
+    mode = Column(String(32), nullable=True)
+    score = Column(String(32), nullable=True)
+
+    def __repr__(self):
+        return f"<MatchDB(match_id={self.match_id}, map={self.map}, score={self.score})>"
+
+
+class PlayerMatchDB(Base):
+    """Модель для таблицы player_matches: результат и статистика игрока в матче"""
+    __tablename__ = "player_matches"
+    __table_args__ = (
+        Index("ix_player_matches_player_started", "player_id", "started_at"),
+    )
+
+    player_id = Column(String(64), primary_key=True)
+    match_id = Column(String(64), primary_key=True)
+    # Дублируем дату матча, чтобы история игрока читалась по одному индексу
+    started_at = Column(Integer, nullable=True)
+    result = Column(String(16), nullable=True)
+    kills = Column(Integer, default=0)
+    deaths = Column(Integer, default=0)
+    assists = Column(Integer, default=0)
+
+    def __repr__(self):
+        return f"<PlayerMatchDB(player_id={self.player_id}, match_id={self.match_id}, result={self.result})>"
+
+
+def _to_int(value):
+    try:
+        return int(value) if value is not None else None
+    except (ValueError, TypeError):
+        return None
+
+
+async def save_player_matches_to_db(player_id: str, matches: List[Dict]):
+    """Пакетно сохраняет обработанные матчи игрока (повторные матчи обновляются)"""
+    if not matches:
+        return
+    match_rows = [
+        {
+            "match_id": match["match_id"],
+            "started_at": _to_int(match.get("date")),
+            "map": match.get("map"),
+            "mode": match.get("mode"),
+            "score": match.get("score"),
+        }
+        for match in matches
+    ]
+    player_rows = [
+        {
+            "player_id": player_id,
+            "match_id": match["match_id"],
+            "started_at": _to_int(match.get("date")),
+            "result": match.get("result"),
+            "kills": _to_int(match.get("kills")) or 0,
+            "deaths": _to_int(match.get("deaths")) or 0,
+            "assists": _to_int(match.get("assists")) or 0,
+        }
+        for match in matches
+    ]
+
+    with DB_WRITE_DURATION.time(operation="player_matches"):
+        await _upsert_player_matches(match_rows, player_rows)
+    logger.info(f"Stored {len(matches)} matches for player {player_id}")
+
+
+async def _upsert_player_matches(match_rows: List[Dict], player_rows: List[Dict]):
+    async with async_session_maker() as session:
+        match_insert = insert(MatchDB).values(match_rows)
+        await session.execute(match_insert.on_conflict_do_update(
+            index_elements=[MatchDB.match_id],
+            set_={column: match_insert.excluded[column] for column in ("started_at", "map", "mode", "score")}
+        ))
+        player_insert = insert(PlayerMatchDB).values(player_rows)
+        await session.execute(player_insert.on_conflict_do_update(
+            index_elements=[PlayerMatchDB.player_id, PlayerMatchDB.match_id],
+            set_={column: player_insert.excluded[column]
+                  for column in ("started_at", "result", "kills", "deaths", "assists")}
+        ))
+        await session.commit()
+
+
+async def get_player_matches_from_db(player_id: str, limit: int = 30, offset: int = 0) -> List[Dict]:
+    """Читает последние матчи игрока в формате обработанной истории (новые первыми)"""
+    async with async_session_maker() as session:
+        result = await session.execute(
+            select(PlayerMatchDB, MatchDB)
+            .join(MatchDB, MatchDB.match_id == PlayerMatchDB.match_id)
+            .where(PlayerMatchDB.player_id == player_id)
+            .order_by(PlayerMatchDB.started_at.desc())
+            .offset(offset)
+            .limit(limit)
+        )
+        return [
+            {
+                "match_id": player_match.match_id,
+                "date": player_match.started_at,
+                "result": player_match.result,
+                "score": match.score,
+                "map": match.map,
+                "mode": match.mode,
+                "kills": player_match.kills,
+                "deaths": player_match.deaths,
+                "assists": player_match.assists,
+                "match_url": f"https://www.faceit.com/en/cs2/room/{player_match.match_id}"
+            }
+            for player_match, match in result.all()
+        ]
+
+
+class MatchStore:
+    """Хранилище обработанных матчей для FACEIT клиента.
+
+    Ошибки базы данных не прерывают поиск: клиент просто загрузит матчи из API.
+    """
+
+    async def load(self, player_id: str, limit: int) -> List[Dict]:
+        try:
+            return await get_player_matches_from_db(player_id, limit)
+        except Exception as e:
+            logger.error(f"Error reading stored matches for player {player_id}: {e}")
+            return []
+
+    async def save(self, player_id: str, matches: List[Dict]):
+        try:
+            await save_player_matches_to_db(player_id, matches)
+        except Exception as e:
+            logger.error(f"Error storing matches for player {player_id}: {e}")
@@ -1,25 +1,52 @@
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Path, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, HttpUrl
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import os
 import uvicorn
-import requests
 import logging
-import re
+import asyncio
+import json
 from dotenv import load_dotenv
 import time
 from datetime import datetime
-from api_clients.fast_api_client_httpx import FastFaceitClientHttpx
+from api_clients.fast_api_client_httpx import (
+    FastFaceitClientHttpx,
+    RateLimitedError,
+    LookupTimeoutError,
+    PROFILE_FULL,
+    PROFILE_LITE,
+    PLAYER_PROFILES,
+    ENDPOINT_FAMILIES,
+    lookup_settings_from_env
+)
+from api_clients.circuit_breaker import CircuitBreakers, CircuitOpenError, circuit_breaker_settings_from_env
+from api_clients.http_pool import create_http_client, http_client_settings_from_env
+from api_clients.scheduler import RequestScheduler, scheduler_settings_from_env
+from api_clients.singleflight import SingleFlight
+from api_clients.steam_client import SteamClient, SteamApiError, steam_client_settings_from_env
+from api_clients.steam_url import parse_steam_input
+from api_clients.banner_checker import banner_settings_from_env
+from cache import (
+    MatchCache,
+    match_cache_settings_from_env,
+    PlayerCache,
+    player_cache_settings_from_env,
+    create_backend_from_env,
+    serialize_payload,
+    merge_envelope
+)
+from monitoring import REGISTRY, CONTENT_TYPE, CallbackMetric, Gauge, Histogram
 from db import (
     init_database, 
     add_recent_search_to_db, 
     get_recent_searches_from_db, 
     init_test_data_db,
-    RecentSearchDB
+    RecentSearchDB,
+    MatchStore
 )
 
 # Настройка логирования
@@ -78,13 +105,74 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 # Настраиваем шаблоны
 templates = Jinja2Templates(directory="templates")
 
-# Кэширование результатов поиска игроков (5 минут)
-player_cache = {}
-CACHE_DURATION = 300  # 5 минут в секундах
+# Кэширование результатов поиска игроков (5 минут свежие, затем устаревшие до жесткого TTL)
+player_cache = PlayerCache(**player_cache_settings_from_env())
+CACHE_SWEEP_INTERVAL = int(os.getenv("CACHE_SWEEP_INTERVAL", 60))
 
 # Константы
 MAX_RECENT_SEARCHES = 10
 
+# Метрики HTTP API (см. /metrics)
+HTTP_REQUEST_DURATION = Histogram("http_request_duration_seconds",
+                                  "Duration of API requests until response headers, by route and status",
+                                  ["method", "route", "status"])
+HTTP_REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "API requests currently being handled")
+BATCH_SIZE = Histogram("faceit_batch_size", "Unique players per batch lookup request",
+                       buckets=(1, 2, 5, 10, 25, 50, 100))
+
+# Общий HTTP-клиент и FACEIT клиент на всё время жизни процесса
+http_client = None
+faceit_client: Optional[FastFaceitClientHttpx] = None
+
+steam_client: Optional[SteamClient] = None
+
+def get_http_client():
+    """Возвращает общий пул HTTP-соединений, создавая его при первом обращении"""
+    global http_client
+    if http_client is None:
+        http_client = create_http_client(**http_client_settings_from_env())
+    return http_client
+
+def get_faceit_client() -> FastFaceitClientHttpx:
+    """Возвращает общий FACEIT клиент, создавая его при первом обращении"""
+    global faceit_client
+    if faceit_client is None:
+        api_key = os.getenv("FACEIT_API_KEY")
+        if not api_key:
+            logger.error("FACEIT_API_KEY not found during request")
+            raise HTTPException(status_code=500, detail="FACEIT API key not configured")
+        faceit_client = FastFaceitClientHttpx(
+            api_key,
+            http_client=get_http_client(),
+            match_cache=MatchCache(**match_cache_settings_from_env()),
+            scheduler=RequestScheduler(**scheduler_settings_from_env()),
+            match_store=MatchStore(),
+            banner_cache=create_backend_from_env("banner", max_entries=20000, max_bytes=4 * 1024 * 1024),
+            breakers=CircuitBreakers(ENDPOINT_FAMILIES, **circuit_breaker_settings_from_env()),
+            **lookup_settings_from_env(),
+            **banner_settings_from_env()
+        )
+    return faceit_client
+
+def get_steam_client() -> SteamClient:
+    """Возвращает общий клиент Steam API (использует тот же пул соединений)"""
+    global steam_client
+    if steam_client is None:
+        steam_api_key = os.getenv("STEAM_API_KEY")
+        if not steam_api_key:
+            logger.error("STEAM_API_KEY not found in environment variables")
+            raise HTTPException(
+                status_code=500,
+                detail="STEAM_API_KEY not configured"
+            )
+        steam_client = SteamClient(
+            steam_api_key,
+            get_http_client(),
+            cache_backend=create_backend_from_env("steam", max_entries=20000, max_bytes=8 * 1024 * 1024),
+            **steam_client_settings_from_env()
+        )
+    return steam_client
+
 class RecentSearch(BaseModel):
     """Модель для хранения информации о недавнем запросе"""
     steam_id: str
@@ -112,81 +200,178 @@ async def add_recent_search(steam_id: str, nickname: str = None, avatar: str = N
     except Exception as e:
         logger.error(f"Failed to add recent search to database: {e}")
 
-def get_cached_player(steam_id: str):
-    """Получает кэшированного игрока"""
-    if steam_id in player_cache:
-        cached_time, cached_data = player_cache[steam_id]
-        if time.time() - cached_time < CACHE_DURATION:
-            logger.info(f"Using cached data for Steam ID: {steam_id}")
-            return cached_data
-        else:
-            del player_cache[steam_id]
-    return None
-
-def cache_player(steam_id: str, data: dict):
-    """Кэширует данные игрока"""
-    player_cache[steam_id] = (time.time(), data)
-    logger.info(f"Cached data for Steam ID: {steam_id}")
+def player_cache_key(steam_id: str, profile: str = PROFILE_FULL) -> str:
+    """Ключ кэша игрока; полный профиль хранится под самим Steam ID"""
+    return steam_id if profile == PROFILE_FULL else f"{steam_id}:{profile}"
+
+async def get_cached_player(steam_id: str, profile: str = PROFILE_FULL):
+    """Получает кэшированного игрока.
+    
+    Возвращает пару (готовый JSON, устарел ли он) или None, если записи нет
+    или истек жесткий TTL. Для профиля lite подходит и свежая полная запись.
+    """
+    cached = await player_cache.get(player_cache_key(steam_id, profile))
+    if not cached and profile != PROFILE_FULL:
+        full = await player_cache.get(steam_id)
+        if full and not full[1]:
+            cached = full
+    if cached:
+        logger.info(f"Using {'stale ' if cached[1] else ''}cached data for Steam ID: {steam_id}")
+    return cached
+
+async def cache_player(steam_id: str, payload: bytes, profile: str = PROFILE_FULL):
+    """Кэширует данные игрока (уже сериализованные в JSON)"""
+    await player_cache.set(player_cache_key(steam_id, profile), payload)
+    logger.info(f"Cached {profile} data for Steam ID: {steam_id}")
+
+async def sweep_player_cache_periodically():
+    """Периодически удаляет просроченные записи, к которым больше не обращаются"""
+    while True:
+        await asyncio.sleep(CACHE_SWEEP_INTERVAL)
+        await player_cache.sweep()
+
+cache_sweeper_task = None
+
+# Одновременные промахи кэша по одному Steam ID ждут одну загрузку
+player_lookups = SingleFlight()
+
+# Метрики, которые читаются из счетчиков кэшей и очередей при выгрузке /metrics
+CallbackMetric(
+    "faceit_player_cache_requests_total", "Player cache lookups by result", "counter", ["result"],
+    lambda: {(result,): player_cache.stats()[key]
+             for result, key in (("hit", "hits"), ("stale", "stale_hits"), ("miss", "misses"))}
+)
+CallbackMetric(
+    "faceit_player_cache_entries", "Entries in the player cache", "gauge", [],
+    lambda: {(): player_cache.stats().get("entries", 0)}
+)
+CallbackMetric(
+    "faceit_match_cache_requests_total", "Finished match cache lookups by result", "counter", ["result"],
+    lambda: {(result,): faceit_client.match_cache.stats()[key]
+             for result, key in (("hit", "hits"), ("backend_hit", "backend_hits"), ("miss", "misses"))}
+    if faceit_client is not None and faceit_client.match_cache is not None else {}
+)
+CallbackMetric(
+    "faceit_player_lookups_in_flight", "Player lookups currently loading from the FACEIT API", "gauge", [],
+    lambda: {(): player_lookups.stats()["in_flight"]}
+)
+CallbackMetric(
+    "faceit_scheduler_requests", "FACEIT requests holding a scheduler slot or waiting for one", "gauge", ["state"],
+    lambda: {("in_flight",): faceit_client.scheduler.stats()["in_flight"],
+             ("queued",): faceit_client.scheduler.stats()["queue_depth"]}
+    if faceit_client is not None else {}
+)
+
+# Ответ, когда за бюджет поиска не удалось найти даже самого игрока
+LOOKUP_TIMEOUT_DETAIL = "FACEIT API did not respond in time. Please try again later."
+# Ответ, когда нужные эндпоинты FACEIT отключены circuit breaker
+FACEIT_UNAVAILABLE_DETAIL = "FACEIT API is temporarily unavailable. Please try again later."
+
+def circuit_open_exception(e: CircuitOpenError) -> HTTPException:
+    """503 с Retry-After до следующей пробы эндпоинта"""
+    headers = {"Retry-After": str(max(1, int(e.retry_after)))} if e.retry_after else None
+    return HTTPException(status_code=503, detail=FACEIT_UNAVAILABLE_DETAIL, headers=headers)
+
+async def load_player(steam_id: str, on_section=None,
+                      profile: str = PROFILE_FULL) -> Optional[Tuple[dict, bytes]]:
+    """Загружает данные игрока, один раз сериализует их и кэширует"""
+    result = await get_faceit_client().get_complete_player_data(steam_id, on_section=on_section, profile=profile)
+    if not result:
+        return None
+    payload = serialize_payload(result)
+    # Кэшируем только полный результат (без пропусков из-за 429 или бюджета времени)
+    if not result.get("partial"):
+        await cache_player(steam_id, payload, profile)
+    return result, payload
+
+async def fetch_player_data(steam_id: str, on_section=None,
+                            profile: str = PROFILE_FULL) -> Optional[Tuple[dict, bytes]]:
+    """Загружает данные игрока, объединяя одновременные запросы одного Steam ID.
+    
+    Возвращает общие для всех ожидающих объекты - их нельзя изменять.
+    on_section получает секции ответа по мере загрузки, только если этот
+    вызов запустил загрузку (присоединившийся к ней вызов получит лишь итог).
+    """
+    return await player_lookups.do(
+        player_cache_key(steam_id, profile), lambda: load_player(steam_id, on_section, profile)
+    )
+
+def player_json_response(payload: bytes, source: str, start_time: float) -> Response:
+    """Формирует ответ из готового JSON, добавляя поля конкретного запроса"""
+    body = merge_envelope(payload, source=source, processing_time=time.time() - start_time)
+    return Response(content=body, media_type="application/json")
+
+# Фоновые обновления устаревших записей кэша (держим ссылки, чтобы задачи не собрал GC)
+refreshing_players = {}
+
+async def refresh_player(steam_id: str, profile: str = PROFILE_FULL):
+    """Обновляет устаревшую запись кэша в фоне"""
+    try:
+        if await fetch_player_data(steam_id, profile=profile):
+            logger.info(f"Background refresh completed for Steam ID: {steam_id}")
+    except Exception as e:
+        logger.warning(f"Background refresh failed for Steam ID {steam_id}: {e}")
+    finally:
+        refreshing_players.pop(player_cache_key(steam_id, profile), None)
+
+def schedule_player_refresh(steam_id: str, profile: str = PROFILE_FULL):
+    """Запускает фоновое обновление, если оно еще не запущено"""
+    key = player_cache_key(steam_id, profile)
+    if key not in refreshing_players:
+        refreshing_players[key] = asyncio.create_task(refresh_player(steam_id, profile))
 
 # Модели данных
 class SteamUrlRequest(BaseModel):
     steam_url: str
+    # full или lite; если не указан, используется профиль по умолчанию эндпоинта
+    profile: Optional[str] = None
+
+class BatchLookupRequest(BaseModel):
+    steam_urls: List[str]
+    profile: Optional[str] = None
 
-def get_steam_id_from_url(steam_url: str) -> str:
-    """Извлекает Steam ID из URL профиля Steam"""
+# Профиль ответа расширения по умолчанию: ему не нужны история матчей и баннер
+EXTENSION_PROFILE = os.getenv("EXTENSION_PROFILE", PROFILE_LITE)
+
+def resolve_profile(requested: Optional[str], default: str) -> str:
+    """Проверяет запрошенный профиль ответа (full или lite)"""
+    profile = (requested or default).strip().lower()
+    if profile not in PLAYER_PROFILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown profile '{requested}'. Expected one of: {', '.join(PLAYER_PROFILES)}"
+        )
+    return profile
+
+async def get_steam_id_from_url(steam_url: str) -> str:
+    """Извлекает Steam ID из URL профиля Steam или идентификатора"""
     logger.info(f"Processing Steam URL: {steam_url}")
-    
-    # Паттерны для различных форматов Steam URL
-    patterns = [
-        r'steamcommunity\.com/profiles/(\d+)',  # Профиль по Steam ID
-        r'steamcommunity\.com/id/([^/]+)',      # Профиль по кастомному ID
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, steam_url)
-        if match:
-            if pattern.endswith(r'(\d+)'):
-                steam_id = match.group(1)
-                logger.info(f"Found Steam ID directly: {steam_id}")
-                return steam_id
-            else:
-                # Для кастомного ID нужно сделать дополнительный запрос к Steam API
-                custom_id = match.group(1)
-                logger.info(f"Found custom ID: {custom_id}, querying Steam API")
-                
-                steam_api_key = os.getenv("STEAM_API_KEY")
-                if not steam_api_key:
-                    logger.error("STEAM_API_KEY not found in environment variables")
-                    raise HTTPException(
-                        status_code=500,
-                        detail="STEAM_API_KEY not configured"
-                    )
-                
-                api_url = f'https://api.steampowered.com/ISteamUser/ResolveVanityURL/v0001/?key={steam_api_key}&vanityurl={custom_id}'
-                logger.info(f"Querying Steam API: {api_url}")
-                
-                try:
-                    response = requests.get(api_url)
-                    response.raise_for_status()
-                    data = response.json()
-                    
-                    if data.get('response', {}).get('success') == 1:
-                        steam_id = data['response']['steamid']
-                        logger.info(f"Successfully resolved custom ID to Steam ID: {steam_id}")
-                        return steam_id
-                    else:
-                        logger.error(f"Failed to resolve custom ID: {data.get('response', {}).get('message', 'Unknown error')}")
-                        raise HTTPException(
-                            status_code=404,
-                            detail=f"Could not resolve Steam ID for custom URL: {custom_id}"
-                        )
-                except requests.RequestException as e:
-                    logger.error(f"Error querying Steam API: {str(e)}")
-                    raise HTTPException(
-                        status_code=500,
-                        detail=f"Error querying Steam API: {str(e)}"
-                    )
-    
+
+    parsed = parse_steam_input(steam_url)
+    if parsed.steam_id:
+        logger.info(f"Found Steam ID directly: {parsed.steam_id}")
+        return parsed.steam_id
+
+    if parsed.vanity:
+        # Для кастомного ID нужно сделать дополнительный запрос к Steam API
+        custom_id = parsed.vanity
+        logger.info(f"Found custom ID: {custom_id}, resolving via Steam API")
+
+        try:
+            steam_id = await get_steam_client().resolve_vanity_url(custom_id)
+        except SteamApiError as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error querying Steam API: {str(e)}"
+            )
+
+        if not steam_id:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Could not resolve Steam ID for custom URL: {custom_id}"
+            )
+        return steam_id
+
     logger.error(f"Could not extract Steam ID from URL: {steam_url}")
     raise HTTPException(
         status_code=400,
@@ -206,6 +391,20 @@ async def privacy(request: Request):
 async def terms(request: Request):
     return templates.TemplateResponse("terms.html", {"request": request})
 
+@app.get("/health")
+async def health():
+    """Состояние circuit breaker эндпоинтов FACEIT (degraded, если какой-то из них не замкнут)"""
+    breakers = get_faceit_client().breakers
+    return {
+        "status": "ok" if breakers.healthy else "degraded",
+        "faceit": breakers.stats()
+    }
+
+@app.get("/metrics")
+async def metrics():
+    """Метрики в текстовом формате Prometheus"""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+
 @app.get("/{steam_id}")
 async def player_page(steam_id: str, request: Request):
     """Страница конкретного игрока по Steam ID"""
@@ -244,6 +443,60 @@ async def get_recent_searches():
         logger.error(f"Failed to get recent searches from database: {e}")
         return {"searches": []}
 
+@app.get("/api/status")
+async def get_status():
+    """Состояние очереди запросов к FACEIT и кэшей"""
+    client = get_faceit_client()
+    return {
+        "scheduler": client.scheduler.stats(),
+        "player_lookups": player_lookups.stats(),
+        "player_cache": player_cache.stats(),
+        "match_cache": client.match_cache.stats() if client.match_cache is not None else None,
+        "circuit_breakers": client.breakers.stats()
+    }
+
+# Максимальный размер страницы истории: каждый матч - это запросы деталей и статистики к FACEIT
+MATCHES_PAGE_MAX_LIMIT = int(os.getenv("MATCHES_PAGE_MAX_LIMIT", "20"))
+# Идентификатор игрока FACEIT (UUID) - подставляется в путь запроса к API
+FACEIT_PLAYER_ID_PATTERN = r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+
+@app.get("/api/players/{player_id}/matches")
+async def get_player_matches_page(player_id: str = Path(..., pattern=FACEIT_PLAYER_ID_PATTERN),
+                                  cursor: Optional[str] = None,
+                                  limit: Optional[int] = Query(None, ge=1, le=MATCHES_PAGE_MAX_LIMIT)):
+    """Постраничная история матчей игрока FACEIT.
+
+    cursor - значение next_cursor из предыдущего ответа (без него - первая
+    страница), limit - размер страницы (по умолчанию как в истории профиля,
+    не больше MATCHES_PAGE_MAX_LIMIT).
+    """
+    try:
+        offset = int(cursor) if cursor else 0
+        if offset < 0:
+            raise ValueError(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    try:
+        matches, next_offset, partial = await get_faceit_client().get_match_history_page(player_id, offset, limit)
+    except RateLimitedError as e:
+        logger.error(f"FACEIT rate limit in match history: {e}")
+        headers = {"Retry-After": str(int(e.retry_after))} if e.retry_after else None
+        raise HTTPException(
+            status_code=503,
+            detail="FACEIT API is rate limiting requests. Please try again later.",
+            headers=headers
+        )
+    except CircuitOpenError as e:
+        logger.error(f"FACEIT circuit open in match history: {e}")
+        raise circuit_open_exception(e)
+    return {
+        "player_id": player_id,
+        "matches": matches,
+        "next_cursor": str(next_offset) if next_offset is not None else None,
+        "partial": partial
+    }
+
 def get_time_ago(timestamp: datetime) -> dict:
     """Возвращает структурированное время для переводов"""
     now = datetime.now()
@@ -263,6 +516,26 @@ def get_time_ago(timestamp: datetime) -> dict:
         days = diff.days
         return {"key": "days_ago", "value": days}
 
+async def add_player_search(steam_id: str, result: dict):
+    """Добавляет успешный поиск игрока в историю"""
+    nickname = result.get('nickname', f"Player_{steam_id[-4:]}")
+    avatar = result.get('avatar')
+        
+    # Получаем уровень из разных источников
+    level = None
+    if result.get('faceit') and result['faceit'].get('level') is not None:
+        level = result['faceit']['level']
+    elif result.get('games') and result['games'].get('cs2') and result['games']['cs2'].get('skill_level') is not None:
+        level = result['games']['cs2']['skill_level']
+        
+    # Получаем страну
+    country = result.get('country')
+        
+    # Проверяем наличие банов
+    has_bans = bool(result.get('bans') and len(result.get('bans', [])) > 0)
+        
+    await add_recent_search(steam_id, nickname, avatar, level, country, has_bans, True)
+
 @app.post("/find-faceit-by-steam")
 async def find_faceit_by_steam(request: SteamUrlRequest):
     """Поиск игрока FACEIT по Steam URL"""
@@ -278,69 +551,59 @@ async def find_faceit_by_steam(request: SteamUrlRequest):
             )
         
         # Извлекаем Steam ID из URL
-        steam_id = get_steam_id_from_url(request.steam_url)
+        steam_id = await get_steam_id_from_url(request.steam_url)
         logger.info(f"Search for Steam ID: {steam_id}")
+        profile = resolve_profile(request.profile, PROFILE_FULL)
         
-        # Проверяем кэш
-        cached_result = get_cached_player(steam_id)
-        if cached_result:
-            cached_result["processing_time"] = time.time() - start_time
-            cached_result["source"] = "cache"
+        # Проверяем кэш; устаревшие данные отдаем сразу и обновляем в фоне
+        cached = await get_cached_player(steam_id, profile)
+        if cached:
+            cached_payload, is_stale = cached
+            if is_stale:
+                schedule_player_refresh(steam_id, profile)
             logger.info(f"Returning cached result for Steam ID: {steam_id}")
-            return cached_result
+            return player_json_response(cached_payload, "stale" if is_stale else "cache", start_time)
         
-        # Используем быстрый клиент
-        api_key = os.getenv("FACEIT_API_KEY")
-        if not api_key:
-            logger.error("FACEIT_API_KEY not found during request")
-            raise HTTPException(status_code=500, detail="FACEIT API key not configured")
-        
-        async with FastFaceitClientHttpx(api_key) as client:
-            result = await client.get_complete_player_data(steam_id)
-            
-            if not result:
-                logger.warning(f"Player not found on FACEIT for Steam ID: {steam_id}")
-                # Добавляем неуспешный поиск в историю
-                await add_recent_search(steam_id, f"Player_{steam_id[-4:]}", None, None, None, False, False)
-                raise HTTPException(
-                    status_code=404,
-                    detail="Player not found on FACEIT"
-                )
+        # Одновременные запросы одного Steam ID выполняются одним проходом
+        loaded = await fetch_player_data(steam_id, profile=profile)
             
-            # Добавляем информацию об источнике
-            result["source"] = "api"
-            result["processing_time"] = time.time() - start_time
+        if not loaded:
+            logger.warning(f"Player not found on FACEIT for Steam ID: {steam_id}")
+            # Добавляем неуспешный поиск в историю
+            await add_recent_search(steam_id, f"Player_{steam_id[-4:]}", None, None, None, False, False)
+            raise HTTPException(
+                status_code=404,
+                detail="Player not found on FACEIT"
+            )
             
-            # Кэшируем результат
-            cache_player(steam_id, result)
+        # Результат общий для одновременных запросов - только читаем его
+        result, payload = loaded
 
-            # Удалено логирование снимков ELO по запросу пользователя
-            
-            # Добавляем в историю поисков
-            nickname = result.get('nickname', f"Player_{steam_id[-4:]}")
-            avatar = result.get('avatar')
-            
-            # Получаем уровень из разных источников
-            level = None
-            if result.get('faceit') and result['faceit'].get('level') is not None:
-                level = result['faceit']['level']
-            elif result.get('games') and result['games'].get('cs2') and result['games']['cs2'].get('skill_level') is not None:
-                level = result['games']['cs2']['skill_level']
-            
-            # Получаем страну
-            country = result.get('country')
+        # Удалено логирование снимков ELO по запросу пользователя
             
-            # Проверяем наличие банов
-            has_bans = bool(result.get('bans') and len(result.get('bans', [])) > 0)
+        # Добавляем в историю поисков
+        await add_player_search(steam_id, result)
             
-            await add_recent_search(steam_id, nickname, avatar, level, country, has_bans, True)
-            
-            logger.info(f"Search completed in {result['processing_time']:.2f} seconds for Steam ID: {steam_id}")
-            return result
+        logger.info(f"Search completed in {time.time() - start_time:.2f} seconds for Steam ID: {steam_id}")
+        return player_json_response(payload, "api", start_time)
             
     except HTTPException as e:
         logger.error(f"HTTP error in search: {e.status_code} - {e.detail}")
         raise e
+    except RateLimitedError as e:
+        logger.error(f"FACEIT rate limit in search: {e}")
+        headers = {"Retry-After": str(int(e.retry_after))} if e.retry_after else None
+        raise HTTPException(
+            status_code=503,
+            detail="FACEIT API is rate limiting requests. Please try again later.",
+            headers=headers
+        )
+    except CircuitOpenError as e:
+        logger.error(f"FACEIT circuit open in search: {e}")
+        raise circuit_open_exception(e)
+    except LookupTimeoutError as e:
+        logger.error(f"Lookup budget exceeded in search: {e}")
+        raise HTTPException(status_code=504, detail=LOOKUP_TIMEOUT_DETAIL)
     except ValueError as e:
         logger.error(f"Validation error in search: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -366,48 +629,53 @@ async def find_faceit_by_steam_extension(request: SteamUrlRequest):
             )
         
         # Извлекаем Steam ID из URL
-        steam_id = get_steam_id_from_url(request.steam_url)
+        steam_id = await get_steam_id_from_url(request.steam_url)
         logger.info(f"Extension search for Steam ID: {steam_id}")
+        profile = resolve_profile(request.profile, EXTENSION_PROFILE)
         
-        # Проверяем кэш
-        cached_result = get_cached_player(steam_id)
-        if cached_result:
-            cached_result["processing_time"] = time.time() - start_time
-            cached_result["source"] = "cache"
+        # Проверяем кэш; устаревшие данные отдаем сразу и обновляем в фоне
+        cached = await get_cached_player(steam_id, profile)
+        if cached:
+            cached_payload, is_stale = cached
+            if is_stale:
+                schedule_player_refresh(steam_id, profile)
             logger.info(f"Returning cached result for Steam ID: {steam_id}")
-            return cached_result
+            return player_json_response(cached_payload, "stale" if is_stale else "cache", start_time)
         
-        # Используем быстрый клиент
-        api_key = os.getenv("FACEIT_API_KEY")
-        if not api_key:
-            logger.error("FACEIT_API_KEY not found during request")
-            raise HTTPException(status_code=500, detail="FACEIT API key not configured")
-        
-        async with FastFaceitClientHttpx(api_key) as client:
-            result = await client.get_complete_player_data(steam_id)
-            
-            if not result:
-                logger.warning(f"Player not found on FACEIT for Steam ID: {steam_id}")
-                raise HTTPException(
-                    status_code=404,
-                    detail="Player not found on FACEIT"
-                )
+        # Одновременные запросы одного Steam ID выполняются одним проходом
+        loaded = await fetch_player_data(steam_id, profile=profile)
             
-            # Добавляем информацию об источнике
-            result["source"] = "extension"
-            result["processing_time"] = time.time() - start_time
+        if not loaded:
+            logger.warning(f"Player not found on FACEIT for Steam ID: {steam_id}")
+            raise HTTPException(
+                status_code=404,
+                detail="Player not found on FACEIT"
+            )
             
-            # Кэшируем результат
-            cache_player(steam_id, result)
+        _, payload = loaded
             
-            # НЕ добавляем в историю поисков для расширения
+        # НЕ добавляем в историю поисков для расширения
             
-            logger.info(f"Extension search completed in {result['processing_time']:.2f} seconds for Steam ID: {steam_id}")
-            return result
+        logger.info(f"Extension search completed in {time.time() - start_time:.2f} seconds for Steam ID: {steam_id}")
+        return player_json_response(payload, "extension", start_time)
             
     except HTTPException as e:
         logger.error(f"HTTP error in extension search: {e.status_code} - {e.detail}")
         raise e
+    except RateLimitedError as e:
+        logger.error(f"FACEIT rate limit in extension search: {e}")
+        headers = {"Retry-After": str(int(e.retry_after))} if e.retry_after else None
+        raise HTTPException(
+            status_code=503,
+            detail="FACEIT API is rate limiting requests. Please try again later.",
+            headers=headers
+        )
+    except CircuitOpenError as e:
+        logger.error(f"FACEIT circuit open in extension search: {e}")
+        raise circuit_open_exception(e)
+    except LookupTimeoutError as e:
+        logger.error(f"Lookup budget exceeded in extension search: {e}")
+        raise HTTPException(status_code=504, detail=LOOKUP_TIMEOUT_DETAIL)
     except ValueError as e:
         logger.error(f"Validation error in extension search: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -418,6 +686,187 @@ async def find_faceit_by_steam_extension(request: SteamUrlRequest):
             detail="Internal server error. Please try again later."
         )
 
+def section_line(section: str, data: bytes) -> bytes:
+    """Строка NDJSON потокового ответа с уже сериализованными данными секции"""
+    return b'{"section":"' + section.encode() + b'","data":' + data + b"}\n"
+
+@app.post("/find-faceit-by-steam/stream")
+async def find_faceit_by_steam_stream(request: SteamUrlRequest):
+    """Поиск игрока FACEIT с прогрессивной выдачей результата в формате NDJSON.
+
+    Каждая строка - объект {"section": ..., "data": ...}. Сначала приходит
+    profile (один запрос к FACEIT), затем stats, bans и match_history по мере
+    готовности и в конце complete с полным ответом, как у /find-faceit-by-steam.
+    Ошибка после начала потока передается строкой с секцией error.
+    """
+    start_time = time.time()
+    if not request.steam_url or not request.steam_url.strip():
+        logger.warning("Empty Steam URL provided")
+        raise HTTPException(status_code=400, detail="Steam URL cannot be empty")
+
+    steam_id = await get_steam_id_from_url(request.steam_url)
+    logger.info(f"Streaming search for Steam ID: {steam_id}")
+    profile = resolve_profile(request.profile, PROFILE_FULL)
+
+    async def stream_sections():
+        cached = await get_cached_player(steam_id, profile)
+        if cached:
+            cached_payload, is_stale = cached
+            if is_stale:
+                schedule_player_refresh(steam_id, profile)
+            source = "stale" if is_stale else "cache"
+            yield section_line("complete", merge_envelope(
+                cached_payload, source=source, processing_time=time.time() - start_time
+            ))
+            return
+
+        sections: asyncio.Queue = asyncio.Queue()
+        lookup = asyncio.create_task(
+            fetch_player_data(steam_id, profile=profile, on_section=lambda name, data: sections.put_nowait((name, data)))
+        )
+        lookup.add_done_callback(lambda _: sections.put_nowait(None))
+        try:
+            while True:
+                item = await sections.get()
+                if item is None:
+                    break
+                name, data = item
+                yield section_line(name, json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+            loaded = lookup.result()
+            if not loaded:
+                logger.warning(f"Player not found on FACEIT for Steam ID: {steam_id}")
+                await add_recent_search(steam_id, f"Player_{steam_id[-4:]}", None, None, None, False, False)
+                yield section_line("error", b'{"status":404,"detail":"Player not found on FACEIT"}')
+                return
+
+            result, payload = loaded
+            await add_player_search(steam_id, result)
+            logger.info(f"Streaming search completed in {time.time() - start_time:.2f} seconds for Steam ID: {steam_id}")
+            yield section_line("complete", merge_envelope(
+                payload, source="api", processing_time=time.time() - start_time
+            ))
+        except RateLimitedError as e:
+            logger.error(f"FACEIT rate limit in streaming search: {e}")
+            yield section_line("error", b'{"status":503,"detail":"FACEIT API is rate limiting requests. Please try again later."}')
+        except CircuitOpenError as e:
+            logger.error(f"FACEIT circuit open in streaming search: {e}")
+            yield section_line("error", json.dumps({"status": 503, "detail": FACEIT_UNAVAILABLE_DETAIL}).encode("utf-8"))
+        except LookupTimeoutError as e:
+            logger.error(f"Lookup budget exceeded in streaming search: {e}")
+            yield section_line("error", json.dumps({"status": 504, "detail": LOOKUP_TIMEOUT_DETAIL}).encode("utf-8"))
+        except Exception as e:
+            logger.error(f"Unexpected error in streaming search: {str(e)}", exc_info=True)
+            yield section_line("error", b'{"status":500,"detail":"Internal server error. Please try again later."}')
+        finally:
+            lookup.cancel()
+
+    return StreamingResponse(stream_sections(), media_type="application/x-ndjson")
+
+# Максимальное число игроков в одном пакетном запросе
+BATCH_MAX_PLAYERS = int(os.getenv("BATCH_MAX_PLAYERS", "25"))
+
+async def lookup_player_payload(steam_id: str, profile: str = PROFILE_FULL) -> Optional[Tuple[bytes, str]]:
+    """Возвращает готовый JSON игрока и его источник (cache, stale или api)"""
+    cached = await get_cached_player(steam_id, profile)
+    if cached:
+        payload, is_stale = cached
+        if is_stale:
+            schedule_player_refresh(steam_id, profile)
+        return payload, "stale" if is_stale else "cache"
+
+    loaded = await fetch_player_data(steam_id, profile=profile)
+    if not loaded:
+        return None
+    return loaded[1], "api"
+
+async def batch_lookup_line(steam_url: str, profile: str, start_time: float) -> bytes:
+    """Ищет одного игрока пакета и возвращает строку NDJSON с результатом"""
+    fields: Dict[str, Any] = {"input": steam_url}
+    try:
+        steam_id = await get_steam_id_from_url(steam_url)
+        fields["steam_id"] = steam_id
+        found = await lookup_player_payload(steam_id, profile)
+        if not found:
+            raise HTTPException(status_code=404, detail="Player not found on FACEIT")
+        payload, source = found
+        fields["status"] = 200
+        player = merge_envelope(payload, source=source, processing_time=time.time() - start_time)
+        return merge_envelope(b'{"player":' + player + b"}", **fields) + b"\n"
+    except HTTPException as e:
+        fields.update(status=e.status_code, error=e.detail)
+    except RateLimitedError as e:
+        logger.error(f"FACEIT rate limit in batch search: {e}")
+        fields.update(status=503, error="FACEIT API is rate limiting requests. Please try again later.")
+        if e.retry_after:
+            fields["retry_after"] = int(e.retry_after)
+    except CircuitOpenError as e:
+        logger.error(f"FACEIT circuit open in batch search: {e}")
+        fields.update(status=503, error=FACEIT_UNAVAILABLE_DETAIL)
+        if e.retry_after:
+            fields["retry_after"] = max(1, int(e.retry_after))
+    except LookupTimeoutError as e:
+        logger.error(f"Lookup budget exceeded in batch search: {e}")
+        fields.update(status=504, error=LOOKUP_TIMEOUT_DETAIL)
+    except Exception as e:
+        logger.error(f"Unexpected error in batch search for {steam_url}: {str(e)}", exc_info=True)
+        fields.update(status=500, error="Internal server error. Please try again later.")
+    return json.dumps(fields, ensure_ascii=False).encode("utf-8") + b"\n"
+
+@app.post("/api/players/batch")
+async def find_players_batch(request: BatchLookupRequest):
+    """Пакетный поиск игроков FACEIT по списку Steam URL или ID.
+
+    Игроки ищутся одновременно через общий клиент (общие матчи загружаются
+    один раз), результаты отдаются в формате NDJSON по мере готовности:
+    одна строка на каждый уникальный входной URL.
+    """
+    start_time = time.time()
+    steam_urls = list(dict.fromkeys(url.strip() for url in request.steam_urls if url and url.strip()))
+    if not steam_urls:
+        raise HTTPException(status_code=400, detail="Steam URL list cannot be empty")
+    if len(steam_urls) > BATCH_MAX_PLAYERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many players in one request (maximum {BATCH_MAX_PLAYERS})"
+        )
+    profile = resolve_profile(request.profile, PROFILE_FULL)
+    BATCH_SIZE.observe(len(steam_urls))
+    logger.info(f"Batch search for {len(steam_urls)} players ({profile} profile)")
+
+    async def stream_results():
+        tasks = [asyncio.create_task(batch_lookup_line(url, profile, start_time)) for url in steam_urls]
+        try:
+            for next_line in asyncio.as_completed(tasks):
+                yield await next_line
+        finally:
+            # Клиент мог отключиться - незавершенные поиски больше не нужны
+            for task in tasks:
+                task.cancel()
+        logger.info(f"Batch search completed in {time.time() - start_time:.2f} seconds")
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+# Метрики длительности запросов к API
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Длительность запросов по шаблону маршрута (для потоковых ответов - до заголовков)"""
+    started = time.monotonic()
+    status = 500
+    with HTTP_REQUESTS_IN_FLIGHT.track_in_progress():
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = request.scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.monotonic() - started,
+                method=request.method,
+                route=getattr(route, "path", "unmatched"),
+                status=status
+            )
+
 # Добавляем middleware для отключения кэширования
 @app.middleware("http")
 async def add_no_cache_headers(request: Request, call_next):
@@ -431,13 +880,42 @@ async def startup_event():
     """Инициализация при запуске приложения"""
     await init_database()
     await init_test_data_db()
+    get_faceit_client()
+    global cache_sweeper_task
+    cache_sweeper_task = asyncio.create_task(sweep_player_cache_periodically())
     logger.info("Application startup completed")
 
+async def shutdown_event():
+    """Освобождение ресурсов при остановке приложения"""
+    global http_client, faceit_client, steam_client, cache_sweeper_task
+    if cache_sweeper_task is not None:
+        cache_sweeper_task.cancel()
+        cache_sweeper_task = None
+    if faceit_client is not None:
+        await faceit_client.flush_store_writes()
+    if http_client is not None:
+        await http_client.aclose()
+    await player_cache.backend.close()
+    if faceit_client is not None and faceit_client.match_cache is not None and faceit_client.match_cache.backend:
+        await faceit_client.match_cache.backend.close()
+    if faceit_client is not None:
+        await faceit_client.banners.close()
+    if steam_client is not None:
+        await steam_client.cache.close()
+    http_client = None
+    faceit_client = None
+    steam_client = None
+    logger.info("Application shutdown completed")
+
 # Добавляем обработчик события запуска
 @app.on_event("startup")
 async def startup():
     await startup_event()
 
+@app.on_event("shutdown")
+async def shutdown():
+    await shutdown_event()
+
 if __name__ == "__main__":
     # Определяем окружение
     environment = os.getenv("ENVIRONMENT", "development")
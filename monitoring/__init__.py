@@ -0,0 +1,25 @@
+"""
+Метрики производительности приложения для выгрузки в Prometheus.
+"""
+
+from .metrics import (
+    CONTENT_TYPE,
+    DEFAULT_LATENCY_BUCKETS,
+    REGISTRY,
+    Registry,
+    Counter,
+    Gauge,
+    Histogram,
+    CallbackMetric
+)
+
+__all__ = [
+    "CONTENT_TYPE",
+    "DEFAULT_LATENCY_BUCKETS",
+    "REGISTRY",
+    "Registry",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "CallbackMetric"
+]
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Микробенчмарк разбора статистики матчей: прежние извлечения с отдельным
+обходом rounds -> teams -> players для каждого поля против MatchIndex.
+
+Сценарии:
+  cold  - один игрок, 30 новых матчей (индекс строится для каждого матча)
+  lobby - 10 игроков одного лобби с теми же 30 матчами (пакетный поиск,
+          повторные поиски): индекс матча строится один раз на всех
+
+Запуск: python -m tests.benchmark_match_index
+"""
+
+import timeit
+from typing import Dict, Optional
+
+from api_clients.fast_api_client_httpx import FastFaceitClientHttpx
+
+MATCHES_PER_LOOKUP = 30
+PLAYERS_PER_LOBBY = 10
+REPEATS = 100
+
+
+class LegacyExtractors:
+    """Прежняя реализация извлечений (до MatchIndex) - точка отсчета"""
+
+    def _get_match_score(self, stats_data: Dict) -> str:
+        if stats_data and "rounds" in stats_data:
+            first_round = stats_data["rounds"][0] if stats_data["rounds"] else {}
+            return first_round.get("round_stats", {}).get("Score", "0-0")
+        return "0-0"
+
+    def _determine_match_result(self, match_details: Dict, stats_data: Optional[Dict], player_id: str) -> str:
+        """Определяет результат матча для игрока"""
+        try:
+            if not match_details:
+                return "Unknown"
+
+            # Попробуем использовать явного победителя матча
+            results_block = match_details.get("results", {}) if isinstance(match_details.get("results"), dict) else {}
+            winner_team_id = results_block.get("winner") or results_block.get("winner_id") or results_block.get("winner_faction")
+
+            # Найдем к какой команде относится игрок
+            player_team_id = None
+            player_faction_key = None
+            teams_block = match_details.get("teams")
+            iterable_teams = teams_block.values() if isinstance(teams_block, dict) else (teams_block or [])
+            for team in iterable_teams:
+                # team может быть dict со структурой {team_id, players: [{player_id: ...}]}
+                team_id = team.get("team_id") or team.get("faction_id") or team.get("id")
+                team_players = (team.get("players") or []) + (team.get("roster") or [])
+                for p in team_players:
+                    if str(p.get("player_id")) == str(player_id):
+                        player_team_id = team_id
+                        # Если teams представлен как dict, попробуем запомнить ключ фракции
+                        if isinstance(teams_block, dict):
+                            for key, t in teams_block.items():
+                                if t is team:
+                                    player_faction_key = key  # faction1/faction2
+                                    break
+                        break
+                if player_team_id:
+                    break
+
+            # Сопоставляем победителя
+            if winner_team_id:
+                # Если победитель указан как faction1/faction2, сравним по ключу фракции
+                if str(winner_team_id) in ("faction1", "faction2", "team1", "team2"):
+                    if player_faction_key and str(player_faction_key) == str(winner_team_id):
+                        return "Win"
+                    elif player_faction_key:
+                        return "Lose"
+                # Иначе сравним по team_id
+                if player_team_id and str(winner_team_id) == str(player_team_id):
+                    return "Win"
+                if player_team_id:
+                    return "Lose"
+
+            # Фоллбек: сравниваем раунды по score и принадлежность игрока к команде A/B
+            try:
+                # Получаем строку счета, стараясь учесть разные форматы
+                results = match_details.get("results", {}) if isinstance(match_details.get("results"), dict) else {}
+                score_str = results.get("score") or results.get("score_str")
+                if not score_str and stats_data:
+                    score_str = self._get_match_score(stats_data)
+
+                # Нормализуем разделитель
+                if isinstance(score_str, str):
+                    score_norm = (
+                        score_str.replace(" ", "")
+                        .replace("-", "/")
+                        .replace(":", "/")
+                    )
+                else:
+                    score_norm = None
+
+                # Часто score приходит как "16/14" или "13/11"
+                if isinstance(score_norm, str) and "/" in score_norm:
+                    left, right = score_norm.split("/", 1)
+                    left_val = int(str(left).strip())
+                    right_val = int(str(right).strip())
+
+                    player_faction = None
+                    team_index = None
+
+                    # 1) Через factions/teams в match_details (dict)
+                    factions = match_details.get("factions") or (match_details.get("teams") if isinstance(match_details.get("teams"), dict) else None)
+                    if isinstance(factions, dict) and player_faction is None and team_index is None:
+                        for key, team in factions.items():
+                            team_players = (team.get("players") or []) + (team.get("roster") or [])
+                            for p in team_players:
+                                if str(p.get("player_id")) == str(player_id):
+                                    player_faction = key
+                                    if key in ("faction1", "team1", "1", 1, "left"):
+                                        team_index = 0
+                                    elif key in ("faction2", "team2", "2", 2, "right"):
+                                        team_index = 1
+                                    break
+                            if player_faction is not None:
+                                break
+
+                    # 2) Через teams в match_details (list)
+                    if team_index is None and isinstance(match_details.get("teams"), list):
+                        for idx, t in enumerate(match_details.get("teams") or []):
+                            team_players = (t.get("players") or []) + (t.get("roster") or [])
+                            for p in team_players:
+                                if str(p.get("player_id")) == str(player_id):
+                                    team_index = idx
+                                    break
+                            if team_index is not None:
+                                break
+
+                    # 3) Через все rounds[*].teams в stats_data (list или dict)
+                    if team_index is None and stats_data and isinstance(stats_data.get("rounds"), list):
+                        for r in stats_data.get("rounds") or []:
+                            rnd_teams = r.get("teams")
+                            if isinstance(rnd_teams, list):
+                                for idx, t in enumerate(rnd_teams):
+                                    for p in t.get("players", []):
+                                        if str(p.get("player_id")) == str(player_id):
+                                            team_index = idx
+                                            break
+                                    if team_index is not None:
+                                        break
+                            elif isinstance(rnd_teams, dict):
+                                for key, t in rnd_teams.items():
+                                    for p in t.get("players", []):
+                                        if str(p.get("player_id")) == str(player_id):
+                                            player_faction = key
+                                            if key in ("faction1", "team1", "1", 1, "left"):
+                                                team_index = 0
+                                            elif key in ("faction2", "team2", "2", 2, "right"):
+                                                team_index = 1
+                                            break
+                                    if team_index is not None:
+                                        break
+                            if team_index is not None:
+                                break
+
+                    # Если игрок в левой команде — оцениваем левый счет, иначе правый
+                    if player_faction in ("faction1", "team1", "1", 1, "left") or team_index == 0:
+                        if left_val > right_val:
+                            return "Win"
+                        elif left_val < right_val:
+                            return "Lose"
+                        else:
+                            return "Draw"
+                    elif player_faction in ("faction2", "team2", "2", 2, "right") or team_index == 1:
+                        if right_val > left_val:
+                            return "Win"
+                        elif right_val < left_val:
+                            return "Lose"
+                        else:
+                            return "Draw"
+                    # Если не удалось определить фракцию игрока — просто сравним стороны как Unknown
+                    if left_val == right_val:
+                        return "Draw"
+                    # Без знания стороны определить нельзя корректно
+                    return "Unknown"
+            except Exception:
+                pass
+
+            return "Unknown"
+        except Exception:
+            return "Unknown"
+    
+    def _get_player_kills(self, stats_data: Dict, player_id: str) -> int:
+        """Получает количество убийств игрока"""
+        if stats_data and "rounds" in stats_data:
+            for round_data in stats_data["rounds"]:
+                for team in round_data.get("teams", []):
+                    for player in team.get("players", []):
+                        if str(player.get("player_id")) == str(player_id):
+                            return int(player.get("player_stats", {}).get("Kills", 0))
+        return 0
+    
+    def _get_player_deaths(self, stats_data: Dict, player_id: str) -> int:
+        """Получает количество смертей игрока"""
+        if stats_data and "rounds" in stats_data:
+            for round_data in stats_data["rounds"]:
+                for team in round_data.get("teams", []):
+                    for player in team.get("players", []):
+                        if str(player.get("player_id")) == str(player_id):
+                            return int(player.get("player_stats", {}).get("Deaths", 0))
+        return 0
+    
+    def _get_player_assists(self, stats_data: Dict, player_id: str) -> int:
+        """Получает количество ассистов игрока"""
+        if stats_data and "rounds" in stats_data:
+            for round_data in stats_data["rounds"]:
+                for team in round_data.get("teams", []):
+                    for player in team.get("players", []):
+                        if str(player.get("player_id")) == str(player_id):
+                            return int(player.get("player_stats", {}).get("Assists", 0))
+        return 0
+    
+
+
+def _make_match(n: int):
+    """Матч 5v5 в формате FACEIT: детали с составами и статистика с раундами"""
+    teams = {}
+    rounds_teams = []
+    for side, faction in enumerate(("faction1", "faction2")):
+        players = [{"player_id": f"player-{side}-{i}", "nickname": f"nick{i}"} for i in range(5)]
+        teams[faction] = {"faction_id": f"{faction}-{n}", "players": players}
+        rounds_teams.append({
+            "team_id": f"{faction}-{n}",
+            "players": [{"player_id": p["player_id"],
+                         "player_stats": {"Kills": "17", "Deaths": "15", "Assists": "4", "Headshots %": "48"}}
+                        for p in players],
+        })
+    details = {"started_at": 1700000000 + n, "results": {"score": "13/9"}, "teams": teams}
+    stats = {"rounds": [{"game_mode": "5v5", "round_stats": {"Map": "de_ancient", "Score": "13 / 9"},
+                         "teams": rounds_teams}]}
+    return f"match-{n}", details, stats
+
+
+PLAYERS = [f"player-{side}-{i}" for side in range(2) for i in range(5)]
+
+
+def legacy_lookup(matches, players, legacy=LegacyExtractors()):
+    for player_id in players:
+        for _, details, stats in matches:
+            legacy._determine_match_result(details, stats, player_id)
+            legacy._get_player_kills(stats, player_id)
+            legacy._get_player_deaths(stats, player_id)
+            legacy._get_player_assists(stats, player_id)
+
+
+def indexed_lookup(matches, players):
+    # Новый клиент на каждый прогон: кэш индексов пуст, как при первом поиске
+    client = FastFaceitClientHttpx(api_key="bench")
+    for player_id in players:
+        for match_id, details, stats in matches:
+            # То же, что делает _process_match_items для каждого матча
+            index = client._match_index(match_id, details, stats)
+            client._determine_match_result(details, player_id, stats, index)
+            player_stats = index.player_stats(player_id)
+            for field in ("Kills", "Deaths", "Assists"):
+                client._safe_int(player_stats.get(field, 0))
+
+
+def _measure(func, *args) -> float:
+    return min(timeit.repeat(lambda: func(*args), number=REPEATS, repeat=5)) / REPEATS
+
+
+def main():
+    matches = [_make_match(n) for n in range(MATCHES_PER_LOOKUP)]
+    scenarios = (
+        ("cold", PLAYERS[-1:]),  # последний игрок второй команды - худший случай для обхода
+        ("lobby", PLAYERS[:PLAYERS_PER_LOBBY]),
+    )
+    print(f"{MATCHES_PER_LOOKUP} matches per player")
+    for name, players in scenarios:
+        legacy = _measure(legacy_lookup, matches, players)
+        indexed = _measure(indexed_lookup, matches, players)
+        print(f"  {name:<6} ({len(players):>2} players): per-field traversals {legacy * 1e6:8.1f} us, "
+              f"MatchIndex {indexed * 1e6:8.1f} us ({legacy / indexed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
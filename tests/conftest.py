@@ -1,8 +1,115 @@
+import asyncio
 from uuid import uuid4
 
 import pytest
 
+from api_clients.fast_api_client_httpx import FastFaceitClientHttpx
+
+
+class FakeHistoryClient(FastFaceitClientHttpx):
+    """Клиент FACEIT с историей матчей из списка match_id и списком вызовов.
+
+    Дата матча - число из его match_id (m12 -> 12), игрок p1 всегда в faction1.
+    stats_delays - задержка статистики отдельных матчей в секундах; матчи,
+    загрузка которых отменена, попадают в cancelled. Остальные аргументы
+    передаются в FastFaceitClientHttpx.
+    """
+
+    def __init__(self, history, stats_delays=None, **kwargs):
+        super().__init__(api_key="test", **kwargs)
+        self.history = history
+        self.stats_delays = stats_delays or {}
+        self.calls = []
+        self.cancelled = []
+
+    async def get_player_matches(self, player_id, limit=30, offset=0):
+        self.calls.append(("history", offset, limit))
+        return [{"match_id": match_id} for match_id in self.history[offset:offset + limit]]
+
+    async def get_match_details(self, match_id):
+        self.calls.append(("details", match_id))
+        return {"started_at": int(match_id[1:]), "results": {"winner": "faction1"},
+                "teams": {"faction1": {"players": [{"player_id": "p1"}]}}}
+
+    async def get_match_stats(self, match_id):
+        self.calls.append(("stats", match_id))
+        try:
+            await asyncio.sleep(self.stats_delays.get(match_id, 0))
+        except asyncio.CancelledError:
+            self.cancelled.append(match_id)
+            raise
+        return {"rounds": [{"round_stats": {"Map": "de_mirage", "Score": "13 / 7"},
+                            "teams": [{"players": [{"player_id": "p1", "player_stats": {"Kills": "20"}}]}]}]}
+
+
+class CountingClient(FastFaceitClientHttpx):
+    """Клиент FACEIT для полного поиска игрока с подмененными сетевыми методами и списком вызовов.
+
+    lifetime - статистика игрока за все время, delays - задержка этапов
+    player, bans и banner в секундах.
+    """
+
+    def __init__(self, lifetime=None, delays=None):
+        super().__init__(api_key="test")
+        self.calls = []
+        self.lifetime = lifetime or {"Matches": "100", "Average K/D Ratio": "1.2", "Average Kills": "18"}
+        self.delays = delays or {}
+
+    async def _delay(self, stage):
+        await asyncio.sleep(self.delays.get(stage, 0))
+
+    async def get_player_by_steam_id(self, steam_id):
+        await self._delay("player")
+        self.calls.append("player")
+        return {"player_id": "p1", "nickname": "p", "cover_image": "https://example.com/banner.png",
+                "games": {"cs2": {"faceit_elo": 2000, "skill_level": 10}}}
+
+    async def get_player_stats(self, player_id):
+        self.calls.append("stats")
+        return {"lifetime": self.lifetime}
+
+    async def get_player_bans(self, player_id):
+        await self._delay("bans")
+        self.calls.append("bans")
+        return []
+
+    async def get_player_matches(self, player_id, limit=30, offset=0):
+        self.calls.append("history")
+        return [{"match_id": "m1"}]
+
+    async def get_player_recent_match_stats(self, player_id, limit=30):
+        self.calls.append("recent_match_stats")
+        return [self._recent_match_row({"Kills": kills, "Deaths": "10", "Assists": "2", "Result": result, "Map": "de_nuke"})
+                for kills, result in (("24", "1"), ("14", "0"), ("20", "1"))]
+
+    async def get_match_details(self, match_id):
+        self.calls.append("details")
+        return {"started_at": 1, "results": {"winner": "faction1"},
+                "teams": {"faction1": {"players": [{"player_id": "p1"}]}}}
+
+    async def get_match_stats(self, match_id):
+        self.calls.append("match_stats")
+        return {"rounds": [{"round_stats": {"Map": "de_mirage", "Score": "13 / 7"},
+                            "teams": [{"players": [{"player_id": "p1", "player_stats": {"Kills": "20"}}]}]}]}
+
+    async def check_image_availability(self, url):
+        await self._delay("banner")
+        self.calls.append("banner")
+        return True
+
 
 @pytest.fixture
 def valid_uuid():
     return str(uuid4())
+
+
+@pytest.fixture
+def history_client():
+    """Фабрика FakeHistoryClient: history_client(["m2", "m1"], match_window=...)"""
+    return FakeHistoryClient
+
+
+@pytest.fixture
+def counting_client():
+    """Фабрика CountingClient: counting_client(lifetime=..., delays={"bans": 5})"""
+    return CountingClient
@@ -0,0 +1,102 @@
+import asyncio
+
+import httpx
+
+from api_clients import fast_api_client_httpx
+from api_clients.banner_checker import BannerChecker
+from api_clients.fast_api_client_httpx import FastFaceitClientHttpx
+from cache.backends import MemoryBackend
+
+
+class _RecordingCheck:
+    """Подмена HEAD-проверки: возвращает заданный статус и считает вызовы"""
+
+    def __init__(self, available=True, delay=0):
+        self.available = available
+        self.delay = delay
+        self.urls = []
+
+    async def __call__(self, url):
+        self.urls.append(url)
+        await asyncio.sleep(self.delay)
+        return self.available
+
+
+URL = "https://example.com/banner.png"
+
+
+def test_unknown_banner_is_checked_in_background_once():
+    async def scenario():
+        check = _RecordingCheck()
+        checker = BannerChecker(check)
+
+        assert await checker.known_status(URL) is None
+        assert await checker.known_status(URL) is None
+        await asyncio.gather(*checker._pending.values())
+
+        assert await checker.known_status(URL) is True
+        assert check.urls == [URL]
+
+    asyncio.run(scenario())
+
+
+def test_unavailable_banner_uses_negative_ttl():
+    async def scenario():
+        backend = MemoryBackend()
+        checker = BannerChecker(_RecordingCheck(available=False), backend, ttl=100, negative_ttl=0.05)
+
+        await checker.known_status(URL)
+        await asyncio.gather(*checker._pending.values())
+        assert await checker.known_status(URL) is False
+
+        await asyncio.sleep(0.1)
+        assert await checker.known_status(URL) is None
+
+    asyncio.run(scenario())
+
+
+def test_close_cancels_pending_checks():
+    async def scenario():
+        checker = BannerChecker(_RecordingCheck(delay=5))
+        await checker.known_status(URL)
+        task = checker._pending[URL]
+
+        await checker.close()
+        await asyncio.sleep(0)
+
+        assert task.cancelled()
+
+    asyncio.run(scenario())
+
+
+def test_configured_empty_cache_backend_is_used():
+    async def scenario():
+        backend = MemoryBackend(max_entries=10)
+        checker = BannerChecker(_RecordingCheck(), backend)
+        assert checker.cache is backend
+
+        await checker.known_status(URL)
+        await asyncio.gather(*checker._pending.values())
+        assert len(backend) == 1
+
+    asyncio.run(scenario())
+
+
+def test_throttled_check_is_not_cached(monkeypatch):
+    monkeypatch.setattr(fast_api_client_httpx, "RETRY_BACKOFF_BASE", 0)
+
+    async def scenario():
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(429, headers={"Retry-After": "0"})))
+        client = FastFaceitClientHttpx("test", http_client=http_client)
+
+        assert await client.banners.known_status(URL) is None
+        await asyncio.gather(*client.banners._pending.values())
+
+        # 429 ничего не говорит о баннере: статус остается неизвестным до следующей проверки
+        assert await client.banners.cache.get(URL) is None
+        assert await client.banners.known_status(URL) is None
+        await client.banners.close()
+        await http_client.aclose()
+
+    asyncio.run(scenario())
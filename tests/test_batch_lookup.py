@@ -0,0 +1,66 @@
+import asyncio
+import json
+import os
+
+import httpx
+
+os.environ.setdefault("FACEIT_API_KEY", "test")
+
+import main  # noqa: E402
+from cache.player_cache import PlayerCache  # noqa: E402
+
+
+def _post_batch(steam_urls):
+    async def request():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await http.post("/api/players/batch", json={"steam_urls": steam_urls})
+
+    return asyncio.run(request())
+
+
+class _FakeClient:
+    def __init__(self):
+        self.calls = []
+
+    async def get_complete_player_data(self, steam_id, on_section=None, profile="full"):
+        self.calls.append(steam_id)
+        if steam_id.endswith("2"):
+            return None
+        return {"nickname": f"player_{steam_id[-1]}", "partial": False}
+
+
+def test_batch_streams_one_line_per_unique_input(monkeypatch):
+    client = _FakeClient()
+    monkeypatch.setattr(main, "get_faceit_client", lambda: client)
+    monkeypatch.setattr(main, "player_cache", PlayerCache())
+
+    response = _post_batch([
+        "76561198000000001",
+        "https://steamcommunity.com/profiles/76561198000000001",
+        "76561198000000001",
+        "76561198000000002",
+        "not a steam url",
+    ])
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    by_input = {line["input"]: line for line in lines}
+    assert len(lines) == 4
+
+    found = by_input["76561198000000001"]
+    assert found["status"] == 200
+    assert found["player"]["nickname"] == "player_1"
+    assert found["player"]["source"] in ("api", "cache")
+    assert by_input["76561198000000002"]["status"] == 404
+    assert by_input["not a steam url"]["status"] == 400
+    # Одинаковые Steam ID из разных ссылок загружаются один раз
+    assert client.calls.count("76561198000000001") == 1
+
+
+def test_batch_rejects_empty_and_oversized_requests(monkeypatch):
+    monkeypatch.setattr(main, "BATCH_MAX_PLAYERS", 2)
+
+    assert _post_batch(["  "]).status_code == 400
+    assert _post_batch([f"7656119800000000{i}" for i in range(3)]).status_code == 400
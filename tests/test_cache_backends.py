@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from cache.backends import RedisBackend
+from cache.match_cache import MatchCache
+from cache.player_cache import PlayerCache
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+def _shared_redis():
+    server = fakeredis.FakeServer()
+    return lambda: fakeredis.aioredis.FakeRedis(server=server)
+
+
+def test_player_cache_is_shared_between_workers():
+    async def scenario():
+        connect = _shared_redis()
+        worker_a = PlayerCache(backend=RedisBackend(prefix="faceit:player:", client=connect()))
+        worker_b = PlayerCache(backend=RedisBackend(prefix="faceit:player:", client=connect()))
+
+        await worker_a.set("76561198000000000", b'{"nickname":"player"}')
+        assert await worker_b.get("76561198000000000") == (b'{"nickname":"player"}', False)
+
+    asyncio.run(scenario())
+
+
+def test_redis_entries_expire_with_hard_ttl():
+    async def scenario():
+        client = _shared_redis()()
+        cache = PlayerCache(soft_ttl=1, hard_ttl=1, backend=RedisBackend(client=client))
+        await cache.set("k", b'{"a":1}')
+        ttl_ms = await client.pttl("faceit:k")
+        assert 0 < ttl_ms <= 1000
+
+    asyncio.run(scenario())
+
+
+def test_match_cache_uses_redis_as_second_tier():
+    async def scenario():
+        connect = _shared_redis()
+        first = MatchCache(backend=RedisBackend(prefix="faceit:match:", client=connect()))
+        await first.set("stats", "1-abc", {"rounds": [{"round_stats": {"Map": "de_nuke"}}]})
+
+        second = MatchCache(backend=RedisBackend(prefix="faceit:match:", client=connect()))
+        data = await second.get("stats", "1-abc")
+        assert data["rounds"][0]["round_stats"]["Map"] == "de_nuke"
+        assert second.stats()["backend_hits"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_unavailable_redis_behaves_like_a_miss():
+    class BrokenClient:
+        async def get(self, key):
+            raise ConnectionError("down")
+
+        async def set(self, *args, **kwargs):
+            raise ConnectionError("down")
+
+    async def scenario():
+        backend = RedisBackend(client=BrokenClient())
+        cache = PlayerCache(backend=backend)
+        await cache.set("k", b"{}")
+        assert await cache.get("k") is None
+        assert backend.stats()["errors"] == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,132 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from api_clients.circuit_breaker import CircuitBreaker, CircuitBreakers, CircuitOpenError
+from api_clients.fast_api_client_httpx import FastFaceitClientHttpx
+
+
+def _breaker(**settings):
+    defaults = dict(window=4, min_calls=4, error_rate=0.5, open_seconds=0.05, half_open_probes=2, slow_call=1.0)
+    defaults.update(settings)
+    return CircuitBreaker("match-stats", **defaults)
+
+
+def test_opens_after_error_rate_and_rejects_calls():
+    breaker = _breaker()
+    for failed in (False, True, False, True):
+        breaker.before_call()
+        breaker.record(failed)
+
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.before_call()
+    assert error.value.family == "match-stats"
+    assert 0 < error.value.retry_after <= 0.05
+
+
+def test_half_open_probes_close_or_reopen():
+    breaker = _breaker()
+    for _ in range(4):
+        breaker.record(True)
+
+    time.sleep(0.06)
+    breaker.before_call()
+    breaker.before_call()
+    assert breaker.state == "half_open"
+    # Больше двух пробных запросов одновременно не отправляется
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record(False)
+    breaker.record(False)
+    assert breaker.state == "closed"
+
+    for _ in range(4):
+        breaker.record(True)
+    time.sleep(0.06)
+    breaker.before_call()
+    breaker.record(True)
+    assert breaker.state == "open"
+    assert breaker.times_opened == 3
+
+
+def test_slow_and_abandoned_calls_count_as_failures():
+    breaker = _breaker(slow_call=0.5)
+    breaker.record(False, duration=1.0)
+    breaker.abandon(duration=1.0)
+    breaker.abandon(duration=0.1)
+
+    assert breaker.stats()["recent_calls"] == 2
+    assert breaker.stats()["error_rate"] == 1.0
+
+
+def test_failing_endpoint_family_is_short_circuited():
+    async def scenario():
+        calls = []
+
+        async def handler(request):
+            calls.append(request.url.path)
+            if request.url.path.endswith("/stats"):
+                return httpx.Response(503)
+            return httpx.Response(200, json={"match_id": "m1"})
+
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        breakers = CircuitBreakers(window=4, min_calls=4, open_seconds=60)
+        client = FastFaceitClientHttpx("test", http_client=http_client, breakers=breakers)
+
+        for i in range(4):
+            assert await client.get_match_stats(f"m{i}") is None
+        with pytest.raises(CircuitOpenError):
+            await client.get_match_stats("m5")
+        assert len(calls) == 4
+
+        # Другие группы эндпоинтов продолжают работать
+        assert await client.get_match_details("m1") == {"match_id": "m1"}
+        assert breakers.stats()["match-stats"]["state"] == "open"
+        assert breakers.stats()["matches"]["state"] == "closed"
+        assert not breakers.healthy
+        await http_client.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_endpoint_families():
+    client = FastFaceitClientHttpx("test")
+    base = client.base_url
+
+    assert client._endpoint_family(f"{base}/players?game=cs2&game_player_id=1") == "players"
+    assert client._endpoint_family(f"{base}/players/p1/stats/cs2") == "stats"
+    assert client._endpoint_family(f"{base}/players/p1/history?game=cs2&offset=0&limit=5") == "history"
+    assert client._endpoint_family(f"{base}/players/p1/games/cs2/stats?offset=0&limit=30") == "games"
+    assert client._endpoint_family(f"{base}/players/p1/bans") == "bans"
+    assert client._endpoint_family(f"{base}/matches/m1") == "matches"
+    assert client._endpoint_family(f"{base}/matches/m1/stats") == "match-stats"
+    assert client._endpoint_family("https://assets.faceit-cdn.net/banner.png") is None
+    assert set(client.breakers.stats()) == {"players", "stats", "games", "history", "bans", "matches",
+                                              "match-stats"}
+
+
+def test_health_endpoint_reports_breaker_states(monkeypatch):
+    import os
+    os.environ.setdefault("FACEIT_API_KEY", "test")
+    import main
+
+    client = FastFaceitClientHttpx("test", breakers=CircuitBreakers(["players", "match-stats"], min_calls=1))
+    client.breakers.get("match-stats").record(True)
+    monkeypatch.setattr(main, "get_faceit_client", lambda: client)
+
+    async def request():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await http.get("/health")
+
+    response = asyncio.run(request())
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "degraded"
+    assert body["faceit"]["match-stats"]["state"] == "open"
+    assert body["faceit"]["players"]["state"] == "closed"
@@ -0,0 +1,34 @@
+import asyncio
+
+from api_clients.fast_api_client_httpx import FastFaceitClientHttpx
+from api_clients.http_pool import create_http_client, http_client_settings_from_env
+
+
+def test_shared_client_is_not_closed_by_context_manager():
+    async def scenario():
+        shared = create_http_client(max_connections=5, max_keepalive_connections=2)
+        async with FastFaceitClientHttpx("test", http_client=shared) as client:
+            assert client.client is shared
+        assert not shared.is_closed
+        await shared.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_owned_client_is_closed_on_exit():
+    async def scenario():
+        async with FastFaceitClientHttpx("test") as client:
+            inner = client.client
+            assert inner is not None
+        assert inner.is_closed
+        assert client.client is None
+
+    asyncio.run(scenario())
+
+
+def test_settings_from_env(monkeypatch):
+    monkeypatch.setenv("HTTP_MAX_CONNECTIONS", "42")
+    monkeypatch.setenv("HTTP2_ENABLED", "true")
+    settings = http_client_settings_from_env()
+    assert settings["max_connections"] == 42
+    assert settings["http2"] is True
@@ -0,0 +1,87 @@
+import asyncio
+
+
+def test_refresh_fetches_only_new_matches(history_client):
+    async def scenario():
+        client = history_client([f"m{i}" for i in range(30, 0, -1)])
+        first = await client.get_recent_processed_matches("p1", 30)
+        assert len(first) == 30
+
+        client.history.insert(0, "m31")
+        client.calls.clear()
+        refreshed = await client.get_recent_processed_matches("p1", 30)
+
+        assert [m["match_id"] for m in refreshed[:2]] == ["m31", "m30"]
+        assert len(refreshed) == 30
+        assert refreshed[-1]["match_id"] == "m2"
+        assert client.calls == [("history", 0, 5), ("details", "m31"), ("stats", "m31")]
+
+    asyncio.run(scenario())
+
+
+def test_refresh_pages_past_head_when_many_new_matches(history_client):
+    async def scenario():
+        client = history_client([f"m{i}" for i in range(10, 0, -1)])
+        await client.get_recent_processed_matches("p1", 30)
+
+        client.history[:0] = [f"n{i}" for i in range(8, 0, -1)]
+        client.calls.clear()
+        refreshed = await client.get_recent_processed_matches("p1", 30)
+
+        history_calls = [c for c in client.calls if c[0] == "history"]
+        assert history_calls == [("history", 0, 5), ("history", 5, 25)]
+        assert len(refreshed) == 18
+
+    asyncio.run(scenario())
+
+
+def test_history_items_with_results_skip_match_details(history_client):
+    async def scenario():
+        client = history_client([])
+
+        async def full_history(player_id, limit=30, offset=0):
+            client.calls.append(("history", offset, limit))
+            return [{"match_id": "m1", "started_at": 100, "results": {"winner": "faction2"},
+                     "teams": {"faction1": {"players": [{"player_id": "p1"}]},
+                               "faction2": {"players": [{"player_id": "p2"}]}}},
+                    {"match_id": "m2", "started_at": 90}]
+
+        client.get_player_matches = full_history
+        matches = await client.get_recent_processed_matches("p1", 30)
+
+        assert [(m["match_id"], m["date"], m["result"]) for m in matches] == [("m1", 100, "Lose"), ("m2", 2, "Win")]
+        # Детали запрашиваются только для элемента истории без победителя и составов
+        assert [c for c in client.calls if c[0] == "details"] == [("details", "m2")]
+
+    asyncio.run(scenario())
+
+
+def test_match_without_stats_is_fetched_again_on_next_refresh(history_client):
+    async def scenario():
+        client = history_client(["m3", "m2", "m1"])
+        fetch_stats = client.get_match_stats
+
+        async def failing_stats(match_id):
+            # FACEIT вернул ошибку для статистики m2
+            if match_id == "m2":
+                client.calls.append(("stats", match_id))
+                return None
+            return await fetch_stats(match_id)
+
+        client.get_match_stats = failing_stats
+        matches, partial = await client._load_recent_matches("p1", 30)
+
+        assert partial is True
+        assert [m["match_id"] for m in matches] == ["m3", "m1"]
+        # Окно с пропуском не запоминается
+        assert "p1" not in client._match_windows
+
+        client.get_match_stats = fetch_stats
+        client.calls.clear()
+        matches, partial = await client._load_recent_matches("p1", 30)
+
+        assert partial is False
+        assert [m["match_id"] for m in matches] == ["m3", "m2", "m1"]
+        assert ("stats", "m2") in client.calls
+
+    asyncio.run(scenario())
@@ -0,0 +1,84 @@
+import asyncio
+
+import httpx
+import pytest
+
+from api_clients.fast_api_client_httpx import FastFaceitClientHttpx, LookupTimeoutError
+from api_clients.scheduler import RequestScheduler
+
+
+def test_complete_lookup_has_no_missing_sections(counting_client):
+    async def scenario():
+        result = await counting_client().get_complete_player_data("76561198000000001", budget=1.0)
+
+        assert not result["partial"]
+        assert result["missing_sections"] == []
+
+    asyncio.run(scenario())
+
+
+def test_slow_section_is_dropped_and_reported(counting_client):
+    async def scenario():
+        client = counting_client(delays={"bans": 5})
+        result = await client.get_complete_player_data("76561198000000001", budget=0.2)
+
+        assert result["partial"]
+        assert result["missing_sections"] == ["bans"]
+        assert result["bans"] == client._process_bans([])
+        assert result["faceit"]["elo"] == 2000
+
+    asyncio.run(scenario())
+
+
+def test_slow_banner_check_does_not_delay_lookup(counting_client):
+    async def scenario():
+        client = counting_client(delays={"banner": 5})
+        result = await client.get_complete_player_data("76561198000000001", budget=0.2)
+
+        assert not result["partial"]
+        assert result["missing_sections"] == []
+        assert result["banner"] is None
+        await client.banners.close()
+
+    asyncio.run(scenario())
+
+
+def test_player_lookup_over_budget_raises(counting_client):
+    async def scenario():
+        with pytest.raises(LookupTimeoutError):
+            await counting_client(delays={"player": 5}).get_complete_player_data("76561198000000001", budget=0.1)
+
+    asyncio.run(scenario())
+
+
+def test_partial_lookup_releases_scheduler_slots():
+    async def scenario():
+        async def handler(request):
+            path = request.url.path
+            if path.endswith("/players"):
+                return httpx.Response(200, json={"player_id": "p1", "nickname": "p", "games": {}})
+            if path.endswith("/history"):
+                return httpx.Response(200, json={"items": [{"match_id": f"m{i}"} for i in range(30)]})
+            if "/matches/" in path:
+                # Матчи отвечают дольше, чем длится весь поиск
+                await asyncio.sleep(3)
+                return httpx.Response(200, json={})
+            if path.endswith("/bans"):
+                return httpx.Response(200, json={"items": []})
+            return httpx.Response(200, json={"lifetime": {}})
+
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = FastFaceitClientHttpx("test", http_client=http_client, match_deadline=None,
+                                       scheduler=RequestScheduler(max_in_flight=20))
+
+        result = await client.get_complete_player_data("76561198000000001", budget=0.3)
+        await asyncio.sleep(0.05)
+
+        assert result["partial"]
+        assert result["match_history"] == []
+        assert client.scheduler.in_flight == 0
+        assert client.scheduler.queue_depth == 0
+        assert len(client._match_flights) == 0
+        await http_client.aclose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,59 @@
+import asyncio
+import random
+
+from api_clients.match_aggregates import MatchAggregate
+
+
+def _match(i, result, map_name="de_mirage", kills=10):
+    return {"match_id": f"m{i}", "result": result, "map": map_name, "kills": kills, "deaths": 5, "assists": 1}
+
+
+def test_aggregate_reads_averages_streak_and_map_splits():
+    # Новые матчи первыми: две победы подряд, затем поражение
+    aggregate = MatchAggregate.from_matches([
+        _match(3, "Win", kills=20),
+        _match(2, "Win", "de_inferno", kills=10),
+        _match(1, "Lose", kills=12),
+    ])
+    summary = aggregate.to_dict()
+
+    assert aggregate.average("kills") == 14
+    assert (summary["wins"], summary["losses"]) == (2, 1)
+    assert summary["current_streak"] == {"result": "Win", "length": 2}
+    assert summary["maps"]["de_mirage"] == {"matches": 2, "wins": 1, "win_rate_percent": 50.0, "average_kills": 16}
+    assert summary["maps"]["de_inferno"]["matches"] == 1
+
+
+def test_incremental_shift_matches_full_recount():
+    rng = random.Random(7)
+    history = [_match(i, rng.choice(["Win", "Lose"]), rng.choice(["de_mirage", "de_nuke"]), rng.randint(0, 30))
+               for i in range(60)]
+    window = 10
+    # Окно - последние 10 матчей, новые первыми
+    current = list(reversed(history[:window]))
+    aggregate = MatchAggregate.from_matches(current)
+    position = window
+    while position < len(history):
+        step = rng.randint(1, 4)
+        added = list(reversed(history[position:position + step]))
+        position += step
+        merged = (added + current)[:window]
+        dropped = current[window - len(added):]
+        aggregate.update(added, reversed(dropped))
+        current = merged
+        assert aggregate.to_dict() == MatchAggregate.from_matches(current).to_dict()
+
+
+def test_client_keeps_aggregate_in_step_with_window(history_client):
+    async def scenario():
+        client = history_client([f"m{i}" for i in range(30, 0, -1)])
+        await client.get_recent_processed_matches("p1", 30)
+        client.history[:0] = ["m32", "m31"]
+        matches = await client.get_recent_processed_matches("p1", 30)
+
+        aggregate = client._window_aggregate("p1", matches)
+        assert aggregate is client._match_aggregates["p1"]
+        assert aggregate.to_dict() == MatchAggregate.from_matches(matches).to_dict()
+        assert aggregate.matches == 30
+
+    asyncio.run(scenario())
@@ -0,0 +1,67 @@
+import asyncio
+
+import httpx
+
+from api_clients.fast_api_client_httpx import FastFaceitClientHttpx
+from cache.match_cache import MatchCache
+
+
+def test_lru_eviction_keeps_recent_entries():
+    async def scenario():
+        cache = MatchCache(max_entries=2)
+        await cache.set("details", "m1", {"match_id": "m1"})
+        await cache.set("details", "m2", {"match_id": "m2"})
+        # Обращение к m1 делает его самым свежим
+        assert await cache.get("details", "m1") == {"match_id": "m1"}
+        await cache.set("stats", "m3", {"rounds": []})
+
+        assert await cache.get("details", "m2") is None
+        assert await cache.get("details", "m1") is not None
+        assert cache.stats()["evictions"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_disk_tier_survives_memory_eviction(tmp_path):
+    async def scenario():
+        cache = MatchCache(max_entries=1, disk_path=str(tmp_path))
+        await cache.set("stats", "1-abc", {"rounds": [{"round_stats": {"Map": "de_dust2"}}]})
+        await cache.set("stats", "1-def", {"rounds": []})
+
+        fresh = MatchCache(max_entries=10, disk_path=str(tmp_path))
+        data = await fresh.get("stats", "1-abc")
+        assert data["rounds"][0]["round_stats"]["Map"] == "de_dust2"
+        assert fresh.stats()["backend_hits"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_unsafe_match_id_is_not_written_to_disk(tmp_path):
+    async def scenario():
+        cache = MatchCache(disk_path=str(tmp_path))
+        await cache.set("details", "../evil", {"status": "FINISHED"})
+        assert not any(p.name.startswith("evil") for p in tmp_path.rglob("*"))
+        assert await cache.get("details", "../evil") == {"status": "FINISHED"}
+
+    asyncio.run(scenario())
+
+
+def test_empty_cache_is_filled_by_client():
+    async def scenario():
+        requests = []
+
+        async def handler(request):
+            requests.append(request.url.path)
+            return httpx.Response(200, json={"match_id": "m1", "status": "FINISHED"})
+
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        # Пустой кэш (len == 0) должен использоваться так же, как заполненный
+        client = FastFaceitClientHttpx("test", http_client=http_client, match_cache=MatchCache())
+        await client.get_match_details("m1")
+        await client.get_match_details("m1")
+
+        assert len(requests) == 1
+        assert client.match_cache.stats()["hits"] == 1
+        await http_client.aclose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,64 @@
+from api_clients.fast_api_client_httpx import FastFaceitClientHttpx
+from api_clients.match_index import MatchIndex
+
+
+def _stats_payload():
+    return {"rounds": [{
+        "game_mode": "5v5",
+        "round_stats": {"Map": "de_nuke", "Score": "13 / 9"},
+        "teams": [
+            {"team_id": "t1", "players": [{"player_id": "p1", "player_stats": {"Kills": "21", "Deaths": "14", "Assists": "3"}}]},
+            {"team_id": "t2", "players": [{"player_id": "p2", "player_stats": {"Kills": "9", "Deaths": "20", "Assists": "5"}}]},
+        ],
+    }]}
+
+
+def test_index_locates_players_in_lineups_and_stats():
+    details = {"teams": {"faction1": {"faction_id": "t1", "players": [{"player_id": "p1"}]},
+                         "faction2": {"faction_id": "t2", "roster": [{"player_id": "p2"}]}}}
+    index = MatchIndex(details, _stats_payload())
+
+    assert index.lineup("p1").faction_key == "faction1"
+    assert index.lineup("p2").team_id == "t2"
+    assert index.side("p2") == 1
+    assert index.player_stat("p1", "Kills") == "21"
+    assert index.player_stat("missing", "Kills") == 0
+    assert index.round_stats["Map"] == "de_nuke"
+
+
+def test_extractors_and_result_share_one_index():
+    client = FastFaceitClientHttpx(api_key="test")
+    stats = _stats_payload()
+    # Победитель не указан - результат по счету и стороне игрока из статистики
+    details = {"results": {}}
+    index = MatchIndex(details, stats)
+
+    assert client._determine_match_result(details, "p1", stats, index) == "Win"
+    assert client._determine_match_result(details, "p2", stats, index) == "Lose"
+    assert index.player_stat("p1", "Kills") == "21"
+    assert index.player_stat("p2", "Deaths") == "20"
+    # Без готового индекса результат строит его сам
+    assert client._determine_match_result(details, "p2", stats) == "Lose"
+
+
+def test_lineups_prefer_teams_over_legacy_factions():
+    details = {"results": {"winner": "faction2"},
+               "teams": {"faction1": {"players": [{"player_id": "p1"}]}},
+               "factions": {"faction2": {"players": [{"player_id": "p1"}]}}}
+    index = MatchIndex(details, _stats_payload())
+
+    assert index.lineup("p1").faction_key == "faction1"
+    assert index.result_for("p1") == "Lose"
+    assert MatchIndex({"factions": details["factions"]}).lineup("p1").faction_key == "faction2"
+
+
+def test_second_player_reads_from_built_index():
+    stats = _stats_payload()
+    stats["rounds"].append({"teams": [{"players": [{"player_id": "p1", "player_stats": {"Kills": "2"}},
+                                                   {"player_id": "p3", "player_stats": {"Kills": "7"}}]}]})
+    index = MatchIndex({}, stats)
+
+    assert index.player_stat("p1", "Kills") == "21"
+    assert index.player_stat("p3", "Kills") == "7"
+    assert index.player_stat("p1", "Kills") == "21"
+    assert set(index.stats_players) == {"p1", "p2", "p3"}
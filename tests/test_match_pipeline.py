@@ -0,0 +1,79 @@
+import asyncio
+
+import httpx
+
+from api_clients.fast_api_client_httpx import FastFaceitClientHttpx
+from api_clients.scheduler import RequestScheduler
+
+
+def test_matches_keep_history_order_when_completed_out_of_order(history_client):
+    async def scenario():
+        client = history_client(["m3", "m2", "m1"], stats_delays={"m3": 0.05, "m2": 0.02}, match_deadline=None)
+        matches, partial = await client._load_recent_matches("p1", 30)
+
+        assert [m["match_id"] for m in matches] == ["m3", "m2", "m1"]
+        assert not partial
+
+    asyncio.run(scenario())
+
+
+def test_deadline_drops_stragglers_and_marks_partial(history_client):
+    async def scenario():
+        client = history_client(["m3", "m2", "m1"], stats_delays={"m2": 5}, match_deadline=0.05)
+        matches, partial = await client._load_recent_matches("p1", 30)
+        await asyncio.sleep(0)
+
+        assert [m["match_id"] for m in matches] == ["m3", "m1"]
+        assert partial
+        assert client.cancelled == ["m2"]
+        # Неполное окно не запоминается, следующий поиск загрузит матчи заново
+        assert "p1" not in client._match_windows
+
+    asyncio.run(scenario())
+
+
+def test_partial_page_is_reported_by_history_pagination(history_client):
+    async def scenario():
+        client = history_client(["m2", "m1"], stats_delays={"m1": 5}, match_deadline=0.05)
+        matches, next_offset, partial = await client.get_match_history_page("p1", 0, 2)
+
+        assert [m["match_id"] for m in matches] == ["m2"]
+        assert next_offset == 2
+        assert partial
+
+    asyncio.run(scenario())
+
+
+def slow_stats_transport(delay=3.0):
+    """FACEIT API, у которого статистика матчей отвечает с задержкой"""
+    async def handler(request):
+        path = request.url.path
+        if path.endswith("/stats") and "/matches/" in path:
+            await asyncio.sleep(delay)
+            return httpx.Response(200, json={"rounds": []})
+        if "/matches/" in path:
+            return httpx.Response(200, json={"match_id": path.rsplit("/", 1)[-1], "teams": {}})
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler)
+
+
+def test_deadline_releases_scheduler_slots_of_unfinished_requests():
+    async def scenario():
+        http_client = httpx.AsyncClient(transport=slow_stats_transport())
+        client = FastFaceitClientHttpx("test", http_client=http_client, match_deadline=0.3,
+                                       scheduler=RequestScheduler(max_in_flight=20))
+        items = [{"match_id": f"m{i}"} for i in range(15)]
+
+        matches, partial = await client._process_match_items(items, "p1")
+        await asyncio.sleep(0.05)
+
+        assert matches == []
+        assert partial
+        # Запросы, результат которых больше никто не ждет, отменены и вернули слоты
+        assert client.scheduler.in_flight == 0
+        assert client.scheduler.queue_depth == 0
+        assert len(client._match_flights) == 0
+        await http_client.aclose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,87 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from db import match_store
+from db.database import Base
+
+
+def _use_temp_database(monkeypatch, tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'matches.db'}")
+    monkeypatch.setattr(match_store, "async_session_maker",
+                        async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False))
+    return engine
+
+
+def _match(match_id, date, kills=10, result="Win"):
+    return {"match_id": match_id, "date": date, "result": result, "score": "13 / 7",
+            "map": "de_mirage", "mode": "5v5", "kills": kills, "deaths": 8, "assists": 2,
+            "match_url": f"https://www.faceit.com/en/cs2/room/{match_id}"}
+
+
+def test_matches_are_upserted_and_read_newest_first(monkeypatch, tmp_path):
+    engine = _use_temp_database(monkeypatch, tmp_path)
+
+    async def scenario():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await match_store.save_player_matches_to_db("p1", [_match("m1", 100), _match("m2", 200)])
+        await match_store.save_player_matches_to_db("p1", [_match("m2", 200, kills=25, result="Lose")])
+
+        rows = await match_store.get_player_matches_from_db("p1", limit=10)
+        assert [(r["match_id"], r["kills"], r["result"]) for r in rows] == [("m2", 25, "Lose"), ("m1", 10, "Win")]
+        assert rows[1] == _match("m1", 100)
+        assert await match_store.get_player_matches_from_db("p2") == []
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_new_client_resumes_from_stored_window(monkeypatch, tmp_path, history_client):
+    engine = _use_temp_database(monkeypatch, tmp_path)
+
+    async def scenario():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        history = [f"m{i}" for i in range(10, 0, -1)]
+        client = history_client(history, match_store=match_store.MatchStore())
+        await client.get_recent_processed_matches("p1", 30)
+        # Матчи пишутся в базу в фоне, после ответа
+        await client.flush_store_writes()
+
+        # Новый процесс: окна в памяти нет, но обработанные матчи есть в базе
+        restarted = history_client(["m11"] + history, match_store=match_store.MatchStore())
+        matches = await restarted.get_recent_processed_matches("p1", 30)
+
+        assert [m["match_id"] for m in matches[:2]] == ["m11", "m10"]
+        assert len(matches) == 11
+        assert restarted.calls == [("history", 0, 5), ("details", "m11"), ("stats", "m11")]
+        await restarted.flush_store_writes()
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_store_write_runs_after_lookup_returns(history_client):
+    class _SlowStore:
+        def __init__(self):
+            self.saved = []
+
+        async def load(self, player_id, limit):
+            return []
+
+        async def save(self, player_id, matches):
+            await asyncio.sleep(0.05)
+            self.saved.append((player_id, [m["match_id"] for m in matches]))
+
+    async def scenario():
+        store = _SlowStore()
+        client = history_client(["m2", "m1"], match_store=store)
+        matches = await asyncio.wait_for(client.get_recent_processed_matches("p1", 30), timeout=0.04)
+
+        assert [m["match_id"] for m in matches] == ["m2", "m1"]
+        assert store.saved == []
+        await client.flush_store_writes()
+        assert store.saved == [("p1", ["m2", "m1"])]
+
+    asyncio.run(scenario())
@@ -0,0 +1,75 @@
+import asyncio
+import os
+
+import httpx
+import pytest
+
+from monitoring import CONTENT_TYPE, CallbackMetric, Counter, Gauge, Histogram, Registry
+
+
+def test_counter_and_gauge_render_with_labels():
+    registry = Registry()
+    requests = Counter("lookups_total", "Lookups", ["result"], registry=registry)
+    in_flight = Gauge("in_flight", "Requests in flight", registry=registry)
+
+    requests.inc(result="hit")
+    requests.inc(2, result='mi"ss')
+    with in_flight.track_in_progress():
+        assert in_flight.value() == 1
+    in_flight.inc(3)
+
+    text = registry.render()
+    assert "# TYPE lookups_total counter" in text
+    assert 'lookups_total{result="hit"} 1' in text
+    assert 'lookups_total{result="mi\\"ss"} 2' in text
+    assert "in_flight 3" in text
+
+    with pytest.raises(ValueError):
+        requests.inc(status="hit")
+    with pytest.raises(ValueError):
+        Counter("lookups_total", "Duplicate", registry=registry)
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    duration = Histogram("duration_seconds", "Duration", ["op"], buckets=(0.1, 1.0), registry=registry)
+
+    for value in (0.05, 0.5, 0.7, 3.0):
+        duration.observe(value, op="read")
+
+    text = registry.render()
+    assert 'duration_seconds_bucket{op="read",le="0.1"} 1' in text
+    assert 'duration_seconds_bucket{op="read",le="1"} 3' in text
+    assert 'duration_seconds_bucket{op="read",le="+Inf"} 4' in text
+    assert 'duration_seconds_sum{op="read"} 4.25' in text
+    assert 'duration_seconds_count{op="read"} 4' in text
+    assert duration.count(op="read") == 4
+
+
+def test_callback_metric_reads_values_on_render():
+    registry = Registry()
+    stats = {"hits": 1}
+    CallbackMetric("cache_requests_total", "Cache requests", "counter", ["result"],
+                   lambda: {("hit",): stats["hits"]}, registry=registry)
+
+    stats["hits"] = 5
+    assert 'cache_requests_total{result="hit"} 5' in registry.render()
+
+
+def test_metrics_endpoint_exposes_request_and_cache_metrics():
+    os.environ.setdefault("FACEIT_API_KEY", "test")
+    import main
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            await http.get("/health")
+            return await http.get("/metrics")
+
+    response = asyncio.run(scenario())
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == CONTENT_TYPE
+    assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in response.text
+    assert "# TYPE faceit_player_cache_requests_total counter" in response.text
+    assert "# TYPE faceit_upstream_request_duration_seconds histogram" in response.text
@@ -0,0 +1,69 @@
+import asyncio
+import os
+
+import httpx
+
+os.environ.setdefault("FACEIT_API_KEY", "test")
+
+import main  # noqa: E402
+
+HISTORY = [f"m{i}" for i in range(12, 0, -1)]
+
+
+def _pages(client):
+    return [call[1:] for call in client.calls if call[0] == "history"]
+
+
+def test_compute_window_is_never_smaller_than_display_window(history_client):
+    client = history_client(HISTORY, match_window=3, display_window=5)
+    assert client.match_window == 5
+
+
+def test_history_pages_follow_offsets_until_exhausted(history_client):
+    async def scenario():
+        client = history_client(HISTORY, display_window=5)
+        first, next_offset, throttled = await client.get_match_history_page("p1")
+        assert [m["match_id"] for m in first] == ["m12", "m11", "m10", "m9", "m8"]
+        assert (next_offset, throttled) == (5, False)
+
+        last, next_offset, _ = await client.get_match_history_page("p1", offset=10)
+        assert [m["match_id"] for m in last] == ["m2", "m1"]
+        assert next_offset is None
+        assert _pages(client) == [(0, 5), (10, 5)]
+
+    asyncio.run(scenario())
+
+
+def test_matches_endpoint_returns_cursor(monkeypatch, history_client, valid_uuid):
+    client = history_client(HISTORY, display_window=4)
+    monkeypatch.setattr(main, "get_faceit_client", lambda: client)
+
+    page = asyncio.run(main.get_player_matches_page(valid_uuid, cursor="4", limit=None))
+    assert [m["match_id"] for m in page["matches"]] == ["m8", "m7", "m6", "m5"]
+    assert page["next_cursor"] == "8"
+    assert page["partial"] is False
+
+
+def test_matches_endpoint_rejects_large_pages_and_invalid_player_ids(monkeypatch, history_client, valid_uuid):
+    client = history_client(HISTORY)
+    monkeypatch.setattr(main, "get_faceit_client", lambda: client)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            too_large = await http.get(f"/api/players/{valid_uuid}/matches",
+                                       params={"limit": main.MATCHES_PAGE_MAX_LIMIT + 1})
+            not_positive = await http.get(f"/api/players/{valid_uuid}/matches", params={"limit": 0})
+            invalid_id = await http.get("/api/players/p1;bans/matches")
+            allowed = await http.get(f"/api/players/{valid_uuid}/matches",
+                                     params={"limit": main.MATCHES_PAGE_MAX_LIMIT})
+        return too_large, not_positive, invalid_id, allowed
+
+    too_large, not_positive, invalid_id, allowed = asyncio.run(scenario())
+
+    assert too_large.status_code == 422
+    assert not_positive.status_code == 422
+    assert invalid_id.status_code == 422
+    assert allowed.status_code == 200
+    # Ни один некорректный запрос не дошел до FACEIT
+    assert _pages(client) == [(0, main.MATCHES_PAGE_MAX_LIMIT)]
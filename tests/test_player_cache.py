@@ -0,0 +1,103 @@
+import asyncio
+
+import json
+import struct
+
+from cache.backends import MemoryBackend, dumps, loads, pack
+from cache.player_cache import PlayerCache, merge_envelope, player_cache_settings_from_env, serialize_payload
+
+
+def test_fresh_stale_and_expired_entries():
+    async def scenario():
+        cache = PlayerCache(soft_ttl=10, hard_ttl=100)
+        await cache.set("a", b'{"nickname":"a"}')
+        assert await cache.get("a") == (b'{"nickname":"a"}', False)
+
+        # Подменяем время записи, чтобы не ждать TTL
+        await cache.backend.set("a", struct.pack("!d", 0) + pack(b'{"nickname":"a"}'))
+        cache.soft_ttl = 0
+        cache.hard_ttl = 10 ** 12
+        assert await cache.get("a") == (b'{"nickname":"a"}', True)
+
+        cache.hard_ttl = 1
+        assert await cache.get("a") is None
+        assert await cache.backend.get("a") is None
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["stale_hits"], stats["misses"]) == (1, 1, 1)
+
+    asyncio.run(scenario())
+
+
+def test_cache_uses_limits_from_environment(monkeypatch):
+    monkeypatch.setenv("CACHE_BACKEND", "memory")
+    monkeypatch.setenv("PLAYER_CACHE_MAX_ENTRIES", "7")
+    monkeypatch.setenv("PLAYER_CACHE_MAX_BYTES", "1234")
+
+    # Пустое хранилище из настроек не должно заменяться хранилищем по умолчанию
+    cache = PlayerCache(**player_cache_settings_from_env())
+
+    stats = cache.stats()
+    assert (stats["max_entries"], stats["max_bytes"]) == (7, 1234)
+
+
+def test_envelope_is_merged_without_touching_cached_payload():
+    payload = serialize_payload({"nickname": "Игрок", "source": "api", "processing_time": 1.5})
+    assert payload == '{"nickname":"Игрок"}'.encode("utf-8")
+
+    body = merge_envelope(payload, source="cache", processing_time=0.01)
+    assert json.loads(body) == {"nickname": "Игрок", "source": "cache", "processing_time": 0.01}
+    assert json.loads(merge_envelope(b"{}", source="stale")) == {"source": "stale"}
+    assert payload == '{"nickname":"Игрок"}'.encode("utf-8")
+
+
+def test_memory_backend_evicts_least_recently_used_by_count():
+    async def scenario():
+        backend = MemoryBackend(max_entries=2)
+        await backend.set("a", b"1")
+        await backend.set("b", b"2")
+        await backend.get("a")
+        await backend.set("c", b"3")
+        assert await backend.get("b") is None
+        assert await backend.get("a") == b"1"
+        assert backend.stats()["evictions"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_memory_backend_evicts_by_byte_budget():
+    async def scenario():
+        backend = MemoryBackend(max_bytes=250)
+        for key in ("a", "b", "c"):
+            await backend.set(key, b"x" * 100)
+        assert len(backend) == 2
+        assert backend.total_bytes == 200
+
+        await backend.set("huge", b"x" * 1000)
+        assert await backend.get("huge") is None
+
+    asyncio.run(scenario())
+
+
+def test_sweep_removes_entries_nobody_reads_again():
+    async def scenario():
+        backend = MemoryBackend()
+        await backend.set("old", b"1", ttl=0.001)
+        await backend.set("new", b"2", ttl=60)
+        await asyncio.sleep(0.01)
+        assert await backend.sweep() == 1
+        assert len(backend) == 1
+
+    asyncio.run(scenario())
+
+
+def test_serialization_is_compact_and_round_trips():
+    small = {"nickname": "s1mple", "level": 10}
+    assert dumps(small) == b'j{"nickname":"s1mple","level":10}'
+    assert loads(dumps(small)) == small
+
+    big = {"match_history": [{"map": "de_mirage", "kills": 20}] * 200}
+    packed = dumps(big)
+    assert packed[:1] == b"z"
+    assert len(packed) < len(str(big)) // 10
+    assert loads(packed) == big
@@ -0,0 +1,77 @@
+import asyncio
+
+import httpx
+import pytest
+
+from api_clients.fast_api_client_httpx import FastFaceitClientHttpx, PROFILE_LITE
+
+
+def test_lite_profile_skips_match_history_and_banner(counting_client):
+    async def scenario():
+        client = counting_client()
+        result = await client.get_complete_player_data("76561198000000001", profile=PROFILE_LITE)
+
+        assert sorted(client.calls) == ["bans", "player", "recent_match_stats", "stats"]
+        assert result["profile"] == "lite"
+        assert result["match_history"] == []
+        assert result["banner"] is None
+        assert result["faceit"]["elo"] == 2000
+        assert result["stats"]["kd_ratio"] == 1.2
+        assert result["stats"]["last_30_matches_avg_kills"] == 18
+
+    asyncio.run(scenario())
+
+
+def test_lite_profile_averages_recent_matches_when_lifetime_lacks_them(counting_client):
+    async def scenario():
+        client = counting_client(lifetime={"Matches": "100", "Average K/D Ratio": "1.2"})
+        result = await client.get_complete_player_data("76561198000000001", profile=PROFILE_LITE)
+
+        assert result["stats"]["last_30_matches_avg_kills"] == 19
+        assert result["stats"]["average_deaths"] == 10
+        assert result["stats"]["recent_form"]["wins"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_full_profile_loads_matches_and_banner(counting_client):
+    async def scenario():
+        client = counting_client()
+        result = await client.get_complete_player_data("76561198000000001")
+
+        assert {"history", "details", "match_stats", "banner"} <= set(client.calls)
+        assert "recent_match_stats" not in client.calls
+        assert result["profile"] == "full"
+        # Баннер проверяется в фоне, его статус попадает в следующие ответы
+        assert result["banner"] is None
+        result = await client.get_complete_player_data("76561198000000001")
+        assert result["banner"] == "https://example.com/banner.png"
+
+    asyncio.run(scenario())
+
+
+def test_unknown_profile_is_rejected(counting_client):
+    with pytest.raises(ValueError):
+        asyncio.run(counting_client().get_complete_player_data("76561198000000001", profile="huge"))
+
+
+def test_recent_match_stats_are_read_from_one_request():
+    async def scenario():
+        requests = []
+
+        async def handler(request):
+            requests.append(str(request.url))
+            return httpx.Response(200, json={"items": [
+                {"stats": {"Match Id": "m2", "Result": "1", "Map": "de_inferno", "Kills": "22", "Deaths": "15", "Assists": "4"}},
+                {"stats": {"Match Id": "m1", "Result": "0", "Map": "de_nuke", "Kills": "9", "Deaths": "18", "Assists": "1"}},
+            ]})
+
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = FastFaceitClientHttpx("test", http_client=http_client)
+        rows = await client.get_player_recent_match_stats("p1", 30)
+
+        assert requests == [f"{client.base_url}/players/p1/games/cs2/stats?offset=0&limit=30"]
+        assert [(row["match_id"], row["result"], row["kills"]) for row in rows] == [("m2", "Win", 22), ("m1", "Lose", 9)]
+        await http_client.aclose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,69 @@
+import asyncio
+
+import httpx
+import pytest
+
+from api_clients import fast_api_client_httpx
+from api_clients.fast_api_client_httpx import FastFaceitClientHttpx, RateLimitedError
+
+
+def _client_with_responses(responses):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return responses.pop(0) if len(responses) > 1 else responses[0]
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return FastFaceitClientHttpx("test", http_client=http_client), calls
+
+
+def test_retries_after_429_and_honours_retry_after(monkeypatch):
+    monkeypatch.setattr(fast_api_client_httpx, "RETRY_BACKOFF_BASE", 0)
+
+    async def scenario():
+        client, calls = _client_with_responses([
+            httpx.Response(429, headers={"Retry-After": "0"}),
+            httpx.Response(200, json={"lifetime": {"Matches": "10"}}),
+        ])
+        stats = await client.get_player_stats("p1")
+        assert stats == {"lifetime": {"Matches": "10"}}
+        assert len(calls) == 2
+        assert client.scheduler.stats()["throttled_responses"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_persistent_429_raises_instead_of_returning_empty(monkeypatch):
+    monkeypatch.setattr(fast_api_client_httpx, "RETRY_BACKOFF_BASE", 0)
+
+    async def scenario():
+        client, calls = _client_with_responses([httpx.Response(429, headers={"Retry-After": "0"})])
+        with pytest.raises(RateLimitedError):
+            await client.get_player_bans("p1")
+        assert len(calls) == fast_api_client_httpx.MAX_RETRIES + 1
+
+    asyncio.run(scenario())
+
+
+def test_throttled_match_window_is_marked_and_not_stored(monkeypatch):
+    class ThrottledClient(FastFaceitClientHttpx):
+        async def get_player_matches(self, player_id, limit=30, offset=0):
+            return [{"match_id": "m1"}, {"match_id": "m2"}]
+
+        async def get_match_details(self, match_id):
+            if match_id == "m2":
+                raise RateLimitedError("url")
+            return {"started_at": 1}
+
+        async def get_match_stats(self, match_id):
+            return {"rounds": [{"round_stats": {}, "teams": []}]}
+
+    async def scenario():
+        client = ThrottledClient("test")
+        matches, throttled = await client._load_recent_matches("p1", 30)
+        assert throttled is True
+        assert [m["match_id"] for m in matches] == ["m1"]
+        assert "p1" not in client._match_windows
+
+    asyncio.run(scenario())
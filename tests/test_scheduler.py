@@ -0,0 +1,125 @@
+import asyncio
+
+from api_clients import scheduler as scheduler_module
+from api_clients.scheduler import PRIORITY_HIGH, PRIORITY_LOW, RequestScheduler
+
+
+def test_in_flight_never_exceeds_limit():
+    async def scenario():
+        scheduler = RequestScheduler(max_in_flight=3, host_rate=1000, host_burst=1000)
+        peak = 0
+
+        async def job():
+            nonlocal peak
+            async with scheduler.slot("open.faceit.com"):
+                peak = max(peak, scheduler.in_flight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(job() for _ in range(20)))
+        assert peak == 3
+        stats = scheduler.stats()
+        assert stats["in_flight"] == 0
+        assert stats["total_requests"] == 20
+        assert stats["max_queue_depth"] > 0
+
+    asyncio.run(scenario())
+
+
+def test_high_priority_requests_jump_the_queue():
+    async def scenario():
+        scheduler = RequestScheduler(max_in_flight=1, host_rate=1000, host_burst=1000)
+        order = []
+        gate = asyncio.Event()
+
+        async def blocker():
+            async with scheduler.slot("h"):
+                await gate.wait()
+
+        async def job(name, priority):
+            async with scheduler.slot("h", priority):
+                order.append(name)
+
+        blocking = asyncio.create_task(blocker())
+        await asyncio.sleep(0)
+        low = [asyncio.create_task(job(f"low{i}", PRIORITY_LOW)) for i in range(3)]
+        await asyncio.sleep(0)
+        high = asyncio.create_task(job("high", PRIORITY_HIGH))
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(blocking, high, *low)
+        assert order[0] == "high"
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_does_not_leak_slot():
+    async def scenario():
+        scheduler = RequestScheduler(max_in_flight=1, host_rate=1000, host_burst=1000)
+
+        async with scheduler.slot("h"):
+            waiter = asyncio.create_task(scheduler.slot("h").__aenter__())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+
+        assert scheduler.in_flight == 0
+        async with scheduler.slot("h"):
+            assert scheduler.in_flight == 1
+
+    asyncio.run(scenario())
+
+
+def test_update_rate_limit_caps_at_absolute_maximum():
+    import pytest
+
+    scheduler = RequestScheduler(max_in_flight=10)
+    scheduler.update_rate_limit(20)
+    assert scheduler.max_in_flight == 20
+
+    with pytest.warns(UserWarning):
+        scheduler.update_rate_limit(RequestScheduler.MAX_CONCURRENT_REQUESTS_ABSOLUTE + 10)
+    assert scheduler.max_in_flight == RequestScheduler.MAX_CONCURRENT_REQUESTS_ABSOLUTE
+
+
+def _fake_clock(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(scheduler_module.time, "monotonic", lambda: clock[0])
+    return clock
+
+
+def test_sustained_throttling_halves_limit_and_recovers(monkeypatch):
+    clock = _fake_clock(monkeypatch)
+    scheduler = RequestScheduler(max_in_flight=30)
+    scheduler.configure_adaptive_limits(throttle_threshold=2, min_connections=5, recovery_interval=60)
+
+    scheduler.observe_response("h", 429, {})
+    assert scheduler.max_in_flight == 30
+    clock[0] += 1
+    scheduler.observe_response("h", 429, {"retry-after": "0"})
+    assert scheduler.max_in_flight == 15
+
+    # Без новых 429 лимит растет обратно: 15 + 15 // 2 = 22
+    clock[0] += 61
+    scheduler.observe_response("h", 200, {})
+    assert scheduler.max_in_flight == 22
+
+
+def test_spaced_out_throttling_keeps_limit(monkeypatch):
+    clock = _fake_clock(monkeypatch)
+    scheduler = RequestScheduler(max_in_flight=30)
+    scheduler.configure_adaptive_limits(throttle_threshold=3, min_connections=5, recovery_interval=60)
+
+    # Три одиночных 429 с интервалом в час - это не постоянное ограничение
+    for _ in range(3):
+        scheduler.observe_response("h", 429, {})
+        clock[0] += 3600
+
+    assert scheduler.max_in_flight == 30
+    assert scheduler.throttled_responses == 3
+
+
+def test_adaptive_limits_can_be_disabled():
+    scheduler = RequestScheduler(max_in_flight=30)
+    scheduler.configure_adaptive_limits(throttle_threshold=1, enabled=False)
+    scheduler.observe_response("h", 429, {})
+    assert scheduler.max_in_flight == 30
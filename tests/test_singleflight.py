@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from api_clients.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    async def scenario():
+        flights = SingleFlight()
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"player_id": "p1"}
+
+        results = await asyncio.gather(*(flights.do("76561198000000000", load) for _ in range(10)))
+        assert calls == 1
+        assert all(r is results[0] for r in results)
+        assert flights.stats() == {"in_flight": 0, "started": 1, "shared": 9, "abandoned": 0}
+
+        # После завершения следующий вызов снова выполняет операцию
+        await flights.do("76561198000000000", load)
+        assert calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_exception_is_delivered_to_all_waiters():
+    async def scenario():
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(*(flights.do("k", fail) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert len(flights) == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelling_one_waiter_does_not_cancel_shared_work():
+    async def scenario():
+        flights = SingleFlight()
+
+        async def load():
+            await asyncio.sleep(0.02)
+            return 42
+
+        first = asyncio.create_task(flights.do("k", load))
+        second = asyncio.create_task(flights.do("k", load))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == 42
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    asyncio.run(scenario())
+
+
+def test_work_is_cancelled_when_all_waiters_leave():
+    async def scenario():
+        flights = SingleFlight()
+        cancelled = asyncio.Event()
+
+        async def load():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiters = [asyncio.create_task(flights.do("k", load)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        assert len(flights) == 0
+        assert flights.stats()["abandoned"] == 1
+        # Новый вызов запускает операцию заново, а не получает отмененную
+        assert await flights.do("k", lambda: asyncio.sleep(0, result=7)) == 7
+
+    asyncio.run(scenario())
@@ -0,0 +1,60 @@
+import asyncio
+import json
+import os
+
+os.environ.setdefault("FACEIT_API_KEY", "test")
+
+import main  # noqa: E402
+from cache.player_cache import PlayerCache  # noqa: E402
+
+
+class _FakeClient:
+    def __init__(self):
+        self.refreshed = asyncio.Event()
+
+    async def get_complete_player_data(self, steam_id, on_section=None, profile="full"):
+        self.refreshed.set()
+        return {"nickname": "fresh", "partial": False}
+
+
+def test_stale_entry_is_served_and_refreshed_in_background(monkeypatch):
+    steam_id = "76561198000000001"
+    client = _FakeClient()
+    monkeypatch.setattr(main, "get_faceit_client", lambda: client)
+    # Нулевой soft TTL: любая запись сразу считается устаревшей
+    monkeypatch.setattr(main, "player_cache", PlayerCache(soft_ttl=0, hard_ttl=3600))
+
+    async def scenario():
+        await main.player_cache.set(steam_id, b'{"nickname":"old"}')
+        response = await main.find_faceit_by_steam(
+            main.SteamUrlRequest(steam_url=f"https://steamcommunity.com/profiles/{steam_id}")
+        )
+        body = json.loads(response.body)
+        assert body["nickname"] == "old"
+        assert body["source"] == "stale"
+
+        await asyncio.wait_for(client.refreshed.wait(), 1)
+        await asyncio.sleep(0)
+        payload, _ = await main.get_cached_player(steam_id)
+        assert json.loads(payload) == {"nickname": "fresh", "partial": False}
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_hits_do_not_share_envelope(monkeypatch):
+    steam_id = "76561198000000003"
+    monkeypatch.setattr(main, "player_cache", PlayerCache())
+
+    async def scenario():
+        await main.player_cache.set(steam_id, b'{"nickname":"p"}')
+        request = main.SteamUrlRequest(steam_url=f"https://steamcommunity.com/profiles/{steam_id}")
+        site, extension = await asyncio.gather(
+            main.find_faceit_by_steam(request),
+            main.find_faceit_by_steam_extension(request),
+        )
+        assert json.loads(site.body)["source"] == "cache"
+        assert json.loads(extension.body)["source"] == "cache"
+        payload, _ = await main.get_cached_player(steam_id)
+        assert payload == b'{"nickname":"p"}'
+
+    asyncio.run(scenario())
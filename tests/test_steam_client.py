@@ -0,0 +1,70 @@
+import asyncio
+
+import httpx
+import pytest
+
+from api_clients.steam_client import SteamApiError, SteamClient
+from cache.backends import MemoryBackend
+
+
+def _steam_client(handler):
+    calls = []
+
+    def counting_handler(request):
+        calls.append(request.url.params.get("vanityurl"))
+        return handler(request)
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(counting_handler))
+    return SteamClient("key", http_client), calls
+
+
+def test_vanity_resolution_is_cached_and_deduplicated():
+    async def scenario():
+        async def slow_ok(request):
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"response": {"success": 1, "steamid": "76561198000000000"}})
+
+        client, calls = _steam_client(slow_ok)
+        results = await asyncio.gather(*(client.resolve_vanity_url("s1mple") for _ in range(5)))
+        assert results == ["76561198000000000"] * 5
+        assert await client.resolve_vanity_url("S1MPLE") == "76561198000000000"
+        assert calls == ["s1mple"]
+
+    asyncio.run(scenario())
+
+
+def test_unknown_vanity_is_negatively_cached():
+    async def scenario():
+        client, calls = _steam_client(
+            lambda request: httpx.Response(200, json={"response": {"success": 42, "message": "No match"}})
+        )
+        assert await client.resolve_vanity_url("nobody") is None
+        assert await client.resolve_vanity_url("nobody") is None
+        assert len(calls) == 1
+
+    asyncio.run(scenario())
+
+
+def test_steam_errors_are_not_cached():
+    async def scenario():
+        client, calls = _steam_client(lambda request: httpx.Response(503))
+        for _ in range(2):
+            with pytest.raises(SteamApiError):
+                await client.resolve_vanity_url("flaky")
+        assert len(calls) == 2
+
+    asyncio.run(scenario())
+
+
+def test_configured_empty_cache_backend_is_used():
+    async def scenario():
+        backend = MemoryBackend(max_entries=10)
+        client = SteamClient("key", httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, json={"response": {"success": 1, "steamid": "76561198000000000"}}))),
+            cache_backend=backend)
+
+        assert client.cache is backend
+        await client.resolve_vanity_url("s1mple")
+        assert len(backend) == 1
+
+    asyncio.run(scenario())
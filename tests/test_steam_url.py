@@ -0,0 +1,43 @@
+import pytest
+
+from api_clients.steam_url import SteamInput, parse_steam_input
+
+STEAM_ID = "76561198000265727"  # account ID 39999999
+
+
+@pytest.mark.parametrize("value", [
+    STEAM_ID,
+    f"  {STEAM_ID}\n",
+    f"https://steamcommunity.com/profiles/{STEAM_ID}",
+    f"https://steamcommunity.com/profiles/{STEAM_ID}/",
+    f"steamcommunity.com/profiles/{STEAM_ID}/inventory?l=english",
+    "STEAM_0:1:19999999",
+    "STEAM_1:1:19999999",
+    "[U:1:39999999]",
+    "U:1:39999999",
+    "https://s.team/p/djdh-nww",
+])
+def test_local_formats_resolve_without_steam_api(value):
+    assert parse_steam_input(value) == SteamInput(steam_id=STEAM_ID)
+
+
+@pytest.mark.parametrize("value, vanity", [
+    ("https://steamcommunity.com/id/s1mple", "s1mple"),
+    ("https://steamcommunity.com/id/s1mple/", "s1mple"),
+    ("http://www.steamcommunity.com/id/Some_Name-1/games?tab=all", "Some_Name-1"),
+])
+def test_vanity_urls_need_resolution(value, vanity):
+    assert parse_steam_input(value) == SteamInput(vanity=vanity)
+
+
+@pytest.mark.parametrize("value", [
+    "",
+    "not a steam url",
+    "https://steamcommunity.com/groups/valve",
+    "12345678901234567",  # 17 цифр, но не SteamID64 аккаунта
+    "[U:1:0]",
+    "STEAM_0:2:1",
+    "https://s.team/p/xyz",
+])
+def test_unrecognized_input(value):
+    assert parse_steam_input(value) == SteamInput()
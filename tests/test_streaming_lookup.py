@@ -0,0 +1,67 @@
+import asyncio
+import json
+import os
+
+os.environ.setdefault("FACEIT_API_KEY", "test")
+
+import main  # noqa: E402
+from cache.player_cache import PlayerCache  # noqa: E402
+
+STEAM_ID = "76561198000000001"
+
+
+class _SectionedClient:
+    """Отдает секции по очереди и ждет, пока тест не прочитает первую"""
+
+    def __init__(self):
+        self.profile_read = asyncio.Event()
+
+    async def get_complete_player_data(self, steam_id, on_section=None, profile="full"):
+        on_section("profile", {"nickname": "p", "faceit": {"elo": 2000}})
+        await asyncio.wait_for(self.profile_read.wait(), 1)
+        on_section("bans", {"bans": []})
+        on_section("stats", {"stats": {"kd_ratio": 1.2}})
+        on_section("match_history", {"match_history": []})
+        return {"nickname": "p", "stats": {"kd_ratio": 1.2}, "partial": False}
+
+
+async def _stream(on_line=None):
+    response = await main.find_faceit_by_steam_stream(main.SteamUrlRequest(steam_url=STEAM_ID))
+    assert response.media_type == "application/x-ndjson"
+    lines = []
+    async for chunk in response.body_iterator:
+        lines.append(json.loads(chunk))
+        if on_line:
+            on_line(lines[-1])
+    return lines
+
+
+def test_sections_are_streamed_before_lookup_completes(monkeypatch):
+    monkeypatch.setattr(main, "player_cache", PlayerCache())
+
+    async def no_history(*args, **kwargs):
+        pass
+
+    monkeypatch.setattr(main, "add_recent_search", no_history)
+
+    async def scenario():
+        client = _SectionedClient()
+        monkeypatch.setattr(main, "get_faceit_client", lambda: client)
+
+        def on_line(line):
+            # Секция profile пришла, пока загрузка остального еще ждет
+            if line["section"] == "profile":
+                client.profile_read.set()
+
+        lines = await _stream(on_line)
+        assert [line["section"] for line in lines] == ["profile", "bans", "stats", "match_history", "complete"]
+        assert lines[0]["data"]["faceit"]["elo"] == 2000
+        assert lines[-1]["data"]["source"] == "api"
+        assert lines[-1]["data"]["stats"] == {"kd_ratio": 1.2}
+
+        # Повторный поиск отдает готовый результат из кэша одной строкой
+        cached = await _stream()
+        assert [line["section"] for line in cached] == ["complete"]
+        assert cached[0]["data"]["source"] == "cache"
+
+    asyncio.run(scenario())